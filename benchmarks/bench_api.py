@@ -0,0 +1,131 @@
+"""
+Load test for the HTTP/JSON API server (src/api/server.py).
+
+Starts the server in a separate process on a scratch task store, then
+drives it from a local asyncio client over keep-alive connections and
+reports throughput and latency percentiles per workload.
+
+Usage:
+    python benchmarks/bench_api.py [--tasks 10000] [--requests 20000]
+                                   [--concurrency 32] [--output api.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_startup import ROOT_DIR, write_tasks
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else b''
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n").encode() + data)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+def make_request(workload, n, tasks):
+    if workload == "get":
+        return "GET", f"/tasks/task-{n % tasks + 1}", None
+    if workload == "query":
+        return "GET", f"/tasks?min_priority={n % 100}&limit=20", None
+    if workload == "slots":
+        return "GET", f"/slots?date=2030-01-{n % 28 + 1:02d}&duration=30", None
+    if workload == "add":
+        return "POST", "/tasks", {"task_name": f"load-{n}", "category": "load", "priority": n % 100 + 1,
+                                  "deadline": 5, "dependencies": ""}
+    # Mixed: mostly reads with some writes
+    kind = ("get", "query", "get", "slots", "get", "query", "get", "add")[n % 8]
+    return make_request(kind, n, tasks)
+
+async def run_workload(host, port, workload, total, concurrency, tasks, offset):
+    latencies = []
+    errors = 0
+    counter = iter(range(offset, offset + total))
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        for n in counter:
+            method, path, body = make_request(workload, n, tasks)
+            start = time.perf_counter()
+            status = await request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_s": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+def start_server(tasks_file, graph_file):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.api.server", "--port", "0",
+         "--tasks-file", tasks_file, "--graph-file", graph_file],
+        cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError("API server failed to start")
+    host, port = line.rsplit("//", 1)[1].strip().rsplit(":", 1)
+    return process, host, int(port)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="number of tasks in the store")
+    parser.add_argument("--requests", type=int, default=20000, help="requests per workload")
+    parser.add_argument("--concurrency", type=int, default=32, help="number of client connections")
+    parser.add_argument("--workloads", nargs="+", default=["get", "query", "slots", "add", "mixed"])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {"tasks": args.tasks, "concurrency": args.concurrency, "workloads": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_file = os.path.join(tmp, "tasks.csv")
+        graph_file = os.path.join(tmp, "dependencies.json")
+        write_tasks(tasks_file, args.tasks)
+        process, host, port = start_server(tasks_file, graph_file)
+        try:
+            for index, workload in enumerate(args.workloads):
+                results["workloads"][workload] = asyncio.run(run_workload(
+                    host, port, workload, args.requests, args.concurrency, args.tasks,
+                    offset=index * args.requests))
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Latency and throughput of the TaskManager and Scheduler operations at
+several store sizes, plus the GUI task list refresh under a headless Tk.
+
+For each size a synthetic store is generated (see workload.py) and each
+operation is sampled until --samples runs or --budget seconds, whichever
+comes first (at least three runs). Write operations start from the
+latest files like any other process would, so at large sizes they are
+dominated by the CSV rewrite.
+
+The GUI refresh runs in a fresh interpreter. Without a display it starts
+Xvfb when available; otherwise it is reported as skipped.
+
+Usage:
+    python benchmarks/bench_operations.py [--sizes 1000 10000 100000 1000000]
+        [--shape random] [--density 2] [--bookings-per-day 4] [--days 20]
+        [--samples 50] [--budget 20] [--no-ui] [--output ops.json]
+        [--compare previous.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench_api import percentile
+from bench_startup import ROOT_DIR
+from workload import SHAPES, generate_workload, booking_times
+
+sys.path.insert(0, ROOT_DIR)
+
+UI_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+from src.main_logic import TaskManager
+from src.ui.main_window import MainWindow
+
+def settle(app):
+    # Pump the event loop until the background worker is idle
+    while True:
+        app.update()
+        if app.worker.pending == 0:
+            return
+        time.sleep(0.001)
+
+app = MainWindow(TaskManager({tasks_file!r}, {graph_file!r}))
+settle(app)
+samples = []
+for _ in range({runs}):
+    start = time.perf_counter()
+    app._refresh_task_list()
+    settle(app)
+    samples.append(time.perf_counter() - start)
+rows = len(app.tree.get_children())
+app.destroy()
+print(json.dumps({{"samples": samples, "rows": rows}}))
+"""
+
+def summarize(latencies, elapsed):
+    return {
+        "samples": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "ops_per_s": len(latencies) / elapsed if elapsed else None,
+    }
+
+def measure(operation, samples, budget):
+    """
+    Call operation(n) for n = 0, 1, ... until samples runs or budget seconds.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for n in range(samples):
+        start = time.perf_counter()
+        operation(n)
+        latencies.append(time.perf_counter() - start)
+        if n >= 2 and time.perf_counter() - started > budget:
+            break
+    return summarize(latencies, sum(latencies))
+
+def bench_store(workload, size, args):
+    from src.main_logic import TaskManager
+    from src.services.scheduler import Scheduler
+
+    rng = random.Random(1)
+    tasks_file, graph_file = workload["tasks_file"], workload["graph_file"]
+    booked_days = sorted({start.replace(hour=0) for start in booking_times(args.bookings_per_day, args.days)})
+    # Completing a task needs its dependencies completed first
+    statuses = ["In Progress", "Not Started"]
+    added = []
+    results = {}
+
+    def load(n):
+        TaskManager(tasks_file, graph_file).get_tasks()
+
+    results["load"] = measure(load, args.samples, args.budget)
+
+    task_manager = TaskManager(tasks_file, graph_file)
+    scheduler = Scheduler(task_manager, workload["appointments_file"])
+    task_manager.get_tasks()
+
+    def get_tasks(n):
+        task_manager.get_tasks({"category": f"cat-{n % 20}", "min_priority": n % 100, "status": "All"})
+
+    def add_task(n):
+        deps = ", ".join(f"task-{rng.randint(1, size // 2)}" for _ in range(2)) if size > 2 else ""
+        task_manager.add_task({"task_name": f"bench-{n}", "category": "bench", "priority": 5,
+                               "deadline": 3, "dependencies": deps})
+        added.append(f"bench-{n}")
+
+    def update_task_status(n):
+        task_manager.update_task_status(f"task-{rng.randint(1, size // 2)}", statuses[n % 2])
+
+    def remove_task(n):
+        task_manager.remove_task(added.pop() if added else f"task-{size // 2 - n}")
+
+    def get_available_slots(n):
+        scheduler.get_available_slots(booked_days[n % len(booked_days)] if booked_days else datetime(2030, 1, 7))
+
+    def book_appointment(n):
+        # Seven free hours a day (around the break), on days after the generated bookings
+        start = datetime(2031, 1, 1, (9, 10, 11, 13, 14, 15, 16)[n % 7]) + timedelta(days=n // 7)
+        scheduler.book_appointment(f"bench-client-{n}", start, 30, "bench")
+
+    for name, operation in [("get_tasks", get_tasks), ("add_task", add_task),
+                            ("update_task_status", update_task_status), ("remove_task", remove_task),
+                            ("get_available_slots", get_available_slots),
+                            ("book_appointment", book_appointment)]:
+        results[name] = measure(operation, args.samples, args.budget)
+    return results
+
+@contextlib.contextmanager
+def headless_display():
+    """
+    Yield an environment with a usable DISPLAY, or None when there is none.
+    """
+    env = dict(os.environ)
+    if env.get("DISPLAY"):
+        yield env
+        return
+    if not shutil.which("Xvfb"):
+        yield None
+        return
+    display = f":{100 + os.getpid() % 400}"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(0.5)
+        yield dict(env, DISPLAY=display)
+    finally:
+        server.terminate()
+        server.wait()
+
+def bench_ui(workload, runs, env):
+    code = UI_PROBE.format(root=ROOT_DIR, tasks_file=workload["tasks_file"],
+                           graph_file=workload["graph_file"], runs=runs)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if output.returncode != 0:
+        return {"error": output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "probe failed"}
+    probe = json.loads(output.stdout.strip().splitlines()[-1])
+    return dict(summarize(probe["samples"], sum(probe["samples"])), rows=probe["rows"])
+
+def compare(results, previous):
+    """
+    Print the p50 latency change of every operation against an earlier run.
+    """
+    print(f"{'size':>9}  {'operation':<22}{'before':>12}{'after':>12}{'change':>9}")
+    for size, entry in results["sizes"].items():
+        before_entry = previous.get("sizes", {}).get(size, {})
+        for name, stats in entry["operations"].items():
+            before = before_entry.get("operations", {}).get(name)
+            if not before or "p50_ms" not in stats or "p50_ms" not in before:
+                continue
+            change = (stats["p50_ms"] / before["p50_ms"] - 1) * 100 if before["p50_ms"] else 0.0
+            print(f"{size:>9}  {name:<22}{before['p50_ms']:>10.2f}ms{stats['p50_ms']:>10.2f}ms{change:>+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--shape", choices=SHAPES, default="random")
+    parser.add_argument("--density", type=float, default=2.0, help="average dependencies per task")
+    parser.add_argument("--width", type=int, default=100, help="layer width of the layered shape")
+    parser.add_argument("--bookings-per-day", type=int, default=4)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=50, help="most runs per operation")
+    parser.add_argument("--budget", type=float, default=20.0, help="seconds per operation before stopping early")
+    parser.add_argument("--ui-runs", type=int, default=10)
+    parser.add_argument("--no-ui", action="store_true", help="skip the GUI refresh benchmark")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": {},
+    }
+    with headless_display() if not args.no_ui else contextlib.nullcontext() as env:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                start = time.perf_counter()
+                workload = generate_workload(tmp, size, args.shape, args.density, args.width,
+                                             args.bookings_per_day, args.days)
+                entry = {
+                    "edges": workload["edges"],
+                    "bookings": workload["bookings"],
+                    "generate_s": time.perf_counter() - start,
+                }
+                if not args.no_ui:
+                    entry["ui_refresh"] = (bench_ui(workload, args.ui_runs, env) if env is not None
+                                           else {"skipped": "no display and Xvfb is not installed"})
+                entry["operations"] = bench_store(workload, size, args)
+                results["sizes"][str(size)] = entry
+            print(f"{size} tasks done", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Startup benchmark: import time and time-to-first-paint of the GUI.
+
+Each measurement runs in a fresh interpreter so module caches from earlier
+runs do not hide import costs. Without a display only import timings are
+reported.
+
+Usage:
+    python benchmarks/bench_startup.py [--tasks 10000] [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pandas", "networkx", "matplotlib")
+
+PROBE = r"""
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import src.main
+from src.main_logic import TaskManager
+from src.ui.main_window import MainWindow
+imported = time.perf_counter()
+result = {{"import_s": imported - start}}
+try:
+    app = MainWindow(TaskManager({tasks_file!r}, {graph_file!r}))
+    app.update()
+    result["first_paint_s"] = time.perf_counter() - start
+    result["rows_at_first_paint"] = len(app.tree.get_children())
+    app.destroy()
+except Exception as e:
+    result["first_paint_error"] = str(e)
+result["heavy_modules_at_first_paint"] = sorted(
+    name for name in {heavy!r} if name in sys.modules)
+print(json.dumps(result))
+"""
+
+def write_tasks(path, count):
+    with open(path, "w") as f:
+        f.write("id,task_name,category,priority,deadline,dependencies,status,created_at\n")
+        for i in range(1, count + 1):
+            f.write(f"{i},task-{i},cat-{i % 20},{i % 100 + 1},{i % 30 + 1},None,Not Started,2025-01-01 00:00:00\n")
+
+def run_probe(tasks_file, graph_file):
+    code = PROBE.format(root=ROOT_DIR, tasks_file=tasks_file, graph_file=graph_file, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def summarize(samples, field):
+    values = [sample[field] for sample in samples if field in sample]
+    if not values:
+        return None
+    return {"median_ms": statistics.median(values) * 1000, "min_ms": min(values) * 1000}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="number of tasks in the store")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreter runs")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_file = os.path.join(tmp, "tasks.csv")
+        graph_file = os.path.join(tmp, "dependencies.json")
+        write_tasks(tasks_file, args.tasks)
+        samples = [run_probe(tasks_file, graph_file) for _ in range(args.runs)]
+
+    results = {
+        "tasks": args.tasks,
+        "runs": args.runs,
+        "import": summarize(samples, "import_s"),
+        "first_paint": summarize(samples, "first_paint_s"),
+        "rows_at_first_paint": samples[-1].get("rows_at_first_paint"),
+        "heavy_modules_at_first_paint": samples[-1]["heavy_modules_at_first_paint"],
+    }
+    if "first_paint_error" in samples[-1]:
+        results["first_paint_error"] = samples[-1]["first_paint_error"]
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
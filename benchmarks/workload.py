@@ -0,0 +1,144 @@
+"""
+Synthetic task stores for the benchmarks.
+
+Writes tasks.csv, dependencies.json and appointments.json with N tasks,
+a dependency DAG of a chosen shape and density, and a number of booked
+appointments per working day.
+
+DAG shapes:
+    none     no dependencies
+    chain    every task depends on the one before it
+    tree     every task depends on its parent in a tree with `density` children per node
+    layered  layers of `width` tasks; each task depends on about `density`
+             tasks of the previous layer
+    random   each task depends on about `density` random earlier tasks
+
+Usage:
+    python benchmarks/workload.py DIRECTORY [--tasks 10000] [--shape random]
+                                  [--density 2] [--bookings-per-day 4] [--days 20]
+"""
+import argparse
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta
+
+SHAPES = ("none", "chain", "tree", "layered", "random")
+
+# Earliest booking day; far enough ahead that it never becomes "today"
+FIRST_BOOKING_DAY = datetime(2030, 1, 7)
+
+def dependency_ids(i, shape, density, width, rng):
+    """
+    Ids (1-based, all lower than i) of the tasks task i depends on.
+    """
+    if i == 1 or shape == "none":
+        return []
+    if shape == "chain":
+        return [i - 1]
+    if shape == "tree":
+        return [(i - 2) // max(1, int(density)) + 1]
+    count = min(i - 1, poisson(rng, density))
+    if shape == "layered":
+        layer_start = (i - 1) // width * width + 1
+        if layer_start == 1:
+            return []
+        previous = range(max(1, layer_start - width), layer_start)
+        return sorted(rng.sample(previous, min(count, len(previous))))
+    return sorted(rng.sample(range(1, i), count))
+
+def poisson(rng, mean):
+    # Knuth's method; fine for the small means used here
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+def booking_times(bookings_per_day, days):
+    """
+    Start times of `bookings_per_day` one-hour bookings on each of `days`
+    weekdays, spread over the morning and afternoon.
+    """
+    starts = [9, 10, 11, 13, 14, 15, 16]
+    day = FIRST_BOOKING_DAY
+    times = []
+    while days > 0:
+        if day.weekday() < 5:
+            times += [day.replace(hour=starts[n % len(starts)]) for n in range(min(bookings_per_day, len(starts)))]
+            days -= 1
+        day += timedelta(days=1)
+    return times
+
+def generate_workload(directory, tasks, shape="random", density=2.0, width=100,
+                      bookings_per_day=4, days=20, seed=0):
+    """
+    Write a synthetic store into directory.
+
+    The last tasks are the appointment tasks of the bookings, so the store
+    holds exactly `tasks` tasks in total.
+
+    :return: Dict with tasks_file, graph_file, appointments_file, edges and
+             bookings
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown DAG shape '{shape}'. Must be one of: {', '.join(SHAPES)}")
+    rng = random.Random(seed)
+    bookings = booking_times(bookings_per_day, days)[:tasks]
+    regular = tasks - len(bookings)
+
+    tasks_file = os.path.join(directory, "tasks.csv")
+    graph_file = os.path.join(directory, "dependencies.json")
+    appointments_file = os.path.join(directory, "appointments.json")
+    edges = []
+    with open(tasks_file, "w") as f:
+        f.write("id,task_name,category,priority,deadline,dependencies,status,created_at\n")
+        for i in range(1, regular + 1):
+            ids = dependency_ids(i, shape, density, width, rng)
+            deps = [f"task-{d}" for d in ids]
+            edges += [(d, i) for d in ids]
+            rendered = f'"{", ".join(deps)}"' if deps else "None"
+            f.write(f"{i},task-{i},cat-{i % 20},{i % 100 + 1},{i % 30 + 1},{rendered},"
+                    f"Not Started,2025-01-01 00:00:00\n")
+
+        appointments = []
+        for n, start in enumerate(bookings):
+            task_id = regular + n + 1
+            client = f"client-{n % 50}"
+            f.write(f"{task_id},Appointment - {client} - {start:%Y-%m-%d %H:%M},service,1,0,None,"
+                    f"Not Started,2025-01-01 00:00:00\n")
+            appointments.append({"task_id": task_id, "client": client, "start": start.isoformat(),
+                                 "duration": 60, "service_type": "service", "payment_status": "pending"})
+
+    with open(graph_file, "w") as f:
+        json.dump({"version": 2, "edges": edges}, f)
+    with open(appointments_file, "w") as f:
+        json.dump({"appointments": appointments}, f)
+
+    return {
+        "tasks_file": tasks_file,
+        "graph_file": graph_file,
+        "appointments_file": appointments_file,
+        "edges": len(edges),
+        "bookings": len(bookings),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--shape", choices=SHAPES, default="random")
+    parser.add_argument("--density", type=float, default=2.0, help="average dependencies per task")
+    parser.add_argument("--width", type=int, default=100, help="layer width of the layered shape")
+    parser.add_argument("--bookings-per-day", type=int, default=4)
+    parser.add_argument("--days", type=int, default=20, help="number of weekdays with bookings")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    print(json.dumps(generate_workload(args.directory, args.tasks, args.shape, args.density, args.width,
+                                       args.bookings_per_day, args.days, args.seed), indent=2))
+
+if __name__ == "__main__":
+    main()
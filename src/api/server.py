@@ -0,0 +1,441 @@
+"""
+Local HTTP/JSON API for the task store.
+
+Run with:
+    python -m src.api.server [--host 127.0.0.1] [--port 8765]
+
+Endpoints:
+    GET    /tasks?category=&min_priority=&status=&search=&limit=&offset=
+    POST   /tasks                  {"task_name", "category", "priority", "deadline", "dependencies"}
+    POST   /tasks/query            {"where": [[column, op, value]], "order_by": [[column, descending]],
+                                    "limit", "offset", "select": [columns]}
+    GET    /tasks/{name}
+    DELETE /tasks/{name}
+    PUT    /tasks/{name}/status    {"status"}
+    PUT    /tasks/{name}/name      {"task_name"}
+    POST   /tasks/{name}/dependencies               {"dependency"}
+    DELETE /tasks/{name}/dependencies/{dependency}
+    GET    /slots?date=YYYY-MM-DD&duration=60
+    GET    /appointments?start=YYYY-MM-DD&end=YYYY-MM-DD
+    POST   /appointments           {"client", "start_time", "duration", "service_type", "recurrence"}
+    PUT    /appointments/{task_id}/occurrences/{start}  {"start_time", "duration"}
+    DELETE /appointments/{task_id}/occurrences/{start}
+    POST   /batch                  [{"method", "path", "body"}, ...]
+    GET    /metrics                operation metrics snapshot; empty unless TASK_METRICS is set
+
+The task store stays loaded in memory between requests. Store operations
+run one at a time on a single background thread; requests that arrive
+while it is busy are queued and then run together inside one
+TaskManager.batch(), so a burst of writes costs a single file commit.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qs, unquote
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.main_logic import TaskManager
+from src.services.scheduler import Scheduler
+from src.utils.metrics import METRICS
+
+# Most queued requests executed in one batch
+MAX_BATCH = 256
+
+# Largest accepted request body, in bytes
+MAX_BODY = 1024 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ApiServer:
+    def __init__(self, task_manager, scheduler=None):
+        self.task_manager = task_manager
+        self.scheduler = scheduler or Scheduler(task_manager)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-api")
+        self._queue = None
+        self._server = None
+        self._dispatcher = None
+        self.routes = [
+            ('GET', ('tasks',), self.list_tasks),
+            ('POST', ('tasks',), self.add_task),
+            ('POST', ('tasks', 'query'), self.query_tasks),
+            ('GET', ('tasks', '{name}'), self.get_task),
+            ('DELETE', ('tasks', '{name}'), self.remove_task),
+            ('PUT', ('tasks', '{name}', 'status'), self.update_status),
+            ('PUT', ('tasks', '{name}', 'name'), self.rename_task),
+            ('POST', ('tasks', '{name}', 'dependencies'), self.add_dependency),
+            ('DELETE', ('tasks', '{name}', 'dependencies', '{dependency}'), self.remove_dependency),
+            ('GET', ('slots',), self.available_slots),
+            ('GET', ('appointments',), self.list_appointments),
+            ('POST', ('appointments',), self.book_appointment),
+            ('PUT', ('appointments', '{task_id}', 'occurrences', '{start}'), self.reschedule_occurrence),
+            ('DELETE', ('appointments', '{task_id}', 'occurrences', '{start}'), self.cancel_occurrence),
+            ('POST', ('batch',), self.batch),
+            ('GET', ('metrics',), self.metrics)
+        ]
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Start listening; returns once the socket is bound.
+        """
+        self._queue = asyncio.Queue()
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._dispatcher.cancel()
+        self._executor.shutdown(wait=True)
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    # --- HTTP --------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    self._write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, body, keep_alive = request
+                status, payload = await self.submit(method, target, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """
+        Read one request; returns None when the client closed the connection.
+        """
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length header")
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length header")
+        if length > MAX_BODY:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+        return method.upper(), target, body, keep_alive
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=str).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+    # --- Batching ----------------------------------------------------------
+
+    async def submit(self, method, target, body):
+        """
+        Queue a request for the store thread and wait for its (status, payload).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((method, target, body, future))
+        return await future
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await self._queue.get()]
+            while len(requests) < MAX_BATCH and not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._run_batch, [request[:3] for request in requests])
+            except Exception as e:
+                results = [(500, {'error': f"Could not save changes: {e}"})] * len(requests)
+
+            for (*_, future), result in zip(requests, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _run_batch(self, requests):
+        """
+        Run queued requests on the store thread, committing once at the end.
+        """
+        with self.task_manager.batch():
+            return [self.handle(method, target, body) for method, target, body in requests]
+
+    def handle(self, method, target, body):
+        """
+        Route and run a single request.
+
+        :param body: Raw request body (bytes), or already decoded JSON
+        :return: (status, payload) tuple
+        """
+        url = urlsplit(target)
+        segments = tuple(unquote(part) for part in url.path.strip('/').split('/') if part)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            params = self._match(pattern, segments)
+            if params is None:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            try:
+                if isinstance(body, (bytes, str)):
+                    body = json.loads(body) if body else None
+                return handler(params, query, body)
+            except HttpError as e:
+                return e.status, {'error': str(e)}
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {'error': str(e)}
+            except Exception as e:
+                return 500, {'error': str(e)}
+
+        if allowed:
+            return 405, {'error': f"Method {method} not allowed for {url.path}"}
+        return 404, {'error': f"No such endpoint: {url.path}"}
+
+    @staticmethod
+    def _match(pattern, segments):
+        if len(pattern) != len(segments):
+            return None
+        params = {}
+        for expected, segment in zip(pattern, segments):
+            if expected.startswith('{'):
+                params[expected[1:-1]] = segment
+            elif expected != segment:
+                return None
+        return params
+
+    # --- Endpoints ---------------------------------------------------------
+
+    def list_tasks(self, params, query, body):
+        filters = {
+            'category': query.get('category'),
+            'min_priority': int(query.get('min_priority') or 0),
+            'status': query.get('status') or "All"
+        }
+        task_query = self.task_manager.filters_to_query(filters)
+        if query.get('search'):
+            task_query = task_query.where('id', 'in', self.task_manager.search_task_ids(query['search']))
+        if query.get('offset'):
+            task_query = task_query.offset(int(query['offset']))
+        if query.get('limit'):
+            task_query = task_query.limit(int(query['limit']))
+        return 200, {'tasks': self.task_manager.query_records(task_query)}
+
+    def query_tasks(self, params, query, body):
+        from src.services.query import Query
+
+        body = body or {}
+        task_query = Query()
+        for column, op, value in body.get('where', []):
+            task_query = task_query.where(column, op, value)
+        for key in body.get('order_by', []):
+            column, descending = (key, False) if isinstance(key, str) else key
+            task_query = task_query.order_by(column, descending=bool(descending))
+        if body.get('select'):
+            task_query = task_query.select(*body['select'])
+        if body.get('offset'):
+            task_query = task_query.offset(int(body['offset']))
+        if body.get('limit') is not None:
+            task_query = task_query.limit(int(body['limit']))
+        return 200, {
+            'total': self.task_manager.count_tasks(task_query),
+            'tasks': self.task_manager.query_records(task_query)
+        }
+
+    def get_task(self, params, query, body):
+        task = self.task_manager.find_task(params['name'])
+        if task is None:
+            raise HttpError(404, f"Task '{params['name']}' not found")
+        return 200, task
+
+    def add_task(self, params, query, body):
+        body = self._require(body, 'task_name', 'category', 'priority', 'deadline')
+        dependencies = body.get('dependencies') or ''
+        if not isinstance(dependencies, str):
+            dependencies = ', '.join(dependencies)
+        task = self.task_manager.add_task({
+            'task_name': str(body['task_name']).strip(),
+            'category': str(body['category']).strip(),
+            'priority': int(body['priority']),
+            'deadline': int(body['deadline']),
+            'dependencies': dependencies
+        })
+        return 201, task
+
+    def remove_task(self, params, query, body):
+        self._require_task(params['name'])
+        self.task_manager.remove_task(params['name'])
+        return 200, {'removed': params['name']}
+
+    def update_status(self, params, query, body):
+        body = self._require(body, 'status')
+        self._require_task(params['name'])
+        self.task_manager.update_task_status(params['name'], body['status'])
+        return 200, self.task_manager.find_task(params['name'])
+
+    def rename_task(self, params, query, body):
+        body = self._require(body, 'task_name')
+        self._require_task(params['name'])
+        return 200, self.task_manager.rename_task(params['name'], body['task_name'])
+
+    def add_dependency(self, params, query, body):
+        body = self._require(body, 'dependency')
+        self._require_task(params['name'])
+        return 200, self.task_manager.add_dependency(params['name'], body['dependency'])
+
+    def remove_dependency(self, params, query, body):
+        self._require_task(params['name'])
+        return 200, self.task_manager.remove_dependency(params['name'], params['dependency'])
+
+    def available_slots(self, params, query, body):
+        if not query.get('date'):
+            raise HttpError(400, "Missing 'date' parameter")
+        date = datetime.strptime(query['date'], "%Y-%m-%d")
+        duration = int(query.get('duration') or 60)
+        slots = self.scheduler.get_available_slots(date, duration)
+        return 200, {'slots': [slot.isoformat() for slot in slots]}
+
+    def list_appointments(self, params, query, body):
+        """
+        Appointments in a date range, with recurring ones expanded for that
+        range only; end is exclusive and defaults to the day after start.
+        """
+        if not query.get('start'):
+            raise HttpError(400, "Missing 'start' parameter")
+        start = datetime.fromisoformat(query['start'])
+        end = datetime.fromisoformat(query['end']) if query.get('end') else start + timedelta(days=1)
+        appointments = self.scheduler.get_appointments(start, end)
+        return 200, {'appointments': [self.scheduler.serialize(a) for a in appointments]}
+
+    def book_appointment(self, params, query, body):
+        body = self._require(body, 'client', 'start_time', 'service_type')
+        task = self.scheduler.book_appointment(
+            body['client'],
+            datetime.fromisoformat(body['start_time']),
+            int(body.get('duration') or 60),
+            body['service_type'],
+            body.get('recurrence') or None
+        )
+        return 201, task
+
+    def reschedule_occurrence(self, params, query, body):
+        body = self._require(body, 'start_time')
+        occurrence = self.scheduler.reschedule_occurrence(
+            int(params['task_id']),
+            datetime.fromisoformat(params['start']),
+            datetime.fromisoformat(body['start_time']),
+            int(body['duration']) if body.get('duration') else None
+        )
+        return 200, occurrence
+
+    def cancel_occurrence(self, params, query, body):
+        series = self.scheduler.cancel_occurrence(int(params['task_id']), datetime.fromisoformat(params['start']))
+        return 200, series
+
+    def batch(self, params, query, body):
+        """
+        Run several requests in one round trip; they share one commit.
+        """
+        if not isinstance(body, list):
+            raise HttpError(400, "Expected a JSON list of requests")
+        results = []
+        for request in body:
+            status, payload = self.handle(
+                str(request.get('method', 'GET')).upper(), request['path'], request.get('body'))
+            results.append({'status': status, 'body': payload})
+        return 200, results
+
+    def metrics(self, params, query, body):
+        return 200, dict(METRICS.snapshot(), enabled=METRICS.enabled)
+
+    # --- Helpers -----------------------------------------------------------
+
+    @staticmethod
+    def _require(body, *fields):
+        if not isinstance(body, dict):
+            raise HttpError(400, "Expected a JSON object")
+        missing = [field for field in fields if body.get(field) in (None, '')]
+        if missing:
+            raise HttpError(400, f"Missing fields: {', '.join(missing)}")
+        return body
+
+    def _require_task(self, name):
+        if self.task_manager.find_task(name) is None:
+            raise HttpError(404, f"Task '{name}' not found")
+
+async def serve(host, port, task_manager):
+    server = ApiServer(task_manager)
+    host, port = await server.start(host, port)
+    print(f"Serving task API on http://{host}:{port}", flush=True)
+    await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API for the task store")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tasks-file", default="tasks.csv")
+    parser.add_argument("--graph-file", default="dependencies.json")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, TaskManager(args.tasks_file, args.graph_file)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
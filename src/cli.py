@@ -0,0 +1,509 @@
+"""
+Non-interactive command line interface for the task store.
+
+Usage:
+    python -m src.cli add --name NAME --category CAT --priority N --deadline DAYS [--depends A,B]
+    python -m src.cli add < tasks.ndjson             (bulk; NDJSON or CSV on stdin)
+    python -m src.cli remove NAME [NAME ...]         (or names / records on stdin)
+    python -m src.cli status NAME STATUS             (or records on stdin)
+    python -m src.cli link NAME DEPENDENCY           (or {"task_name", "dependency"} records on stdin)
+    python -m src.cli unlink NAME DEPENDENCY         (likewise)
+    python -m src.cli rename NAME NEW_NAME           (or {"task_name", "new_name"} records on stdin)
+    python -m src.cli list [--category C] [--min-priority N] [--status S] [--search TEXT]
+                           [--order-by COLUMN[:desc]] [--limit N] [--offset N] [--format F]
+    python -m src.cli overdue [--format F]
+    python -m src.cli export [--output FILE] [--format csv|ndjson|parquet|arrow]
+                             [--category C] [--min-priority N] [--status S]
+    python -m src.cli import FILE                    ('-' for stdin; keeps status and created_at,
+                                                      assigns new ids)
+    python -m src.cli graph [--task NAME] [--hops N] [--format edges|json|dot] [--show]
+    python -m src.cli analyze [--levels] [--workers N] [--format F]
+    python -m src.cli migrate                        (rewrite old store files in the current format)
+
+Running src/main_logic.py with any of these subcommands does the same.
+Results are streamed to stdout as they are produced, one line per record;
+errors for individual records go to stderr and make the exit status 1.
+Bulk input is applied in a single process and committed once.
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from itertools import chain
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main_logic import TaskManager
+from src.models.task import TASK_COLUMNS, STATUSES
+from src.utils import profiling
+
+OUTPUT_FORMATS = ["table", "ndjson", "csv"]
+
+def read_records(stream, input_format="auto"):
+    """
+    Yield (line_number, record) pairs from NDJSON or CSV text.
+
+    With input_format 'auto' the format is NDJSON if the first non-blank
+    line starts with '{', otherwise CSV with a header row.
+    """
+    lines = (line for line in stream)
+    first = None
+    number = 0
+    for first in lines:
+        number += 1
+        if first.strip():
+            break
+    else:
+        return
+
+    if input_format == "auto":
+        input_format = "ndjson" if first.lstrip().startswith('{') else "csv"
+
+    if input_format == "ndjson":
+        yield number, json.loads(first)
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, json.loads(line)
+    else:
+        reader = csv.DictReader([first])
+        header = reader.fieldnames
+        for record in csv.DictReader(lines, fieldnames=header):
+            number += 1
+            yield number, record
+
+def read_names(stream):
+    """
+    Yield (line_number, task_name) from plain lines, NDJSON or CSV with a
+    task_name column.
+    """
+    lines = iter(stream)
+    # Look ahead to the first non-blank line only, so input stays streamed
+    leading = []
+    for line in lines:
+        leading.append(line)
+        if line.strip():
+            break
+    first = leading[-1].strip() if leading else ""
+    lines = chain(leading, lines)
+    if first.startswith('{') or first.split(',')[0] == "task_name":
+        for number, record in read_records(lines):
+            yield number, record['task_name']
+    else:
+        for number, line in enumerate(lines, 1):
+            if line.strip():
+                yield number, line.strip()
+
+class Output:
+    """
+    Streams task records to stdout as a table, NDJSON or CSV.
+    """
+    TABLE_COLUMNS = [('id', 5), ('task_name', 20), ('category', 15), ('priority', 10), ('status', 15), ('deadline', 10)]
+
+    def __init__(self, output_format, stream=None, columns=None, table_columns=None):
+        self.format = output_format
+        self.stream = stream or sys.stdout
+        self.columns = columns
+        self.table_columns = table_columns or self.TABLE_COLUMNS
+        self._writer = None
+        self._count = 0
+
+    def write(self, record):
+        if self.format == "ndjson":
+            self.stream.write(json.dumps(record, default=str) + "\n")
+        elif self.format == "csv":
+            if self._writer is None:
+                self._writer = csv.DictWriter(self.stream, fieldnames=self.columns or list(record),
+                                              extrasaction='ignore')
+                self._writer.writeheader()
+            self._writer.writerow(record)
+        else:
+            if self._count == 0:
+                self.stream.write(" ".join(f"{name.replace('_', ' ').title():<{width}}"
+                                           for name, width in self.table_columns).rstrip() + "\n")
+            self.stream.write(" ".join(f"{str(record.get(name, '')):<{width}}"
+                                       for name, width in self.table_columns).rstrip() + "\n")
+        self._count += 1
+
+    def close(self):
+        if self._count == 0 and self.format == "table":
+            self.stream.write("No tasks found.\n")
+        self.stream.flush()
+
+def frame_records(frame):
+    """
+    Rows of a task DataFrame as dicts with dates formatted like tasks.csv.
+    """
+    from src.models.task_table import DATE_FORMAT
+
+    for column in ('created_at', 'due_at'):
+        if column in frame:
+            frame = frame.assign(**{column: frame[column].dt.strftime(DATE_FORMAT).fillna('')})
+    return frame.to_dict('records')
+
+def report_error(number, error):
+    prefix = f"line {number}: " if number is not None else ""
+    print(f"error: {prefix}{error}", file=sys.stderr)
+
+def task_data_from(record):
+    """
+    Task data for add_task from an input record; dependencies may be a
+    list or a comma-separated string.
+    """
+    dependencies = record.get('dependencies') or ''
+    if not isinstance(dependencies, str):
+        dependencies = ', '.join(dependencies)
+    elif dependencies == 'None':
+        dependencies = ''
+    missing = [field for field in ('task_name', 'category', 'priority', 'deadline')
+               if record.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    return {
+        'task_name': str(record['task_name']).strip(),
+        'category': str(record['category']).strip(),
+        'priority': int(record['priority']),
+        'deadline': int(record['deadline']),
+        'dependencies': dependencies
+    }
+
+def apply_records(task_manager, records, action, output):
+    """
+    Apply action(record) to every (line_number, record) in one batch,
+    streaming the results.
+
+    :return: Number of records that failed
+    """
+    failures = 0
+    with task_manager.batch():
+        for number, record in records:
+            try:
+                result = action(record)
+            except (ValueError, KeyError, TypeError) as e:
+                failures += 1
+                report_error(number, e)
+                continue
+            output.write(result)
+    output.close()
+    return failures
+
+# --- Commands ----------------------------------------------------------------
+
+def cmd_add(task_manager, args):
+    output = Output(args.format)
+    if args.name:
+        records = [(None, {
+            'task_name': args.name,
+            'category': args.category,
+            'priority': args.priority,
+            'deadline': args.deadline,
+            'dependencies': args.depends
+        })]
+    else:
+        records = read_records(sys.stdin, args.input_format)
+    return apply_records(task_manager, records, lambda record: task_manager.add_task(task_data_from(record)), output)
+
+def cmd_import(task_manager, args):
+    """
+    Add exported tasks with their status and creation time. Tasks get new
+    ids in this store; dependencies refer to names, so they still resolve.
+    """
+    def import_task(record):
+        task_data = task_data_from(record)
+        if record.get('status') not in (None, '', 'None'):
+            task_data['status'] = record['status']
+        if record.get('created_at'):
+            task_data['created_at'] = record['created_at']
+        # Validated and written as one add, so a rejected line leaves nothing behind
+        return task_manager.add_task(task_data)
+
+    output = Output(args.format)
+    if args.file == '-':
+        return apply_records(task_manager, read_records(sys.stdin, args.input_format), import_task, output)
+    with open(args.file, newline='') as f:
+        return apply_records(task_manager, read_records(f, args.input_format), import_task, output)
+
+def cmd_remove(task_manager, args):
+    names = [(None, name) for name in args.names] if args.names else read_names(sys.stdin)
+
+    def remove(name):
+        task_manager.remove_task(name)
+        return {'task_name': name, 'removed': True}
+
+    return apply_records(task_manager, names, remove, Output(args.format))
+
+def cmd_status(task_manager, args):
+    if args.name:
+        if not args.status:
+            report_error(None, "a status is required")
+            return 1
+        records = [(None, {'task_name': args.name, 'status': args.status})]
+    else:
+        records = read_records(sys.stdin, args.input_format)
+
+    def update(record):
+        task_manager.update_task_status(record['task_name'], record['status'])
+        return task_manager.find_task(record['task_name'])
+
+    return apply_records(task_manager, records, update, Output(args.format))
+
+def cmd_rename(task_manager, args):
+    if args.name:
+        if not args.new_name:
+            report_error(None, "a new name is required")
+            return 1
+        records = [(None, {'task_name': args.name, 'new_name': args.new_name})]
+    else:
+        records = read_records(sys.stdin, args.input_format)
+
+    def rename(record):
+        return task_manager.rename_task(record['task_name'], record['new_name'])
+
+    return apply_records(task_manager, records, rename, Output(args.format))
+
+def cmd_link(task_manager, args):
+    if args.name:
+        if not args.dependency:
+            report_error(None, "a dependency is required")
+            return 1
+        records = [(None, {'task_name': args.name, 'dependency': args.dependency})]
+    else:
+        records = read_records(sys.stdin, args.input_format)
+
+    change = task_manager.remove_dependency if args.unlink else task_manager.add_dependency
+
+    def link(record):
+        return change(record['task_name'], record['dependency'])
+
+    return apply_records(task_manager, records, link, Output(args.format))
+
+def cmd_list(task_manager, args):
+    query = task_manager.filters_to_query({
+        'category': args.category,
+        'min_priority': args.min_priority,
+        'status': args.status or "All"
+    })
+    if args.search:
+        query = query.where('id', 'in', task_manager.search_task_ids(args.search))
+    for key in args.order_by or []:
+        column, _, direction = key.partition(':')
+        query = query.order_by(column, descending=direction.lower() == 'desc')
+    if args.offset:
+        query = query.offset(args.offset)
+    if args.limit is not None:
+        query = query.limit(args.limit)
+
+    output = Output(args.format, columns=TASK_COLUMNS)
+    for record in task_manager.query_records(query):
+        output.write(record)
+    output.close()
+    return 0
+
+def cmd_overdue(task_manager, args):
+    output = Output(args.format)
+    for record in frame_records(task_manager.get_overdue_tasks()):
+        output.write(record)
+    output.close()
+    return 0
+
+def cmd_export(task_manager, args):
+    from src.services.exporter import format_for
+
+    export_format = args.format or (format_for(args.output) if args.output else 'csv')
+    if not args.output and export_format in ('parquet', 'arrow'):
+        report_error(None, f"--output is required for {export_format} exports")
+        return 1
+
+    query = None
+    if args.category or args.min_priority or args.status:
+        query = task_manager.filters_to_query({
+            'category': args.category,
+            'min_priority': args.min_priority,
+            'status': args.status or "All"
+        })
+    task_manager.export(args.output or sys.stdout, export_format, query)
+    return 0
+
+def cmd_graph(task_manager, args):
+    if args.task:
+        if task_manager.find_task(args.task) is None:
+            report_error(None, f"Task '{args.task}' not found")
+            return 1
+        if args.task in task_manager.graph:
+            graph, _ = task_manager.get_dependency_neighborhood(args.task, args.hops)
+            edges = list(graph.edges())
+        else:
+            edges = []
+    else:
+        edges = list(task_manager.graph.edges())
+
+    if args.format == "json":
+        print(json.dumps({'edges': edges}))
+    elif args.format == "dot":
+        print("digraph dependencies {")
+        for source, target in edges:
+            print(f"  {json.dumps(source)} -> {json.dumps(target)};")
+        print("}")
+    else:
+        for source, target in edges:
+            print(f"{source} -> {target}")
+
+    if args.show:
+        task_manager.visualize_dependencies(args.task or '', args.hops)
+    return 0
+
+def cmd_migrate(task_manager, args):
+    if task_manager.migrate_store():
+        print(f"Rewrote {task_manager.graph_file} with dependencies stored by task id")
+    else:
+        print("Store is already in the current format")
+    return 0
+
+def cmd_analyze(task_manager, args):
+    results = task_manager.analyze_graph(args.workers)
+    if args.levels:
+        output = Output(args.format, table_columns=[('id', 8), ('task_name', 20), ('category', 15),
+                                                    ('status', 15), ('level', 6)])
+        records = results['levels'].to_dict('records')
+    else:
+        output = Output(args.format, table_columns=[('category', 15), ('tasks', 8), ('open', 8),
+                                                    ('remaining_days', 16), ('critical_days', 15),
+                                                    ('critical_path', 40)])
+        records = results['categories'].to_dict('records')
+        if args.format != "ndjson":
+            for record in records:
+                record['critical_path'] = ' -> '.join(record['critical_path'])
+    for record in records:
+        output.write(record)
+    output.close()
+    if results['cyclic']:
+        report_error(None, f"{results['cyclic']} tasks are on or depend on a dependency cycle")
+    return 0
+
+# --- Parser ------------------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="task-manager",
+        description="Scriptable interface to the task store.",
+        epilog="Run without a subcommand (via src/main_logic.py) for the interactive menu."
+    )
+    parser.add_argument("--tasks-file", default="tasks.csv", help="CSV file storing tasks")
+    parser.add_argument("--graph-file", default="dependencies.json", help="JSON file storing dependencies")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_output(subparser, default="ndjson"):
+        subparser.add_argument("--format", choices=OUTPUT_FORMATS, default=default, help="output format")
+
+    def add_input(subparser):
+        subparser.add_argument("--input-format", choices=["auto", "ndjson", "csv"], default="auto",
+                               help="format of records read from stdin or a file")
+
+    add = commands.add_parser("add", help="add a task, or tasks from stdin")
+    add.add_argument("--name", help="task name; omit to read tasks from stdin")
+    add.add_argument("--category", default="")
+    add.add_argument("--priority", type=int, default=1)
+    add.add_argument("--deadline", type=int, default=1, help="deadline in days")
+    add.add_argument("--depends", default="", help="comma-separated names of tasks this depends on")
+    add_output(add)
+    add_input(add)
+    add.set_defaults(handler=cmd_add)
+
+    remove = commands.add_parser("remove", help="remove tasks by name")
+    remove.add_argument("names", nargs="*", help="task names; omit to read names from stdin")
+    add_output(remove)
+    remove.set_defaults(handler=cmd_remove)
+
+    status = commands.add_parser("status", help="update task status")
+    status.add_argument("name", nargs="?", help="task name; omit to read records from stdin")
+    status.add_argument("status", nargs="?", choices=STATUSES)
+    add_output(status)
+    add_input(status)
+    status.set_defaults(handler=cmd_status)
+
+    for command, unlink, help_text in (("link", False, "make a task depend on another"),
+                                       ("unlink", True, "remove a dependency from a task")):
+        link = commands.add_parser(command, help=help_text)
+        link.add_argument("name", nargs="?", help="task name; omit to read records from stdin")
+        link.add_argument("dependency", nargs="?")
+        add_output(link)
+        add_input(link)
+        link.set_defaults(handler=cmd_link, unlink=unlink)
+
+    rename = commands.add_parser("rename", help="rename a task")
+    rename.add_argument("name", nargs="?", help="task name; omit to read records from stdin")
+    rename.add_argument("new_name", nargs="?")
+    add_output(rename)
+    add_input(rename)
+    rename.set_defaults(handler=cmd_rename)
+
+    listing = commands.add_parser("list", help="list tasks")
+    listing.add_argument("--category", help="category contains this text")
+    listing.add_argument("--min-priority", type=int, default=0)
+    listing.add_argument("--status", choices=STATUSES)
+    listing.add_argument("--search", help="full-text search over names and categories")
+    listing.add_argument("--order-by", action="append", metavar="COLUMN[:desc]")
+    listing.add_argument("--limit", type=int)
+    listing.add_argument("--offset", type=int, default=0)
+    add_output(listing, default="table")
+    listing.set_defaults(handler=cmd_list)
+
+    overdue = commands.add_parser("overdue", help="list overdue tasks, most overdue first")
+    add_output(overdue, default="table")
+    overdue.set_defaults(handler=cmd_overdue)
+
+    export = commands.add_parser("export", help="export tasks")
+    export.add_argument("--output", "-o", help="file to write; defaults to stdout")
+    export.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"],
+                        help="defaults to the output file's extension, or csv")
+    export.add_argument("--category", help="only tasks whose category contains this text")
+    export.add_argument("--min-priority", type=int, default=0)
+    export.add_argument("--status", choices=STATUSES)
+    export.set_defaults(handler=cmd_export)
+
+    importer = commands.add_parser("import", help="add tasks from an exported CSV or NDJSON file")
+    importer.add_argument("file", help="file to read, or '-' for stdin")
+    add_output(importer)
+    add_input(importer)
+    importer.set_defaults(handler=cmd_import)
+
+    graph = commands.add_parser("graph", help="print dependency edges")
+    graph.add_argument("--task", help="only the neighborhood of this task")
+    graph.add_argument("--hops", type=int, default=2, help="dependency levels around --task")
+    graph.add_argument("--format", choices=["edges", "json", "dot"], default="edges")
+    graph.add_argument("--show", action="store_true", help="also draw the graph in a window")
+    graph.set_defaults(handler=cmd_graph)
+
+    migrate = commands.add_parser("migrate", help="rewrite store files from older versions in the current format")
+    migrate.set_defaults(handler=cmd_migrate)
+
+    analyze = commands.add_parser("analyze", help="per-category workload and critical paths, or task levels")
+    analyze.add_argument("--levels", action="store_true",
+                         help="print the dependency level of every task instead")
+    analyze.add_argument("--workers", type=int, help="worker processes; defaults to the number of CPUs")
+    add_output(analyze, default="table")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    return parser
+
+def main(argv=None):
+    """
+    Run a CLI command; returns the process exit status.
+    """
+    args = build_parser().parse_args(argv)
+    task_manager = TaskManager(args.tasks_file, args.graph_file)
+    try:
+        with profiling.action(args.command):
+            failures = args.handler(task_manager, args)
+    except BrokenPipeError:
+        # Output piped into e.g. head, which stopped reading
+        return 0
+    except (ValueError, OSError) as e:
+        report_error(None, e)
+        return 1
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,28 @@
 import os
 import sys
+import argparse
 
 # Add the project root directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.main_logic import TaskManager
 from src.ui.main_window import MainWindow
+from src.utils import profiling
 
-def main():
+def main(argv=None):
     """
     Initialize and start the task management application with GUI.
+
+    With --profile DIR the session is profiled and the results written to
+    DIR when the window closes (see src/utils/profiling.py).
     """
-    task_manager = TaskManager()
-    app = MainWindow(task_manager)
-    app.mainloop()
+    parser = profiling.add_arguments(argparse.ArgumentParser(description="Task Management System"))
+    args = parser.parse_args(argv)
+
+    with profiling.profiled(args):
+        task_manager = TaskManager()
+        app = MainWindow(task_manager)
+        app.mainloop()
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,41 @@
-import pandas as pd
 import os
+import sys
+import csv
 import json
-import networkx as nx
-import matplotlib.pyplot as plt
+from itertools import islice
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.lazy_import import lazy_import
+from src.utils.file_lock import FileLock, atomic_write
+from src.utils.file_transaction import FileTransaction
+from src.utils.metrics import METRICS, instrumented, timed
+from src.utils import profiling
+from src.utils.graph_utils import LayoutCache, draw_graph, layered_layout
+from src.models.task import TASK_COLUMNS, STATUSES
+
+# Heavy dependencies are imported on first use to keep startup fast
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+nx = lazy_import('networkx')
+plt = lazy_import('matplotlib.pyplot')
+
+# External edits touching more tasks than this are reported as one 'reloaded'
+# event instead of one event per task
+MAX_CHANGE_EVENTS = 1000
+
+# Dependency and status edits appended to the journal before it is folded into the files
+MAX_JOURNAL_ENTRIES = 1000
+
+# Format of the graph file: 1 stored edges as task name pairs, 2 as
+# (dependency id, task id) pairs so that tasks can be renamed
+GRAPH_FORMAT_VERSION = 2
+
+
+@instrumented
 class TaskManager:
     def __init__(self, file_name="tasks.csv", graph_file="dependencies.json"):
         """
@@ -15,97 +46,659 @@ class TaskManager:
         """
         self.file_name = file_name
         self.graph_file = graph_file
+        # Single dependency edits and status changes are appended here and
+        # folded into the files by the next full write. The name predates
+        # status entries and is kept so existing journals are still read
+        self.journal_file = os.path.splitext(graph_file)[0] + ".journal"
+        self._journal_entries = 0
+        self._journal_edges = 0
+        # Binary copy of the CSV contents, memory-mapped at load time
+        self.snapshot_file = os.path.splitext(file_name)[0] + ".snapshot"
+
+        # Other processes (e.g. the GUI and the CLI) may use the same files:
+        # writers hold the exclusive lock and replace files atomically
+        self._lock = FileLock(file_name + ".lock")
+
+        # Both files are replaced together through a manifest so a crash
+        # can't leave them out of step; finish any interrupted write first
+        self._transaction = FileTransaction(file_name + ".manifest", [file_name, graph_file, self.journal_file])
+        self.recover_store()
         
         # Initialize the CSV file if it doesn't exist
         self.initialize_csv()
         
-        # Load existing graph or create a new one
-        self.graph = self.load_or_create_graph()
+        # Typed table of the CSV contents, cached until the file changes
+        self._table = None
+        self._table_signature = None
+
+        # Indexes derived from the table, built on first use
+        self._deadline_index = None
+        self._search_index = None
+        self._reachability = None
+
+        # Dependency graph, loaded on first access, and the format version
+        # of the graph file it was loaded from
+        self._graph = None
+        self._graph_signature = None
+        self._graph_format = None
+
+        # Bumped on every graph change so cached layouts can be reused safely
+        self.graph_version = 0
+        self._layout_cache = None
+
+        # Callbacks notified about task changes
+        self._listeners = []
+
+        # Nesting depth of batch(), whether it has unsaved changes, and the
+        # (callback, rollback) pairs waiting for its commit
+        self._batch_depth = 0
+        self._batch_pending = None
+        self._batch_callbacks = []
+
+    @property
+    def graph(self):
+        """
+        Task dependency graph, loaded from the graph file on first access.
+        """
+        if self._graph is None:
+            with self._lock.shared():
+                self._graph_signature = self._graph_file_signature()
+                self._graph = self.load_or_create_graph()
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        self._graph = graph
+
+    def add_listener(self, callback):
+        """
+        Register a callback for task change events.
+
+        :param callback: Callable invoked as callback(event, task) where event is
+                         'added', 'removed' or 'updated' and task is a dict of the row.
+                         Changes made by another process are reported the same way
+                         once noticed, or as a single 'reloaded' event with task None
+                         when there are too many of them
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregister a callback previously passed to add_listener.
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, task):
+        """
+        Emit a change event for a single task to all registered listeners.
+        """
+        for callback in list(self._listeners):
+            callback(event, task)
+
+    def recover_store(self):
+        """
+        Repair the store after a crash during a write: a write that reached
+        its commit point is completed, anything earlier is discarded.
+
+        :return: List of files that were rolled forward
+        """
+        with self._lock.exclusive():
+            return self._transaction.recover()
 
     def initialize_csv(self):
         """
         Create the CSV file with the required columns if it doesn't exist.
         """
-        if not os.path.exists(self.file_name):
-            cols = ["id", "task_name", "category", "priority", "deadline", "dependencies", "status", "created_at"]
-            df = pd.DataFrame(columns=cols)
-            df.to_csv(self.file_name, index=False)
+        with self._lock.exclusive():
+            if not os.path.exists(self.file_name):
+                with atomic_write(self.file_name, newline='') as f:
+                    csv.writer(f).writerow(TASK_COLUMNS)
+
+    def peek_tasks(self, limit=100):
+        """
+        Read the first tasks straight from the CSV without loading pandas.
 
+        Meant for showing a first page quickly at startup; rows carry the same
+        keys as get_tasks with numeric fields converted to int.
+
+        :param limit: Maximum number of tasks to read
+        :return: List of task dicts
+        """
+        with open(self.file_name, newline='') as f:
+            rows = list(islice(csv.DictReader(f), limit))
+        # Status changes may still be in the journal rather than the CSV
+        statuses = {task_id: status for op, task_id, status, *_ in self._parse_journal() if op == 'status'}
+        for row in rows:
+            for field in ('id', 'priority', 'deadline'):
+                row[field] = int(row[field])
+            row['dependencies'] = row['dependencies'] or 'None'
+            row['status'] = statuses.get(row['id'], row['status'])
+        return rows
+
+    @timed('load_graph')
     def load_or_create_graph(self):
         """
         Load existing task dependency graph or create a new one.
+
+        The graph file refers to tasks by id; nodes are labelled with the
+        current task names, taken from the loaded table so each name is
+        stored once. Edges between ids that are no longer tasks are dropped.
         
         :return: NetworkX Directed Graph of task dependencies
         """
+        table = self._load_table()
+        edges = self._read_graph_edges(table)
+        ids = table.frame['id'].to_numpy()
+        edges = edges[np.isin(edges, ids).all(axis=1)]
+        names = table.frame['task_name'].to_numpy()
+        dependencies, tasks = names[table.positions(edges[:, 0])], names[table.positions(edges[:, 1])]
+
+        graph = nx.DiGraph()
+        graph.add_edges_from(zip(dependencies.tolist(), tasks.tolist()))
+
+        for op, task_id, dependency_id, *_ in self._read_journal():
+            if op == 'status':
+                continue
+            task_position, dependency_position = table.position(task_id), table.position(dependency_id)
+            if task_position is None or dependency_position is None:
+                continue
+            dependency_name, task_name = names[dependency_position], names[task_position]
+            if op == 'add':
+                graph.add_edge(dependency_name, task_name)
+            elif graph.has_edge(dependency_name, task_name):
+                graph.remove_edge(dependency_name, task_name)
+        return graph
+
+    def _read_graph_edges(self, table):
+        """
+        Edges in the graph file as an array of (dependency id, task id) rows.
+
+        Files in format 1 list name pairs; they are resolved through the
+        table, and rewritten by migrate_store() or the next graph save.
+        """
         try:
             with open(self.graph_file, 'r') as f:
                 graph_data = json.load(f)
-                graph = nx.DiGraph()
-                for edge in graph_data.get('edges', []):
-                    graph.add_edge(edge[0], edge[1])
-                return graph
+                if METRICS.enabled:
+                    METRICS.add('bytes_read', os.fstat(f.fileno()).st_size, file=os.path.basename(self.graph_file))
         except FileNotFoundError:
-            return nx.DiGraph()
+            graph_data = {'version': GRAPH_FORMAT_VERSION}
+
+        self._graph_format = graph_data.get('version', 1)
+        edges = graph_data.get('edges', [])
+        if self._graph_format == 1:
+            edges = [(table.id_for(dependency), table.id_for(task)) for dependency, task in edges]
+            edges = [edge for edge in edges if None not in edge]
+        elif self._graph_format != GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph file format {self._graph_format} in {self.graph_file}")
+        return np.array(edges, dtype=np.int64).reshape(-1, 2)
 
+    @timed('save_graph')
     def save_graph(self):
         """
         Save the current task dependency graph to a JSON file.
         """
+        if self._graph is None:
+            # Never loaded, so nothing changed
+            return
+        with self._lock.exclusive():
+            table = self._load_table()
+            self._transaction.commit({self.graph_file: lambda f: self._write_graph(f, table)})
+            self._graph_signature = self._graph_file_signature()
+            self._graph_format = GRAPH_FORMAT_VERSION
+        if METRICS.enabled:
+            self._count_written([self.graph_file])
+
+    def _write_graph(self, f, table):
+        # Edges are stored by id; names that are not tasks have no id and are left out
+        edges = [[table.id_for(dependency), table.id_for(task)] for dependency, task in self.graph.edges()]
         graph_data = {
-            'edges': list(self.graph.edges())
+            'version': GRAPH_FORMAT_VERSION,
+            'edges': [edge for edge in edges if None not in edge]
         }
-        with open(self.graph_file, 'w') as f:
-            json.dump(graph_data, f)
+        json.dump(graph_data, f)
+
+    @timed('migrate_store')
+    def migrate_store(self):
+        """
+        Rewrite a graph file from before dependencies were stored by id,
+        and fold any journalled edits, in the current format. Loading
+        already reads the old format; this only saves converting it again.
+
+        :return: True if the files were rewritten
+        """
+        with self._lock.exclusive():
+            self._sync_graph()
+            table = self._load_table()
+            self.graph
+            if self._graph_format == GRAPH_FORMAT_VERSION and not self._journal_entries:
+                return False
+            self._save_table(table, with_graph=True)
+            return True
+
+    @staticmethod
+    def _signature(path):
+        """
+        Identity of a file's current contents; files are replaced on write,
+        so the inode changes even if size and mtime do not.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _file_signature(self):
+        return self._signature(self.file_name), self._signature(self.journal_file)
+
+    def _graph_file_signature(self):
+        return self._signature(self.graph_file), self._signature(self.journal_file)
+
+    def _read_journal(self):
+        """
+        Edits recorded since the last full write, as (op, task_id, value)
+        tuples: ('add' or 'remove', task_id, dependency_id) for dependency
+        edits and ('status', task_id, status) for status changes. Dependency
+        entries written before the graph was keyed by id also carry the two
+        names, which are unused.
+
+        A line that doesn't parse, such as an incomplete last line left by a
+        crash during an append, is skipped; the next write folds the journal
+        instead of appending to it (see _journal_torn).
+        """
+        entries = self._parse_journal()
+        self._journal_entries = len(entries)
+        self._journal_edges = sum(1 for entry in entries if entry[0] != 'status')
+        return entries
+
+    def _parse_journal(self):
+        try:
+            with open(self.journal_file) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(tuple(json.loads(line)))
+            except ValueError:
+                continue
+        return entries
+
+    def _journal_torn(self):
+        """
+        Whether the journal ends in an incomplete line, left by a crash
+        during an append. Appending after it would glue the new entry onto
+        that line and lose it, so the journal is folded instead.
+        """
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if not f.tell():
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b'\n'
+        except FileNotFoundError:
+            return False
+
+    def _apply_journal(self, table):
+        for op, task_id, dependency_id, *_ in self._read_journal():
+            if op == 'status':
+                if table.position(task_id) is not None:
+                    table.set_status(task_id, dependency_id)
+                continue
+            if table.position(task_id) is None or table.position(dependency_id) is None:
+                continue
+            if op == 'add':
+                if dependency_id not in table.dependencies(table.position(task_id)):
+                    table.add_dependency(task_id, dependency_id)
+            else:
+                table.remove_dependency(task_id, dependency_id)
+
+    @timed('load_table')
+    def _load_table(self):
+        """
+        Typed TaskTable for the CSV file, re-read only when the file changed.
 
+        The binary snapshot is used when it matches the CSV, so only the
+        pages that are used get read; otherwise the CSV is parsed and the
+        snapshot rewritten for next time. When the file was changed by
+        another process, listeners are told about the tasks that differ
+        from the cached copy.
+        """
+        from src.models.task_table import TaskTable
+        from src.models.snapshot import read_snapshot
+
+        if self._table is not None and self._file_signature() == self._table_signature:
+            return self._table
+
+        with self._lock.shared():
+            signature = self._file_signature()
+            table = read_snapshot(self.snapshot_file, signature[0])
+            if table is None:
+                table = TaskTable.read_csv(self.file_name)
+                if METRICS.enabled and signature[0] is not None:
+                    METRICS.add('bytes_read', signature[0][2], file=os.path.basename(self.file_name))
+                self._write_snapshot(table, signature[0])
+            self._apply_journal(table)
+
+        previous = self._table
+        self._table = table
+        self._table_signature = signature
+        self._reset_indexes()
+        if previous is not None:
+            self._notify_external_changes(table, previous)
+        return table
+
+    def _notify_external_changes(self, table, previous):
+        added, removed, updated = table.diff(previous)
+        renamed = self._renamed_tasks(table, previous, updated)
+        if renamed:
+            # Dependents show the new names, and the graph file is keyed by
+            # id so it did not change; relabel by reloading the graph
+            dependents = table.frame['id'].to_numpy()[table.dependent_positions(renamed)]
+            updated = sorted(set(updated) | set(dependents.tolist()))
+            if self._graph is not None:
+                self._graph = None
+                self.graph_version += 1
+        if len(added) + len(removed) + len(updated) > MAX_CHANGE_EVENTS:
+            self._notify('reloaded', None)
+            return
+
+        for task_id in removed:
+            self._notify('removed', previous.record(previous.position(task_id)))
+        for event, task_ids in (('added', added), ('updated', updated)):
+            for task_id in task_ids:
+                self._notify(event, table.record(table.position(task_id)))
+
+    @staticmethod
+    def _renamed_tasks(table, previous, task_ids):
+        """
+        The ids among task_ids whose name differs between two table versions.
+        """
+        if not task_ids:
+            return []
+        task_ids = np.asarray(task_ids)
+        names = table.frame['task_name'].to_numpy()[table.positions(task_ids)]
+        previous_names = previous.frame['task_name'].to_numpy()[previous.positions(task_ids)]
+        return task_ids[names != previous_names].tolist()
+
+    def _sync_graph(self):
+        """
+        Drop the cached graph if another process rewrote the graph file.
+        """
+        if self._graph is not None and self._graph_file_signature() != self._graph_signature:
+            self._graph = None
+            self.graph_version += 1
+
+    def files_changed(self):
+        """
+        Check whether the task files differ from the loaded copies, e.g.
+        because another process wrote them. Only stats the files, so it is
+        cheap enough to poll.
+        """
+        return ((self._table is not None and self._file_signature() != self._table_signature)
+                or (self._graph is not None and self._graph_file_signature() != self._graph_signature))
+
+    def refresh(self):
+        """
+        Pick up changes other processes made to the task files.
+
+        Changed tasks are reported to listeners as usual.
+        """
+        if self._table is not None:
+            self._load_table()
+        self._sync_graph()
+
+    def _reset_indexes(self):
+        """
+        Drop indexes derived from the table so they are rebuilt on next use.
+        """
+        self._deadline_index = None
+        self._search_index = None
+        self._reachability = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several mutations into a single write.
+
+        Holds the exclusive lock for the whole block and commits the files
+        once at the end instead of after every add, remove or status change.
+        Mutations that raise are skipped as usual; if the final write fails
+        the in-memory copies are dropped, the after_commit() rollbacks run
+        and the error is raised.
+        """
+        with self._lock.exclusive():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    callbacks, self._batch_callbacks = self._batch_callbacks, []
+                    try:
+                        if self._batch_pending is not None:
+                            table, with_graph = self._batch_pending
+                            self._batch_pending = None
+                            self._save_table(table, with_graph)
+                    except Exception:
+                        for _, rollback in callbacks:
+                            if rollback is not None:
+                                rollback()
+                        raise
+                    for callback, _ in callbacks:
+                        callback()
+
+    def after_commit(self, callback, rollback=None):
+        """
+        Run callback once the current changes are in the files: when the
+        outermost batch() commits, or right away outside a batch. If the
+        batch's write fails, rollback runs instead.
+
+        For files kept alongside the store, such as booked appointments,
+        that must not get ahead of the tasks they refer to.
+        """
+        if not self._batch_depth:
+            callback()
+            return
+        self._batch_callbacks.append((callback, rollback))
+
+    @timed('save_table')
+    def _save_table(self, table, with_graph=False):
+        """
+        Write the TaskTable back to the CSV file and keep it as the cached copy.
+
+        :param with_graph: Also write the dependency graph, in the same transaction
+        """
+        if self._batch_depth:
+            # Written once when the outermost batch() ends
+            previous = self._batch_pending[1] if self._batch_pending else False
+            self._table = table
+            self._batch_pending = (table, with_graph or previous)
+            return
+
+        writers = {self.file_name: table.to_csv}
+        folded = bool(self._journal_entries) or self._journal_torn()
+        if folded:
+            # Fold the journalled edits; the graph file only needs rewriting
+            # if some of them are dependency edits
+            if self._journal_edges:
+                self.graph
+                with_graph = True
+            writers[self.journal_file] = lambda f: None
+        with_graph = with_graph and self._graph is not None
+        if with_graph:
+            writers[self.graph_file] = lambda f: self._write_graph(f, table)
+
+        try:
+            self._transaction.commit(writers)
+        except Exception:
+            # The in-memory copies may be ahead of the files; reload next time
+            self._table = None
+            self._reset_indexes()
+            if with_graph:
+                self._graph = None
+                self.graph_version += 1
+            raise
+        self._journal_entries = 0
+        self._journal_edges = 0
+        self._table = table
+        self._table_signature = self._file_signature()
+        if with_graph:
+            self._graph_signature = self._graph_file_signature()
+            self._graph_format = GRAPH_FORMAT_VERSION
+        elif folded and self._graph is not None:
+            # Only status entries were folded; the loaded graph still matches
+            self._graph_signature = self._graph_file_signature()
+        self._write_snapshot(table, self._table_signature[0])
+        if METRICS.enabled:
+            self._count_written(list(writers) + [self.snapshot_file])
+
+    def _write_snapshot(self, table, source):
+        """
+        Refresh the binary snapshot for the CSV with the given signature.
+        It is only a cache, so failing to write it is not an error.
+        """
+        from src.models.snapshot import write_snapshot
+
+        if source is None:
+            return
+        try:
+            write_snapshot(table, self.snapshot_file, source)
+        except OSError:
+            pass
+
+    def _count_written(self, paths):
+        for path in paths:
+            signature = self._signature(path)
+            if signature is not None:
+                METRICS.add('bytes_written', signature[2], file=os.path.basename(path))
+
+    @timed('add_task')
     def add_task(self, task_data=None):
         """
         Add a new task to the task management system.
         Can be called from GUI or CLI.
+
+        task_data may also carry a 'status' and a 'created_at' (datetime or
+        DATE_FORMAT text), as imports do, so the task is written in its
+        final state in one commit; they default to 'Not Started' and now.
+
+        :return: The new task as a dict of the row
         """
-        df = pd.read_csv(self.file_name)
-        next_id = df['id'].max() + 1 if not df.empty else 1
+        if not task_data:  # CLI mode; ask before taking the lock
+            task_data = self.prompt_task_data()
+
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            next_id = table.next_id()
 
-        if task_data:  # GUI mode
             name = task_data['task_name']
             category = task_data['category']
             priority = task_data['priority']
             deadline = task_data['deadline']
             dependencies = task_data['dependencies'].split(',') if task_data['dependencies'] else []
             dependencies = [d.strip() for d in dependencies if d.strip()]
-        else:
-            # CLI mode logic remains the same
-            # ...existing code...
-            return
 
-        # Validate task name uniqueness
-        if name in df['task_name'].values:
-            raise ValueError("A task with this name already exists")
-
-        # Validate dependencies
-        invalid_deps = [dep for dep in dependencies if dep not in df['task_name'].values]
-        if invalid_deps:
-            raise ValueError(f"Invalid dependencies: {', '.join(invalid_deps)}")
-
-        # Add dependencies to graph
-        for dep in dependencies:
-            self.graph.add_edge(dep, name)
-
-        # Create task entry
-        new_task = pd.DataFrame({
-            'id': [next_id],
-            'task_name': [name],
-            'category': [category],
-            'priority': [priority],
-            'deadline': [deadline],
-            'dependencies': [', '.join(dependencies) if dependencies else 'None'],
-            'status': ['Not Started'],
-            'created_at': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-        })
-
-        # Add to DataFrame and save
-        df = pd.concat([df, new_task], ignore_index=True)
-        df.to_csv(self.file_name, index=False)
-        self.save_graph()
+            # Validate task name uniqueness
+            if name in table:
+                raise ValueError("A task with this name already exists")
+
+            # Validate dependencies
+            invalid_deps = [dep for dep in dependencies if dep not in table]
+            if invalid_deps:
+                raise ValueError(f"Invalid dependencies: {', '.join(invalid_deps)}")
+
+            status = task_data.get('status') or 'Not Started'
+            if status not in STATUSES:
+                raise ValueError(f"Invalid status. Must be one of: {', '.join(STATUSES)}")
+            if status == "Completed" and dependencies:
+                dependency_ids = [table.id_for(dep) for dep in dependencies]
+                statuses = table.frame['status'].to_numpy()[table.positions(dependency_ids)]
+                incomplete_deps = [dep for dep, dep_status in zip(dependencies, statuses)
+                                   if dep_status != "Completed"]
+                if incomplete_deps:
+                    raise ValueError(f"Cannot mark as completed: Dependent tasks not completed: {', '.join(incomplete_deps)}")
+            created_at = task_data.get('created_at')
+            created_at = (pd.Timestamp(created_at) if created_at
+                          else pd.Timestamp(datetime.now().replace(microsecond=0)))
+
+            # Add dependencies to graph
+            for dep in dependencies:
+                self.graph.add_edge(dep, name)
+            if dependencies:
+                self.graph_version += 1
+
+            # Create task entry
+            table.append({
+                'id': next_id,
+                'task_name': name,
+                'category': category,
+                'priority': priority,
+                'deadline': deadline,
+                'dependencies': [table.id_for(dep) for dep in dependencies],
+                'status': status,
+                'created_at': created_at
+            })
+            if self._deadline_index is not None and status != "Completed":
+                self._deadline_index.add(next_id, created_at + pd.Timedelta(days=int(deadline)))
+            if self._search_index is not None:
+                self._search_index.add(next_id, name, category)
+            if self._reachability is not None:
+                self._reachability.add_task(next_id, table.dependencies(len(table) - 1))
+
+            # Save
+            self._save_table(table, with_graph=bool(dependencies))
+            task = table.record(len(table) - 1)
+        self._notify('added', task)
+        return task
+
+    @staticmethod
+    def prompt_task_data():
+        """
+        Ask for the fields of a new task on the console.
+
+        :return: Task data dict as accepted by add_task
+        """
+        name = input("Enter the task name: ").strip()
+        category = input("Enter the task category: ").strip()
+
+        # Get priority with validation
+        while True:
+            try:
+                priority = int(input("Enter the priority (1-100): "))
+                if 1 <= priority <= 100:
+                    break
+                else:
+                    print("Priority must be between 1 and 100.")
+            except ValueError:
+                print("Please enter a valid integer.")
+
+        # Get deadline with validation
+        while True:
+            try:
+                deadline = int(input("Enter the deadline in days: "))
+                if deadline > 0:
+                    break
+                else:
+                    print("Deadline must be a positive number.")
+            except ValueError:
+                print("Please enter a valid integer.")
+
+        dependencies = input("Enter the dependencies (comma-separated task names, or press Enter if none): ").strip()
+        return {
+            'task_name': name,
+            'category': category,
+            'priority': priority,
+            'deadline': deadline,
+            'dependencies': dependencies
+        }
 
     def get_task_by_name(self, name):
         """
@@ -114,69 +707,253 @@ class TaskManager:
         :param name: Name of the task to find
         :return: Task data as Series if found, None otherwise
         """
-        df = pd.read_csv(self.file_name)
-        task = df[df['task_name'] == name]
-        return task.iloc[0] if not task.empty else None
+        task = self.find_task(name)
+        return None if task is None else pd.Series(task)
+
+    @timed('find_task')
+    def find_task(self, name):
+        """
+        Task with the given name as a dict of the row, or None.
+        """
+        table = self._load_table()
+        task_id = table.id_for(name)
+        if task_id is None:
+            return None
+        return table.record(table.position(task_id))
 
+    @timed('remove_task')
     def remove_task(self, task_name):
         """
         Remove a task and update its dependencies.
         """
-        df = pd.read_csv(self.file_name)
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            task_id = table.id_for(task_name)
         
-        if task_name not in df['task_name'].values:
-            raise ValueError(f"Task '{task_name}' not found")
+            if task_id is None:
+                raise ValueError(f"Task '{task_name}' not found")
 
-        # Check for dependent tasks
-        dependent_tasks = []
-        for _, row in df.iterrows():
-            if pd.notna(row['dependencies']) and row['dependencies'] != 'None':
-                deps = [d.strip() for d in str(row['dependencies']).split(',')]
-                if task_name in deps:
-                    dependent_tasks.append(row['task_name'])
+            # Check for dependent tasks
+            dependent_tasks = table.dependents_of(task_id)
+            if dependent_tasks:
+                raise ValueError(f"Cannot remove task: The following tasks depend on it: {', '.join(dependent_tasks)}")
 
-        if dependent_tasks:
-            raise ValueError(f"Cannot remove task: The following tasks depend on it: {', '.join(dependent_tasks)}")
+            # Remove task and update graph
+            removed = table.record(table.position(task_id))
+            table.remove(task_id)
+            if self._deadline_index is not None:
+                self._deadline_index.remove(task_id)
+            if self._search_index is not None:
+                self._search_index.remove(task_id)
+            if self._reachability is not None:
+                self._reachability.remove_task(task_id)
+            graph_changed = (removed['dependencies'] != 'None' or self._graph is not None) and task_name in self.graph
+            if graph_changed:
+                self.graph.remove_node(task_name)
+                self.graph_version += 1
 
-        # Remove task and update graph
-        df = df[df['task_name'] != task_name]
-        if task_name in self.graph:
-            self.graph.remove_node(task_name)
+            # Save changes
+            self._save_table(table, with_graph=graph_changed)
+        self._notify('removed', removed)
 
-        # Save changes
-        df.to_csv(self.file_name, index=False)
-        self.save_graph()
+    @timed('rename_task')
+    def rename_task(self, task_name, new_name):
+        """
+        Give a task a new name.
 
+        Dependencies refer to tasks by id, so only the task's own row
+        changes; tasks depending on it show the new name and are reported
+        to listeners as updated too.
+
+        :return: The renamed task as a dict of the row
+        """
+        new_name = str(new_name).strip()
+        if not new_name:
+            raise ValueError("Task name cannot be empty")
+
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            task_id = self._task_id(table, task_name)
+            if new_name in table:
+                raise ValueError("A task with this name already exists")
+            # A graph file still keyed by name would lose the task's edges
+            self.graph
+            with_graph = self._graph_format != GRAPH_FORMAT_VERSION
+
+            table.rename(task_id, new_name)
+            position = table.position(task_id)
+            if self._search_index is not None:
+                self._search_index.remove(task_id)
+                self._search_index.add(task_id, new_name, table.frame['category'].iat[position])
+            if task_name in self.graph:
+                nx.relabel_nodes(self.graph, {task_name: new_name}, copy=False)
+                self.graph_version += 1
+
+            self._save_table(table, with_graph=with_graph)
+            task = table.record(position)
+            dependents = table.dependent_positions([task_id])
+            changed = table.records(dependents) if len(dependents) <= MAX_CHANGE_EVENTS else None
+        self._notify('updated', task)
+        if changed is None:
+            self._notify('reloaded', None)
+        else:
+            for record in changed:
+                self._notify('updated', record)
+        return task
+
+    @timed('update_task_status')
     def update_task_status(self, task_name, new_status):
         """
         Update the status of a specific task.
+
+        Only the change is written: it is appended to the journal like a
+        dependency edit, so the cost doesn't grow with the number of tasks.
         """
-        df = pd.read_csv(self.file_name)
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            task_id = table.id_for(task_name)
         
-        if task_name not in df['task_name'].values:
-            raise ValueError(f"Task '{task_name}' not found")
+            if task_id is None:
+                raise ValueError(f"Task '{task_name}' not found")
 
-        valid_statuses = ["Not Started", "In Progress", "Completed"]
-        if new_status not in valid_statuses:
-            raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
-
-        # Check dependencies if marking as Completed
-        if new_status == "Completed":
-            task_deps = df.loc[df['task_name'] == task_name, 'dependencies'].iloc[0]
-            if task_deps != 'None':
-                deps = [d.strip() for d in str(task_deps).split(',')]
-                incomplete_deps = []
-                for dep in deps:
-                    dep_status = df.loc[df['task_name'] == dep, 'status'].iloc[0]
-                    if dep_status != "Completed":
-                        incomplete_deps.append(dep)
-                if incomplete_deps:
-                    raise ValueError(f"Cannot mark as completed: Dependent tasks not completed: {', '.join(incomplete_deps)}")
+            if new_status not in STATUSES:
+                raise ValueError(f"Invalid status. Must be one of: {', '.join(STATUSES)}")
 
-        # Update status
-        df.loc[df['task_name'] == task_name, 'status'] = new_status
-        df.to_csv(self.file_name, index=False)
+            # Check dependencies if marking as Completed
+            position = table.position(task_id)
+            if new_status == "Completed":
+                deps = table.dependencies(position)
+                if len(deps):
+                    statuses = table.frame['status'].to_numpy()[table.positions(deps)]
+                    incomplete_deps = [name for name, status in zip(table.names_for(deps), statuses)
+                                       if status != "Completed"]
+                    if incomplete_deps:
+                        raise ValueError(f"Cannot mark as completed: Dependent tasks not completed: {', '.join(incomplete_deps)}")
+
+            # Update status
+            table.set_status(task_id, new_status)
+            if self._deadline_index is not None:
+                if new_status == "Completed":
+                    self._deadline_index.remove(task_id)
+                else:
+                    created_at = table.frame['created_at'].iat[position]
+                    if pd.notna(created_at):
+                        deadline = int(table.frame['deadline'].iat[position])
+                        self._deadline_index.add(task_id, created_at + pd.Timedelta(days=deadline))
+            self._save_journalled(table, ('status', task_id, new_status), with_graph=False)
+        self._notify('updated', table.record(position))
+
+    @timed('add_dependency')
+    def add_dependency(self, task_name, dependency_name):
+        """
+        Make task_name depend on dependency_name.
+
+        Rejected if it would create a cycle, i.e. if dependency_name already
+        depends (transitively) on task_name. Only the edge is written: it is
+        appended to the dependency journal instead of rewriting the files.
+
+        :return: The updated task as a dict of the row
+        """
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            task_id = self._task_id(table, task_name)
+            dependency_id = self._task_id(table, dependency_name)
+            position = table.position(task_id)
+
+            if dependency_id in table.dependencies(position):
+                raise ValueError(f"'{task_name}' already depends on '{dependency_name}'")
+            reachability = self._get_reachability()
+            if dependency_id == task_id or reachability.depends_on(dependency_id, task_id):
+                raise ValueError(f"Adding this dependency would create a cycle: "
+                                 f"'{dependency_name}' depends on '{task_name}'")
+
+            self.graph.add_edge(dependency_name, task_name)
+            self.graph_version += 1
+            table.add_dependency(task_id, dependency_id)
+            reachability.add_edge(dependency_id, task_id)
+            self._save_journalled(table, ('add', task_id, dependency_id))
+            task = table.record(position)
+        self._notify('updated', task)
+        return task
+
+    @timed('remove_dependency')
+    def remove_dependency(self, task_name, dependency_name):
+        """
+        Stop task_name from depending on dependency_name.
+
+        :return: The updated task as a dict of the row
+        """
+        with self._lock.exclusive():
+            # Start from the latest files so other processes' changes are kept
+            self._sync_graph()
+            table = self._load_table()
+            task_id = self._task_id(table, task_name)
+            dependency_id = table.id_for(dependency_name)
+            position = table.position(task_id)
+            unresolved = table.unresolved.get(task_id, [])
+
+            if dependency_id is not None and table.remove_dependency(task_id, dependency_id):
+                if self._reachability is not None:
+                    self._reachability.remove_edge(dependency_id, task_id)
+                change = ('remove', task_id, dependency_id)
+            elif dependency_name in unresolved:
+                # Not a task, so not journalled by id; rewrite the files instead
+                unresolved.remove(dependency_name)
+                if not unresolved:
+                    del table.unresolved[task_id]
+                change = None
+            else:
+                raise ValueError(f"'{task_name}' does not depend on '{dependency_name}'")
+
+            if self.graph.has_edge(dependency_name, task_name):
+                self.graph.remove_edge(dependency_name, task_name)
+                self.graph_version += 1
+            if change is None:
+                self._save_table(table, with_graph=True)
+            else:
+                self._save_journalled(table, change)
+            task = table.record(position)
+        self._notify('updated', task)
+        return task
+
+    def _save_journalled(self, table, change, with_graph=True):
+        """
+        Persist a single dependency or status edit by appending it to the
+        journal, so it costs one short write instead of rewriting tasks.csv.
 
+        Inside a batch, or once the journal is long, the files are rewritten
+        instead, which also empties the journal.
+
+        :param with_graph: Whether the edit changes the dependency graph
+        """
+        if self._batch_depth or self._journal_entries >= MAX_JOURNAL_ENTRIES or self._journal_torn():
+            self._save_table(table, with_graph=with_graph)
+            return
+
+        line = json.dumps(change) + '\n'
+        with open(self.journal_file, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += 1
+        if with_graph:
+            self._journal_edges += 1
+        if METRICS.enabled:
+            METRICS.add('bytes_written', len(line), file=os.path.basename(self.journal_file))
+
+        self._table = table
+        self._table_signature = self._file_signature()
+        self._graph_signature = self._graph_file_signature()
+
+    @timed('get_tasks')
     def get_tasks(self, filters=None):
         """
         Get tasks with optional filtering.
@@ -184,41 +961,263 @@ class TaskManager:
         :param filters: Dictionary with filter criteria
         :return: Filtered DataFrame of tasks
         """
-        df = pd.read_csv(self.file_name)
-        
+        return self.query_tasks(self.filters_to_query(filters))
+
+    @staticmethod
+    def filters_to_query(filters):
+        """
+        Translate the filter dictionary accepted by get_tasks into a Query.
+        """
+        from src.services.query import Query
+
+        query = Query()
         if not filters:
-            return df
+            return query
 
         if 'category' in filters and filters['category']:
-            df = df[df['category'].str.contains(filters['category'], case=False, na=False)]
+            query = query.where('category', 'contains', filters['category'])
         
         if 'min_priority' in filters and filters['min_priority']:
-            df = df[df['priority'] >= filters['min_priority']]
+            query = query.where('priority', '>=', filters['min_priority'])
             
         if 'status' in filters and filters['status'] != "All":
-            df = df[df['status'] == filters['status']]
+            query = query.where('status', '==', filters['status'])
             
-        return df
+        return query
+
+    @timed('query_tasks')
+    def query_tasks(self, query=None):
+        """
+        Run a Query (see src/services/query.py) against the task store.
+
+        Predicates are pushed down to the id order and name lookup of the
+        store where possible, and only the rows on the requested page are
+        materialized.
+
+        :param query: Query with predicates, ordering, limit/offset and projection
+        :return: DataFrame of matching tasks
+        """
+        from src.services import query as task_query
+
+        return task_query.execute(query or task_query.Query(), self._load_table())
+
+    @timed('query_records')
+    def query_records(self, query=None):
+        """
+        Like query_tasks, but return the matching tasks as a list of dicts in
+        the CSV text representation instead of a DataFrame.
+        """
+        from src.services import query as task_query
+
+        return task_query.records(query or task_query.Query(), self._load_table())
+
+    @timed('count_tasks')
+    def count_tasks(self, query=None):
+        """
+        Count the tasks matching a Query's predicates, ignoring paging.
+        """
+        from src.services import query as task_query
+
+        return task_query.count(query or task_query.Query(), self._load_table())
+
+    @staticmethod
+    def matches_filters(task, filters):
+        """
+        Check whether a single task row passes the filters accepted by get_tasks.
+
+        :param task: Task row as a dict or Series
+        :param filters: Dictionary with filter criteria
+        :return: True if the task would be returned by get_tasks(filters)
+        """
+        if not filters:
+            return True
+
+        if filters.get('category'):
+            if filters['category'].lower() not in str(task['category']).lower():
+                return False
+
+        if filters.get('min_priority'):
+            if task['priority'] < filters['min_priority']:
+                return False
+
+        if 'status' in filters and filters['status'] != "All":
+            if task['status'] != filters['status']:
+                return False
+
+        return True
+
+    def _get_deadline_index(self):
+        from src.services.deadline_index import DeadlineIndex
+
+        table = self._load_table()
+        if self._deadline_index is None:
+            self._deadline_index = DeadlineIndex.from_table(table)
+        return self._deadline_index
+
+    def _tasks_by_ids(self, task_ids):
+        """
+        DataFrame of the given tasks in the given order.
+        """
+        table = self._load_table()
+        return table.to_frame(table.positions(np.asarray(task_ids, dtype=np.int64)))
+
+    def _tasks_with_due_dates(self, task_ids):
+        frame = self._tasks_by_ids(task_ids)
+        frame['due_at'] = frame['created_at'] + pd.to_timedelta(frame['deadline'], unit='D')
+        return frame
+
+    @timed('get_overdue_tasks')
+    def get_overdue_tasks(self, now=None):
+        """
+        Get open tasks whose due date (created_at + deadline days) has passed.
+
+        :param now: Reference time, defaults to the current time
+        :return: DataFrame of overdue tasks, most overdue first
+        """
+        now = now or datetime.now()
+        return self._tasks_with_due_dates(self._get_deadline_index().due_before(now))
+
+    def get_due_today(self, now=None):
+        """
+        Get open tasks that are not yet overdue but are due before the end of today.
+        """
+        now = now or datetime.now()
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return self._tasks_with_due_dates(self._get_deadline_index().due_between(now, end_of_day))
+
+    @timed('get_due_within')
+    def get_due_within(self, days, now=None):
+        """
+        Get open tasks that are not yet overdue but are due within the given number of days.
+        """
+        now = now or datetime.now()
+        return self._tasks_with_due_dates(self._get_deadline_index().due_between(now, now + timedelta(days=days)))
+
+    @timed('get_deadline_summary')
+    def get_deadline_summary(self, days=7, now=None):
+        """
+        Count overdue tasks and tasks due today or within the given number of days.
+
+        :return: Dictionary with 'overdue', 'due_today' and 'due_within' counts
+        """
+        now = now or datetime.now()
+        index = self._get_deadline_index()
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return {
+            'overdue': index.count_before(now),
+            'due_today': index.count_between(now, end_of_day),
+            'due_within': index.count_between(now, now + timedelta(days=days))
+        }
+
+    def _get_search_index(self):
+        from src.services.search_index import SearchIndex
+
+        table = self._load_table()
+        if self._search_index is None:
+            frame = table.frame
+            self._search_index = SearchIndex.build(
+                zip(frame['id'].tolist(), frame['task_name'].tolist(), frame['category'].astype(str).tolist()))
+        return self._search_index
+
+    @timed('search_task_ids')
+    def search_task_ids(self, text, limit=None):
+        """
+        Ids of tasks whose name or category matches a search string, best first.
+
+        :param text: Search words; each may be a prefix or, from MIN_FUZZY_LENGTH
+                     (4) letters on, a slightly misspelled word
+        :param limit: Maximum number of ids, or None for all matches
+        """
+        return [task_id for task_id, _ in self._get_search_index().search(text, limit)]
+
+    def search_tasks(self, text, limit=20):
+        """
+        Ranked search over task names and categories.
+
+        :param text: Search words; each may be a prefix or, from MIN_FUZZY_LENGTH
+                     (4) letters on, a slightly misspelled word
+        :param limit: Maximum number of results
+        :return: DataFrame of matching tasks, best match first, with a score column
+        """
+        results = self._get_search_index().search(text, limit)
+        frame = self._tasks_by_ids([task_id for task_id, _ in results])
+        frame['score'] = [score for _, score in results]
+        return frame
+
+    def _get_reachability(self):
+        from src.services.reachability import ReachabilityIndex
+
+        table = self._load_table()
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex.build(table)
+        return self._reachability
+
+    @staticmethod
+    def _task_id(table, task_name):
+        task_id = table.id_for(task_name)
+        if task_id is None:
+            raise ValueError(f"Task '{task_name}' not found")
+        return task_id
+
+    @timed('get_ancestors')
+    def get_ancestors(self, task_name):
+        """
+        Names of all tasks the given task transitively depends on, by id.
+
+        Results are cached per task and stay valid until an edge they depend
+        on changes, so repeated queries are cheap.
+        """
+        index = self._get_reachability()
+        table = self._table
+        return table.names_for(index.ids(index.ancestors(self._task_id(table, task_name))))
+
+    @timed('get_descendants')
+    def get_descendants(self, task_name):
+        """
+        Names of all tasks that transitively depend on the given task, by id:
+        everything that is blocked if it slips.
+        """
+        index = self._get_reachability()
+        table = self._table
+        return table.names_for(index.ids(index.descendants(self._task_id(table, task_name))))
+
+    def depends_on(self, task_name, other_name):
+        """
+        Whether task_name transitively depends on other_name.
+        """
+        index = self._get_reachability()
+        table = self._table
+        return index.depends_on(self._task_id(table, task_name), self._task_id(table, other_name))
+
+    @timed('analyze_graph')
+    def analyze_graph(self, workers=None):
+        """
+        Dependency levels, per-category workload and per-category critical
+        paths over the whole DAG, computed in a process pool for large
+        stores. See src.services.analytics.analyze for the result.
+        """
+        from src.services.analytics import analyze
+
+        return analyze(self._load_table(), workers)
 
     def get_task_dependencies(self, task_name):
         """
         Get dependencies for a specific task.
         """
-        df = pd.read_csv(self.file_name)
-        task = df[df['task_name'] == task_name]
+        table = self._load_table()
+        task_id = table.id_for(task_name)
         
-        if task.empty:
+        if task_id is None:
             return []
             
-        deps = task.iloc[0]['dependencies']
-        return [d.strip() for d in str(deps).split(',')] if deps != 'None' else []
+        return table.dependency_names(table.position(task_id))
 
     def view_tasks(self):
         """
         View tasks with optional filtering.
         """
         try:
-            df = pd.read_csv(self.file_name)
+            df = self.get_tasks()
             if df.empty:
                 print("No tasks available to view.")
                 return
@@ -228,8 +1227,9 @@ class TaskManager:
             print("2. Filter by Category")
             print("3. Filter by Priority")
             print("4. Filter by Status")
+            print("5. Search by Name or Category")
             
-            choice = input("Enter your choice (1-4): ").strip()
+            choice = input("Enter your choice (1-5): ").strip()
             
             def display_tasks(tasks_df):
                 if tasks_df.empty:
@@ -250,15 +1250,13 @@ class TaskManager:
             
             elif choice == '2':
                 category = input("Enter category to filter: ").strip()
-                filtered_df = df[df['category'].str.contains(category, case=False, na=False)]
-                display_tasks(filtered_df)
+                display_tasks(self.get_tasks({'category': category}))
             
             elif choice == '3':
                 try:
                     min_priority = int(input("Enter minimum priority (1-100): "))
                     if 1 <= min_priority <= 100:
-                        filtered_df = df[df['priority'] >= min_priority]
-                        display_tasks(filtered_df)
+                        display_tasks(self.get_tasks({'min_priority': min_priority}))
                     else:
                         print("Priority must be between 1 and 100.")
                 except ValueError:
@@ -278,11 +1276,14 @@ class TaskManager:
                 }
                 
                 if status_choice in status_map:
-                    filtered_df = df[df['status'] == status_map[status_choice]]
-                    display_tasks(filtered_df)
+                    display_tasks(self.get_tasks({'status': status_map[status_choice]}))
                 else:
                     print("Invalid status choice.")
             
+            elif choice == '5':
+                text = input("Enter search text: ").strip()
+                display_tasks(self.search_tasks(text))
+            
             else:
                 print("Invalid choice.")
                 
@@ -293,14 +1294,7 @@ class TaskManager:
         """
         View tasks that are past their deadline.
         """
-        df = pd.read_csv(self.file_name)
-        
-        # Get current date
-        current_date = datetime.now()
-        
-        # Calculate overdue tasks
-        df['deadline_date'] = pd.to_datetime(current_date) - pd.to_timedelta(df['deadline'], unit='D')
-        overdue_tasks = df[df['deadline_date'] > current_date]
+        overdue_tasks = self.get_overdue_tasks()
         
         if overdue_tasks.empty:
             print("No overdue tasks!")
@@ -308,35 +1302,91 @@ class TaskManager:
             print("\nOverdue Tasks:")
             print(overdue_tasks.to_string(index=False))
 
-    def visualize_dependencies(self):
+    @timed('get_dependency_neighborhood')
+    def get_dependency_neighborhood(self, task_name, hops=2):
+        """
+        Get the dependency neighborhood of a task with a layered layout.
+
+        :param task_name: Task at the center of the neighborhood
+        :param hops: Number of dependency levels to include in each direction
+        :return: Tuple of (subgraph, node positions), cached until the graph changes
+        """
+        if self._layout_cache is None:
+            self._layout_cache = LayoutCache()
+        return self._layout_cache.get(self.graph, task_name, hops, self.graph_version)
+
+    def visualize_dependencies(self, task_name=None, hops=2):
         """
         Create a visual representation of task dependencies.
+
+        :param task_name: Optional task to focus on; only its neighborhood is drawn
+        :param hops: Number of dependency levels around task_name to include
         """
-        if not self.graph.nodes():
-            print("No dependencies to visualize.")
-            return
-        
-        # Create a matplotlib figure
-        plt.figure(figsize=(10, 8))
-        pos = nx.spring_layout(self.graph)
-        nx.draw(self.graph, pos, with_labels=True, 
-                node_color='lightblue', 
-                node_size=3000, 
-                font_size=10, 
-                font_weight='bold', 
-                arrows=True)
-        plt.title("Task Dependencies")
+        if task_name is None:
+            task_name = input("Enter a task name to focus on (or press Enter for all): ").strip() or None
+
+        with profiling.action('visualize'):
+            if task_name:
+                graph, pos = self.get_dependency_neighborhood(task_name, hops)
+            else:
+                if not self.graph.nodes():
+                    print("No dependencies to visualize.")
+                    return
+                graph, pos = self.graph, layered_layout(self.graph)
+
+            # Create a matplotlib figure
+            plt.figure(figsize=(10, 8))
+            draw_graph(graph, pos, plt.gca(), highlight=task_name)
+            plt.title(f"Dependencies of {task_name}" if task_name else "Task Dependencies")
         plt.show()
 
+    @timed('export')
+    def export(self, target, export_format=None, query=None, progress=None):
+        """
+        Stream tasks to a file in CSV, NDJSON, Parquet or Arrow format.
+
+        Rows are written in chunks, so memory use does not grow with the
+        number of tasks. A plain CSV export of every task copies tasks.csv
+        directly.
+
+        :param target: File path, or an open text stream for csv and ndjson
+        :param export_format: 'csv', 'ndjson', 'parquet' or 'arrow'; by default
+                              inferred from the file extension
+        :param query: Optional Query selecting, ordering and paging the tasks
+        :param progress: Optional callable(done, total), in bytes when the file
+                         is copied and in rows otherwise
+        """
+        from src.services import exporter
+        from src.services import query as task_query
+
+        export_format = export_format or exporter.format_for(target)
+        if query is None and export_format == 'csv' and self._batch_pending is None:
+            binary = target if isinstance(target, (str, os.PathLike)) else getattr(target, 'buffer', None)
+            if binary is not None:
+                with self._lock.shared():
+                    journal = self._signature(self.journal_file)
+                    # tasks.csv is already in the export layout unless
+                    # edits are waiting in the journal
+                    if not (journal and journal[2]):
+                        if binary is not target:
+                            target.flush()
+                        exporter.copy_file(self.file_name, binary, progress)
+                        return
+
+        table = self._load_table()
+        positions = task_query.positions(query, table) if query is not None else np.arange(len(table))
+        exporter.export_table(table, positions, target, export_format, progress)
+
     def export_tasks(self):
         """
-        Export tasks to a CSV file.
+        Export tasks to a file; the format follows the file extension
+        (.csv, .ndjson, .parquet or .arrow).
         """
         export_file = input("Enter the export file name (e.g., tasks_backup.csv): ").strip()
-        
-        df = pd.read_csv(self.file_name)
-        df.to_csv(export_file, index=False)
-        
+
+        with profiling.action('export'):
+            self.export(export_file)
+
         print(f"Tasks exported to {export_file} successfully!")
 
     def main_menu(self):
@@ -360,15 +1410,32 @@ class TaskManager:
             # Perform actions based on user choice
             try:
                 if choice == '1':
-                    self.add_task()
+                    task_data = self.prompt_task_data()
+                    with profiling.action('add'):
+                        task = self.add_task(task_data)
+                    print(f"Task '{task['task_name']}' added with ID {task['id']}.")
                 elif choice == '2':
-                    self.remove_task()
+                    name = input("Enter the name of the task to remove: ").strip()
+                    with profiling.action('remove'):
+                        self.remove_task(name)
+                    print(f"Task '{name}' removed.")
                 elif choice == '3':
-                    self.update_task_status()
+                    name = input("Enter the name of the task to update: ").strip()
+                    print("\nAvailable statuses:")
+                    for number, status in enumerate(STATUSES, 1):
+                        print(f"{number}. {status}")
+                    status_choice = input(f"Enter status number (1-{len(STATUSES)}): ").strip()
+                    if not status_choice.isdigit() or not 1 <= int(status_choice) <= len(STATUSES):
+                        print("Invalid status choice.")
+                        continue
+                    with profiling.action('status'):
+                        self.update_task_status(name, STATUSES[int(status_choice) - 1])
+                    print(f"Task '{name}' updated.")
                 elif choice == '4':
                     self.view_tasks()
                 elif choice == '5':
-                    self.view_overdue_tasks()
+                    with profiling.action('overdue'):
+                        self.view_overdue_tasks()
                 elif choice == '6':
                     self.visualize_dependencies()
                 elif choice == '7':
@@ -385,9 +1452,21 @@ class TaskManager:
 def main():
     """
     Initialize and start the task management application.
+
+    Without arguments this starts the interactive menu; with a subcommand
+    (see src/cli.py) it runs non-interactively. Either can be profiled with
+    --profile DIR (see src/utils/profiling.py).
     """
-    task_manager = TaskManager()
-    task_manager.main_menu()
+    options, argv = profiling.split_arguments(sys.argv[1:])
+    with profiling.profiled(options):
+        if argv:
+            from src.cli import main as cli_main
+            status = cli_main(argv)
+        else:
+            task_manager = TaskManager()
+            task_manager.main_menu()
+            status = 0
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+
+# RRULE weekday codes, Monday first like datetime.weekday()
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+UNTIL_FORMAT = "%Y%m%dT%H%M%S"
+
+class Recurrence:
+    """
+    Repetition rule of a task or appointment: the subset of the iCalendar
+    RRULE with FREQ (DAILY, WEEKLY or MONTHLY), INTERVAL, BYDAY (weekly
+    rules only), COUNT and UNTIL, e.g. "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=20".
+    The first occurrence is the series start (dtstart) passed to the
+    queries; monthly rules repeat on its day of the month and skip months
+    that don't have that day.
+
+    Occurrences can be cancelled (exceptions) or moved to another start
+    and duration (overrides), both keyed by the occurrence's original start.
+
+    Occurrences are never stored. A query computes the first period that
+    can reach its window arithmetically and generates from there, so
+    asking for one day of a series that started years ago, or never ends,
+    costs about the same as asking for its first day.
+    """
+    __slots__ = ("freq", "interval", "byday", "count", "until", "exceptions", "overrides")
+
+    def __init__(self, freq: str, interval: int = 1, byday: List[int] = None,
+                 count: int = None, until: datetime = None, exceptions=None,
+                 overrides: Dict[datetime, Tuple[datetime, Optional[int]]] = None):
+        freq = freq.upper()
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}'. Must be one of: {', '.join(FREQUENCIES)}")
+        if int(interval) < 1:
+            raise ValueError("INTERVAL must be at least 1")
+        if byday and freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported for weekly rules")
+        if count is not None and int(count) < 1:
+            raise ValueError("COUNT must be at least 1")
+        self.freq = freq
+        self.interval = int(interval)
+        self.byday = sorted(set(byday)) if byday else None
+        self.count = int(count) if count is not None else None
+        self.until = until
+        self.exceptions = set(exceptions or ())
+        self.overrides = dict(overrides or {})
+
+    # --- Rule text ---------------------------------------------------------
+
+    @classmethod
+    def parse(cls, rule: str) -> 'Recurrence':
+        """
+        Build a rule from RRULE text ("RRULE:" prefix optional), or from
+        the shorthands 'daily', 'weekly' and 'monthly'.
+        """
+        text = rule.strip()
+        if text.upper() in FREQUENCIES:
+            return cls(text)
+        if text.upper().startswith("RRULE:"):
+            text = text[len("RRULE:"):]
+
+        parts = {}
+        for part in filter(None, text.split(';')):
+            key, _, value = part.partition('=')
+            parts[key.strip().upper()] = value.strip()
+        unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL"}
+        if unknown:
+            raise ValueError(f"Unsupported recurrence parts: {', '.join(sorted(unknown))}")
+        if "FREQ" not in parts:
+            raise ValueError("Recurrence rule needs a FREQ")
+        if "COUNT" in parts and "UNTIL" in parts:
+            raise ValueError("COUNT and UNTIL cannot both be given")
+
+        byday = None
+        if parts.get("BYDAY"):
+            codes = [code.strip().upper() for code in parts["BYDAY"].split(',')]
+            invalid = [code for code in codes if code not in WEEKDAYS]
+            if invalid:
+                raise ValueError(f"Unsupported BYDAY values: {', '.join(invalid)}")
+            byday = [WEEKDAYS.index(code) for code in codes]
+        until = None
+        if parts.get("UNTIL"):
+            value = parts["UNTIL"].rstrip('Z')
+            until = datetime.strptime(value, UNTIL_FORMAT if 'T' in value else "%Y%m%d")
+            if 'T' not in value:
+                until = until.replace(hour=23, minute=59, second=59)
+        return cls(parts["FREQ"], int(parts.get("INTERVAL", 1)), byday,
+                   int(parts["COUNT"]) if "COUNT" in parts else None, until)
+
+    def rule(self) -> str:
+        """
+        The rule as RRULE text, without exceptions and overrides.
+        """
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.byday))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime(UNTIL_FORMAT)}")
+        return ";".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "rule": self.rule(),
+            "exceptions": sorted(when.isoformat() for when in self.exceptions),
+            "overrides": {
+                original.isoformat(): {"start": start.isoformat(), "duration": duration}
+                for original, (start, duration) in sorted(self.overrides.items())
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> 'Recurrence':
+        """
+        Inverse of to_dict(); also accepts plain rule text.
+        """
+        if isinstance(data, str):
+            return cls.parse(data)
+        recurrence = cls.parse(data["rule"])
+        recurrence.exceptions = {datetime.fromisoformat(when) for when in data.get("exceptions", ())}
+        recurrence.overrides = {
+            datetime.fromisoformat(original): (datetime.fromisoformat(moved["start"]), moved.get("duration"))
+            for original, moved in data.get("overrides", {}).items()
+        }
+        return recurrence
+
+    def __eq__(self, other):
+        if not isinstance(other, Recurrence):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Recurrence({self.rule()!r})"
+
+    # --- Expansion ---------------------------------------------------------
+
+    def between(self, dtstart: datetime, start: datetime,
+                end: datetime) -> List[Tuple[datetime, datetime, Optional[int]]]:
+        """
+        Occurrences of the series starting at dtstart that start in
+        [start, end), after applying exceptions and overrides.
+
+        :return: (original start, start, duration or None) tuples ordered
+                 by start; the duration is only set by an override
+        """
+        found = []
+        for original in self._series(dtstart, start):
+            if original >= end:
+                break
+            if original not in self.exceptions and original not in self.overrides:
+                found.append((original, original, None))
+        for original, (moved, duration) in self.overrides.items():
+            if start <= moved < end and original not in self.exceptions:
+                found.append((original, moved, duration))
+        found.sort(key=lambda occurrence: occurrence[1])
+        return found
+
+    def is_occurrence(self, dtstart: datetime, when: datetime) -> bool:
+        """
+        Whether the rule itself (ignoring exceptions and overrides) has an
+        occurrence starting at when.
+        """
+        return next(self._series(dtstart, when), None) == when
+
+    def _series(self, dtstart: datetime, start: datetime) -> Iterator[datetime]:
+        """
+        The rule's occurrences from the first one at or after start.
+        """
+        period = self._first_period(dtstart, start)
+        index = self._count_before(dtstart, period)
+        while True:
+            for occurrence in self._period(dtstart, period):
+                if self.count is not None and index >= self.count:
+                    return
+                if self.until is not None and occurrence > self.until:
+                    return
+                index += 1
+                if occurrence >= start:
+                    yield occurrence
+            period += 1
+
+    def _period(self, dtstart: datetime, period: int) -> List[datetime]:
+        """
+        Occurrences in the period-th repetition (day, week or month) of the
+        series, in order.
+        """
+        if self.freq == "DAILY":
+            return [dtstart + timedelta(days=period * self.interval)]
+        if self.freq == "WEEKLY":
+            monday = dtstart - timedelta(days=dtstart.weekday()) + timedelta(weeks=period * self.interval)
+            days = self.byday or [dtstart.weekday()]
+            # The first week only counts from dtstart on
+            return [monday + timedelta(days=day) for day in days if period or day >= dtstart.weekday()]
+        month = dtstart.month - 1 + period * self.interval
+        year, month = dtstart.year + month // 12, month % 12 + 1
+        if dtstart.day > calendar.monthrange(year, month)[1]:
+            return []
+        return [dtstart.replace(year=year, month=month)]
+
+    def _first_period(self, dtstart: datetime, start: datetime) -> int:
+        """
+        A period at or before the first one with an occurrence at or after start.
+        """
+        if start <= dtstart:
+            return 0
+        if self.freq == "DAILY":
+            return (start - dtstart) // timedelta(days=self.interval)
+        if self.freq == "WEEKLY":
+            monday = dtstart - timedelta(days=dtstart.weekday())
+            return (start - monday) // timedelta(weeks=self.interval)
+        months = (start.year - dtstart.year) * 12 + start.month - dtstart.month
+        return max(0, months // self.interval - 1)
+
+    def _count_before(self, dtstart: datetime, period: int) -> int:
+        """
+        Number of occurrences in the periods before the given one.
+        """
+        if period == 0:
+            return 0
+        if self.freq == "DAILY":
+            return period
+        if self.freq == "WEEKLY":
+            days = self.byday or [dtstart.weekday()]
+            skipped = sum(1 for day in days if day < dtstart.weekday())
+            return period * len(days) - skipped
+        if dtstart.day <= 28:
+            return period
+        return sum(len(self._period(dtstart, earlier)) for earlier in range(period))
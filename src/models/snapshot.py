@@ -0,0 +1,144 @@
+import os
+import json
+import mmap
+import numpy as np
+import pandas as pd
+from src.utils.file_lock import atomic_write
+
+# File layout: MAGIC, the header length as little-endian uint64, the JSON
+# header, then the sections, each aligned to ALIGNMENT bytes
+MAGIC = b"TASKSNAP"
+VERSION = 1
+ALIGNMENT = 64
+
+# Fixed-width columns stored as-is; category and status are stored as codes
+NUMERIC_COLUMNS = ('id', 'priority', 'deadline', 'created_at')
+CATEGORICAL_COLUMNS = ('category', 'status')
+
+def write_snapshot(table, path, source):
+    """
+    Write a TaskTable as a binary snapshot next to the CSV it was read from.
+
+    Columns are written as fixed-width arrays, task names as one
+    NUL-separated string heap with offsets, and dependencies as the
+    table's CSR arrays. The snapshot is only a cache: it records the
+    signature of the CSV it matches and is ignored once the CSV changes.
+
+    :param source: Signature of the CSV file the table corresponds to
+    """
+    frame = table.frame
+    names = frame['task_name'].tolist()
+    encoded = [name.encode('utf-8') for name in names]
+    name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) + 1 for name in encoded], out=name_offsets[1:])
+
+    sections = {column: frame[column].to_numpy() for column in NUMERIC_COLUMNS}
+    for column in CATEGORICAL_COLUMNS:
+        sections[column] = frame[column].cat.codes.to_numpy()
+    sections['name_offsets'] = name_offsets
+    sections['names'] = np.frombuffer(b"\0".join(encoded) + b"\0" if encoded else b"", dtype=np.uint8)
+    sections['dep_offsets'] = np.ascontiguousarray(table.dep_offsets, dtype=np.int64)
+    sections['dep_ids'] = np.ascontiguousarray(table.dep_ids, dtype=np.int32)
+
+    header = {
+        'version': VERSION,
+        'source': list(source),
+        'rows': len(frame),
+        'categories': {column: frame[column].cat.categories.tolist() for column in CATEGORICAL_COLUMNS},
+        'unresolved': {str(task_id): missing for task_id, missing in table.unresolved.items()},
+        'sections': {}
+    }
+    # Offsets depend on the header length, which depends on the offsets;
+    # reserve room for the section table, then fill it in
+    offset = _aligned(len(MAGIC) + 8 + len(json.dumps(header)) + 64 * len(sections) + 256)
+    for name, array in sections.items():
+        header['sections'][name] = [offset, array.dtype.str, len(array)]
+        offset = _aligned(offset + array.nbytes)
+    encoded_header = json.dumps(header).encode('utf-8')
+    data_start = header['sections']['id'][0]
+    if len(MAGIC) + 8 + len(encoded_header) > data_start:
+        raise ValueError("Snapshot header larger than the space reserved for it")
+
+    with atomic_write(path, 'wb') as f:
+        f.write(MAGIC + len(encoded_header).to_bytes(8, 'little') + encoded_header)
+        for name, array in sections.items():
+            f.write(b"\0" * (header['sections'][name][0] - f.tell()))
+            f.write(array.tobytes())
+
+def read_snapshot(path, source):
+    """
+    Open a snapshot written by write_snapshot as a TaskTable.
+
+    The file is memory-mapped copy-on-write: numeric columns and the
+    dependency arrays are views of the mapping, so only the pages that are
+    touched are read, and changes to the table stay private to the process.
+
+    :param source: Current signature of the CSV file
+    :return: The TaskTable, or None if there is no usable snapshot for
+             that exact CSV
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < len(MAGIC) + 8:
+                return None
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except FileNotFoundError:
+        return None
+
+    if data[:len(MAGIC)] != MAGIC:
+        return None
+    length = int.from_bytes(data[len(MAGIC):len(MAGIC) + 8], 'little')
+    try:
+        header = json.loads(data[len(MAGIC) + 8:len(MAGIC) + 8 + length])
+    except ValueError:
+        return None
+    if header.get('version') != VERSION or source is None or header.get('source') != list(source):
+        return None
+
+    # A truncated or corrupt file is no snapshot: the caller reads the CSV
+    try:
+        return _decode(data, header)
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+def _decode(data, header):
+    """
+    The TaskTable in a mapped snapshot; raises ValueError, KeyError or
+    IndexError if the sections are truncated or inconsistent.
+    """
+    from src.models.task_table import FRAME_COLUMNS, TaskTable
+
+    sections = {}
+    for name, (offset, dtype, count) in header['sections'].items():
+        sections[name] = (np.frombuffer(data, dtype=np.dtype(dtype), count=count, offset=offset)
+                          if count else np.empty(0, dtype=np.dtype(dtype)))
+
+    rows = header['rows']
+    if (any(len(sections[column]) != rows for column in NUMERIC_COLUMNS + CATEGORICAL_COLUMNS)
+            or len(sections['dep_offsets']) != rows + 1
+            or len(sections['dep_ids']) != (sections['dep_offsets'][-1] if rows else 0)):
+        raise ValueError("Snapshot sections don't match its row count")
+
+    heap = sections['names'].tobytes().decode('utf-8')
+    names = heap.split("\0")
+    if len(names) == rows + 1:
+        names.pop()
+    else:
+        # A name containing NUL; slice by byte offsets instead
+        offsets = sections['name_offsets'].tolist()
+        raw = sections['names']
+        names = [raw[start:end - 1].tobytes().decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+        if len(names) != rows:
+            raise ValueError("Snapshot name heap doesn't match its row count")
+
+    columns = {column: sections[column] for column in NUMERIC_COLUMNS}
+    columns['task_name'] = pd.Series(np.array(names, dtype=object), dtype=object, copy=False)
+    for column in CATEGORICAL_COLUMNS:
+        columns[column] = pd.Categorical.from_codes(sections[column], header['categories'][column])
+    frame = pd.DataFrame({column: columns[column] for column in FRAME_COLUMNS}, copy=False)
+
+    unresolved = {int(task_id): missing for task_id, missing in header['unresolved'].items()}
+    return TaskTable(frame, sections['dep_offsets'], sections['dep_ids'], unresolved)
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
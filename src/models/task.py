@@ -1,6 +1,14 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from enum import Enum
+from .recurrence import Recurrence
+
+# Columns of tasks.csv, in file order
+TASK_COLUMNS = ["id", "task_name", "category", "priority", "deadline", "dependencies", "status", "created_at"]
+
+STATUSES = ["Not Started", "In Progress", "Completed"]
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 class TaskType(Enum):
     APPOINTMENT = "appointment"
@@ -9,20 +17,46 @@ class TaskType(Enum):
     REGULAR = "regular"
 
 class Task:
+    """
+    A task or appointment.
+
+    Instances have no __dict__. The list fields (dependencies,
+    notifications_sent, waitlist) are created on first access, so a task
+    that never uses them stores None instead of an empty list.
+
+    A task with a recurrence repeats from its start_time; occurrences()
+    expands the rule for a time window only, never the whole series.
+
+    to_row()/from_row() convert to and from a plain tuple in FIELDS order,
+    and to_rows()/from_rows() do the same for many tasks at once; they are
+    the cheap way to move large numbers of tasks in and out of the model.
+    to_dict()/from_dict() give the JSON-friendly form. Both round-trip
+    every field.
+    """
+    FIELDS = ("id", "task_name", "category", "priority", "deadline", "dependencies", "status",
+              "created_at", "task_type", "start_time", "duration", "assigned_to", "client",
+              "payment_status", "deposit_amount", "notifications_sent", "waitlist", "recurrence")
+
+    __slots__ = ("id", "task_name", "category", "priority", "deadline", "_dependencies", "status",
+                 "created_at", "task_type", "start_time", "duration", "assigned_to", "client",
+                 "payment_status", "deposit_amount", "_notifications_sent", "_waitlist", "recurrence")
+
     def __init__(self, id: int, task_name: str, category: str, priority: int,
                  deadline: int, dependencies: List[str] = None,
                  status: str = "Not Started", task_type: TaskType = TaskType.REGULAR,
                  start_time: datetime = None, duration: int = 60,
                  assigned_to: str = None, client: str = None,
-                 payment_status: str = None, deposit_amount: float = 0.0):
+                 payment_status: str = None, deposit_amount: float = 0.0,
+                 created_at: datetime = None, notifications_sent: List = None,
+                 waitlist: List[str] = None, recurrence: Recurrence = None):
         self.id = id
         self.task_name = task_name
         self.category = category
         self.priority = priority
         self.deadline = deadline
-        self.dependencies = dependencies or []
+        self._dependencies = list(dependencies) if dependencies else None
         self.status = status
-        self.created_at = datetime.now()
+        self.created_at = created_at or datetime.now()
         self.task_type = task_type
         self.start_time = start_time
         self.duration = duration  # in minutes
@@ -30,8 +64,83 @@ class Task:
         self.client = client
         self.payment_status = payment_status
         self.deposit_amount = deposit_amount
-        self.notifications_sent = []
-        self.waitlist = []
+        self._notifications_sent = list(notifications_sent) if notifications_sent else None
+        self._waitlist = list(waitlist) if waitlist else None
+        self.recurrence = recurrence
+
+    @property
+    def dependencies(self) -> List[str]:
+        if self._dependencies is None:
+            self._dependencies = []
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, value):
+        self._dependencies = list(value) if value else None
+
+    @property
+    def notifications_sent(self) -> List:
+        if self._notifications_sent is None:
+            self._notifications_sent = []
+        return self._notifications_sent
+
+    @notifications_sent.setter
+    def notifications_sent(self, value):
+        self._notifications_sent = list(value) if value else None
+
+    @property
+    def waitlist(self) -> List[str]:
+        if self._waitlist is None:
+            self._waitlist = []
+        return self._waitlist
+
+    @waitlist.setter
+    def waitlist(self, value):
+        self._waitlist = list(value) if value else None
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, task_name={self.task_name!r}, status={self.status!r})"
+
+    def to_row(self) -> tuple:
+        """
+        All fields as a tuple in FIELDS order; list fields become tuples.
+        """
+        return (self.id, self.task_name, self.category, self.priority, self.deadline,
+                tuple(self._dependencies or ()), self.status, self.created_at, self.task_type,
+                self.start_time, self.duration, self.assigned_to, self.client,
+                self.payment_status, self.deposit_amount,
+                tuple(self._notifications_sent or ()), tuple(self._waitlist or ()), self.recurrence)
+
+    @classmethod
+    def from_row(cls, row) -> 'Task':
+        """
+        Build a task from a sequence in FIELDS order, as returned by to_row().
+        """
+        task = cls.__new__(cls)
+        (task.id, task.task_name, task.category, task.priority, task.deadline, dependencies,
+         task.status, task.created_at, task.task_type, task.start_time, task.duration,
+         task.assigned_to, task.client, task.payment_status, task.deposit_amount,
+         notifications_sent, waitlist, task.recurrence) = row
+        task._dependencies = list(dependencies) if dependencies else None
+        task._notifications_sent = list(notifications_sent) if notifications_sent else None
+        task._waitlist = list(waitlist) if waitlist else None
+        return task
+
+    @staticmethod
+    def to_rows(tasks) -> List[tuple]:
+        return [task.to_row() for task in tasks]
+
+    @classmethod
+    def from_rows(cls, rows) -> List['Task']:
+        from_row = cls.from_row
+        return [from_row(row) for row in rows]
 
     def to_dict(self) -> dict:
         return {
@@ -40,9 +149,9 @@ class Task:
             "category": self.category,
             "priority": self.priority,
             "deadline": self.deadline,
-            "dependencies": ", ".join(self.dependencies) if self.dependencies else "None",
+            "dependencies": ", ".join(self._dependencies) if self._dependencies else "None",
             "status": self.status,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "created_at": self.created_at.strftime(DATE_FORMAT),
             "task_type": self.task_type.value,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "duration": self.duration,
@@ -50,19 +159,63 @@ class Task:
             "client": self.client,
             "payment_status": self.payment_status,
             "deposit_amount": self.deposit_amount,
-            "waitlist": self.waitlist
+            "notifications_sent": list(self._notifications_sent or ()),
+            "waitlist": list(self._waitlist or ()),
+            "recurrence": self.recurrence.to_dict() if self.recurrence else None
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
-        dependencies = (data.get('dependencies', "None").split(", ") 
-                      if data.get('dependencies') != "None" else [])
-        return cls(
-            id=data['id'],
-            task_name=data['task_name'],
-            category=data['category'],
-            priority=data['priority'],
-            deadline=data['deadline'],
-            dependencies=dependencies,
-            status=data['status']
-        )
+        """
+        Inverse of to_dict(). Also accepts tasks.csv records: dependencies
+        may be a list or a comma-separated string ('None' or empty for
+        none), and fields missing from the dict take their defaults.
+        """
+        dependencies = data.get('dependencies')
+        if isinstance(dependencies, str):
+            dependencies = ([name.strip() for name in dependencies.split(',') if name.strip()]
+                            if dependencies.strip() not in ('', 'None') else None)
+        created_at = data.get('created_at')
+        if isinstance(created_at, str):
+            created_at = datetime.strptime(created_at, DATE_FORMAT) if created_at else None
+        start_time = data.get('start_time')
+        if isinstance(start_time, str):
+            start_time = datetime.fromisoformat(start_time)
+        task_type = data.get('task_type') or TaskType.REGULAR
+        recurrence = data.get('recurrence')
+        if recurrence and not isinstance(recurrence, Recurrence):
+            recurrence = Recurrence.from_dict(recurrence)
+
+        return cls.from_row((
+            data['id'],
+            data['task_name'],
+            data['category'],
+            data['priority'],
+            data['deadline'],
+            dependencies,
+            data.get('status', "Not Started"),
+            created_at or datetime.now(),
+            TaskType(task_type),
+            start_time,
+            data.get('duration', 60),
+            data.get('assigned_to'),
+            data.get('client'),
+            data.get('payment_status'),
+            data.get('deposit_amount', 0.0),
+            data.get('notifications_sent'),
+            data.get('waitlist'),
+            recurrence or None
+        ))
+
+    def occurrences(self, start: datetime, end: datetime) -> List[Tuple[datetime, int]]:
+        """
+        (start, duration) of each occurrence of the task starting in
+        [start, end): its start_time if it doesn't repeat, otherwise the
+        occurrences of its recurrence in that window only.
+        """
+        if self.start_time is None:
+            return []
+        if self.recurrence is None:
+            return [(self.start_time, self.duration)] if start <= self.start_time < end else []
+        return [(moved, self.duration if duration is None else duration)
+                for _, moved, duration in self.recurrence.between(self.start_time, start, end)]
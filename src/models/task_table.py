@@ -0,0 +1,419 @@
+import numpy as np
+import pandas as pd
+from .task import TASK_COLUMNS, STATUSES, DATE_FORMAT, Task, TaskType
+
+# Columns held in the frame; dependencies are stored separately
+FRAME_COLUMNS = [column for column in TASK_COLUMNS if column != 'dependencies']
+
+class TaskTable:
+    """
+    Typed columnar representation of the tasks stored in tasks.csv.
+
+    Columns use compact dtypes: int32 id/priority/deadline, categorical
+    category and status and datetime64 created_at. Dependencies are held as
+    int32 task-id arrays in CSR form: the ids of the dependencies of the row
+    at position i are dep_ids[dep_offsets[i]:dep_offsets[i + 1]].
+
+    Rows are kept in ascending id order so ids can be located with a binary
+    search. The CSV format on disk is unchanged: dependencies are written
+    back as comma-separated task names.
+    """
+    def __init__(self, frame, dep_offsets=None, dep_ids=None, unresolved=None):
+        self.frame = frame
+        self.dep_offsets = (dep_offsets if dep_offsets is not None
+                            else np.zeros(len(frame) + 1, dtype=np.int64))
+        self.dep_ids = dep_ids if dep_ids is not None else np.empty(0, dtype=np.int32)
+        # Dependency names that matched no task, kept so rewrites don't lose them
+        self.unresolved = unresolved or {}
+        # Name -> id map, built on first lookup
+        self._name_index = None
+
+    @classmethod
+    def empty(cls):
+        return cls(cls._typed(pd.DataFrame({column: [] for column in FRAME_COLUMNS})))
+
+    @classmethod
+    def read_csv(cls, path):
+        """
+        Load tasks.csv into a TaskTable.
+        """
+        raw = pd.read_csv(
+            path,
+            dtype={'task_name': str, 'category': str, 'dependencies': str, 'status': str},
+            keep_default_na=False
+        )
+        if raw.empty:
+            return cls.empty()
+
+        raw = raw.sort_values('id', kind='stable', ignore_index=True)
+        frame = cls._typed(raw)
+        ids_by_name = dict(zip(frame['task_name'], frame['id'].tolist()))
+        # Tolerate names saved with stray whitespace
+        for name, task_id in list(ids_by_name.items()):
+            ids_by_name.setdefault(name.strip(), task_id)
+
+        # Parse each distinct dependency string once
+        parsed = {}
+        for text in pd.unique(raw['dependencies']):
+            names = cls.split_dependencies(text)
+            ids = [ids_by_name[name] for name in names if name in ids_by_name]
+            missing = [name for name in names if name not in ids_by_name]
+            parsed[text] = (ids, missing)
+
+        unresolved = {}
+        lengths = np.zeros(len(raw), dtype=np.int64)
+        flat = []
+        for position, (task_id, text) in enumerate(zip(frame['id'].tolist(), raw['dependencies'])):
+            ids, missing = parsed[text]
+            if ids:
+                lengths[position] = len(ids)
+                flat.extend(ids)
+            if missing:
+                unresolved[task_id] = missing
+
+        dep_offsets = np.zeros(len(raw) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=dep_offsets[1:])
+        return cls(frame, dep_offsets, np.array(flat, dtype=np.int32), unresolved)
+
+    def to_csv(self, path):
+        """
+        Write the table back to tasks.csv in the original text format.
+        """
+        self.to_frame().to_csv(path, index=False, date_format=DATE_FORMAT)
+
+    @staticmethod
+    def split_dependencies(text):
+        if not isinstance(text, str) or text in ('', 'None'):
+            return []
+        return [name.strip() for name in text.split(',') if name.strip()]
+
+    @staticmethod
+    def _typed(frame):
+        frame = frame[FRAME_COLUMNS].astype({
+            'id': 'int32',
+            'task_name': object,
+            'category': 'category',
+            'priority': 'int32',
+            'deadline': 'int32',
+            'status': 'category'
+        })
+        frame['created_at'] = pd.to_datetime(frame['created_at'], format=DATE_FORMAT, errors='coerce')
+        missing = [status for status in STATUSES if status not in frame['status'].cat.categories]
+        if missing:
+            frame['status'] = frame['status'].cat.add_categories(missing)
+        return frame
+
+    @property
+    def _ids_by_name(self):
+        if self._name_index is None:
+            self._name_index = dict(zip(self.frame['task_name'], self.frame['id'].tolist()))
+        return self._name_index
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    def id_for(self, name):
+        return self._ids_by_name.get(name)
+
+    def position(self, task_id):
+        """
+        Row position of a task id, or None if absent.
+        """
+        ids = self.frame['id'].to_numpy()
+        index = int(np.searchsorted(ids, task_id))
+        if index < len(ids) and ids[index] == task_id:
+            return index
+        return None
+
+    def positions(self, task_ids):
+        """
+        Row positions of an array of task ids that are known to exist.
+        """
+        return np.searchsorted(self.frame['id'].to_numpy(), task_ids)
+
+    def dependencies(self, position):
+        """
+        Dependency task ids of the row at a position.
+        """
+        return self.dep_ids[self.dep_offsets[position]:self.dep_offsets[position + 1]]
+
+    def names_for(self, ids):
+        """
+        Task names for an array of task ids.
+        """
+        if len(ids) == 0:
+            return []
+        return self.frame['task_name'].to_numpy()[self.positions(ids)].tolist()
+
+    def dependency_names(self, position):
+        """
+        Names of the dependencies of the task at a row position.
+        """
+        task_id = int(self.frame['id'].iat[position])
+        return self.names_for(self.dependencies(position)) + self.unresolved.get(task_id, [])
+
+    def dependents_of(self, task_id):
+        """
+        Names of the tasks that list task_id as a dependency.
+        """
+        return self.frame['task_name'].to_numpy()[self.dependent_positions(task_id)].tolist()
+
+    def dependent_positions(self, task_ids):
+        """
+        Row positions of the tasks that list any of task_ids as a dependency.
+        """
+        hits = np.flatnonzero(np.isin(self.dep_ids, task_ids))
+        return np.unique(np.searchsorted(self.dep_offsets, hits, side='right') - 1)
+
+    def append(self, record):
+        """
+        Append a task given as a dict with TASK_COLUMNS keys and dependencies
+        as an iterable of task ids.
+        """
+        frame = self.frame
+        for column in ('category', 'status'):
+            if record[column] not in frame[column].cat.categories:
+                frame[column] = frame[column].cat.add_categories([record[column]])
+
+        # Build the row with the table's dtypes directly; astype is much slower
+        row = {}
+        for column in FRAME_COLUMNS:
+            dtype = frame[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                row[column] = pd.Categorical([record[column]], dtype=dtype)
+            else:
+                row[column] = np.array([record[column]], dtype=dtype)
+        row = pd.DataFrame(row)
+        self.frame = pd.concat([frame, row], ignore_index=True)
+
+        deps = np.asarray(list(record['dependencies']), dtype=np.int32)
+        self.dep_ids = np.concatenate([self.dep_ids, deps])
+        self.dep_offsets = np.append(self.dep_offsets, self.dep_offsets[-1] + len(deps))
+        self._ids_by_name[record['task_name']] = int(record['id'])
+
+    def remove(self, task_id):
+        position = self.position(task_id)
+        name = self.frame['task_name'].iat[position]
+        self.frame = self.frame.drop(index=position).reset_index(drop=True)
+
+        start, end = self.dep_offsets[position], self.dep_offsets[position + 1]
+        self.dep_ids = np.delete(self.dep_ids, np.s_[start:end])
+        self.dep_offsets = np.delete(self.dep_offsets, position + 1)
+        self.dep_offsets[position + 1:] -= end - start
+
+        self._ids_by_name.pop(name, None)
+        self.unresolved.pop(task_id, None)
+
+    def add_dependency(self, task_id, dep_id):
+        """
+        Add dep_id to the dependencies of task_id; only that row's slice of
+        the dependency arrays moves.
+        """
+        position = self.position(task_id)
+        end = self.dep_offsets[position + 1]
+        self.dep_ids = np.insert(self.dep_ids, end, dep_id)
+        self.dep_offsets[position + 1:] += 1
+
+    def remove_dependency(self, task_id, dep_id):
+        """
+        Remove dep_id from the dependencies of task_id.
+
+        :return: False if it was not a dependency
+        """
+        position = self.position(task_id)
+        start, end = self.dep_offsets[position], self.dep_offsets[position + 1]
+        hits = np.flatnonzero(self.dep_ids[start:end] == dep_id)
+        if not len(hits):
+            return False
+        self.dep_ids = np.delete(self.dep_ids, start + hits[0])
+        self.dep_offsets[position + 1:] -= 1
+        return True
+
+    def rename(self, task_id, name):
+        """
+        Change a task's name. Dependencies refer to tasks by id, so no
+        other row changes; dependents show the new name when rendered.
+        """
+        position = self.position(task_id)
+        old_name = self.frame['task_name'].iat[position]
+        self.frame.loc[position, 'task_name'] = name
+        if self._name_index is not None:
+            self._name_index.pop(old_name, None)
+            self._name_index[name] = int(task_id)
+
+    def set_status(self, task_id, status):
+        if status not in self.frame['status'].cat.categories:
+            self.frame['status'] = self.frame['status'].cat.add_categories([status])
+        self.frame.loc[self.position(task_id), 'status'] = status
+
+    def next_id(self):
+        return int(self.frame['id'].iat[-1]) + 1 if len(self.frame) else 1
+
+    def record(self, position):
+        """
+        Task at a row position as a dict in the CSV text representation.
+        """
+        row = self.frame.iloc[position]
+        dependencies = self.dependency_names(position)
+        created_at = row['created_at']
+        return {
+            'id': int(row['id']),
+            'task_name': row['task_name'],
+            'category': row['category'],
+            'priority': int(row['priority']),
+            'deadline': int(row['deadline']),
+            'dependencies': ', '.join(dependencies) if dependencies else 'None',
+            'status': row['status'],
+            'created_at': created_at.strftime(DATE_FORMAT) if pd.notna(created_at) else ''
+        }
+
+    def to_frame(self, rows=None, columns=None):
+        """
+        Copy of the table with dependencies rendered back to comma-separated
+        task names.
+
+        :param rows: Optional boolean mask or array of row positions to include
+        :param columns: Optional subset of TASK_COLUMNS to include
+        """
+        columns = list(columns) if columns else TASK_COLUMNS
+        frame_columns = [column for column in columns if column != 'dependencies']
+        if rows is None:
+            positions = np.arange(len(self.frame))
+            result = self.frame[frame_columns].copy()
+        else:
+            rows = np.asarray(rows)
+            positions = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+            result = self.frame[frame_columns].iloc[positions].copy()
+
+        if 'dependencies' not in columns:
+            return result
+
+        result.insert(columns.index('dependencies'), 'dependencies', self.render_dependencies(positions))
+        return result
+
+    def records(self, positions, columns=None):
+        """
+        Rows at the given positions as dicts in the CSV text representation,
+        like record() but converting whole columns at once.
+
+        :param columns: Optional subset of TASK_COLUMNS to include
+        """
+        columns = list(columns) if columns else TASK_COLUMNS
+        positions = np.asarray(positions, dtype=np.int64)
+        values = []
+        for column in columns:
+            if column == 'dependencies':
+                values.append(self.render_dependencies(positions))
+            elif column == 'created_at':
+                created_at = self.frame['created_at'].iloc[positions]
+                values.append(created_at.dt.strftime(DATE_FORMAT).fillna('').tolist())
+            else:
+                values.append(self.frame[column].to_numpy()[positions].tolist())
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def tasks(self, positions=None):
+        """
+        Task objects for the rows at the given positions (all rows by
+        default), built column-wise through Task.from_rows.
+        """
+        positions = np.arange(len(self)) if positions is None else np.asarray(positions, dtype=np.int64)
+        count = len(positions)
+        frame = self.frame
+        dependencies = self.dependency_lists(positions)
+        created_at = frame['created_at'].iloc[positions]
+        created_at = np.where(created_at.isna().to_numpy(), None, created_at.dt.to_pydatetime()).tolist()
+        defaults = [None] * count
+        rows = zip(
+            frame['id'].to_numpy()[positions].tolist(),
+            frame['task_name'].to_numpy()[positions].tolist(),
+            frame['category'].to_numpy()[positions].tolist(),
+            frame['priority'].to_numpy()[positions].tolist(),
+            frame['deadline'].to_numpy()[positions].tolist(),
+            dependencies,
+            frame['status'].to_numpy()[positions].tolist(),
+            created_at,
+            [TaskType.REGULAR] * count,
+            defaults, [60] * count, defaults, defaults, defaults, [0.0] * count,
+            defaults, defaults, defaults
+        )
+        return Task.from_rows(rows)
+
+    def dependency_lists(self, positions):
+        """
+        Dependency names of each row position, as lists. The dependency ids
+        of all the rows are resolved to names in one vectorized lookup.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.dep_offsets[positions]
+        lengths = self.dep_offsets[positions + 1] - starts
+        bounds = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=bounds[1:])
+        edges = np.repeat(starts - bounds[:-1], lengths) + np.arange(bounds[-1])
+        names = self.names_for(self.dep_ids[edges])
+
+        bounds = bounds.tolist()
+        lists = [names[start:end] for start, end in zip(bounds, bounds[1:])]
+        if self.unresolved:
+            ids = self.frame['id'].to_numpy()[positions].tolist()
+            for deps, task_id in zip(lists, ids):
+                deps += self.unresolved.get(task_id, [])
+        return lists
+
+    def render_dependencies(self, positions):
+        """
+        Comma-separated dependency names for each row position.
+        """
+        return [', '.join(deps) if deps else 'None' for deps in self.dependency_lists(positions)]
+
+    def diff(self, older):
+        """
+        Compare with an older version of the table.
+
+        :return: (added_ids, removed_ids, updated_ids) as lists of task ids
+        """
+        new_ids = self.frame['id'].to_numpy()
+        old_ids = older.frame['id'].to_numpy()
+        added = np.setdiff1d(new_ids, old_ids, assume_unique=True)
+        removed = np.setdiff1d(old_ids, new_ids, assume_unique=True)
+        common, new_pos, old_pos = np.intersect1d(new_ids, old_ids, assume_unique=True, return_indices=True)
+
+        changed = np.zeros(len(common), dtype=bool)
+        for column in FRAME_COLUMNS[1:]:
+            new_values = self.frame[column].to_numpy()[new_pos]
+            old_values = older.frame[column].to_numpy()[old_pos]
+            if column == 'created_at':
+                both_missing = pd.isna(new_values) & pd.isna(old_values)
+                changed |= (new_values != old_values) & ~both_missing
+            else:
+                changed |= np.asarray(new_values != old_values, dtype=bool)
+
+        # Dependencies differ if the counts differ or any id differs
+        new_starts, old_starts = self.dep_offsets[new_pos], older.dep_offsets[old_pos]
+        lengths = self.dep_offsets[new_pos + 1] - new_starts
+        changed |= lengths != older.dep_offsets[old_pos + 1] - old_starts
+        same = np.flatnonzero(~changed & (lengths > 0))
+        if len(same):
+            counts = lengths[same]
+            rows = np.repeat(same, counts)
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            differs = (self.dep_ids[new_starts[rows] + within]
+                       != older.dep_ids[old_starts[rows] + within])
+            changed[rows[differs]] = True
+
+        updated = common[changed].tolist()
+        if self.unresolved or older.unresolved:
+            kept = set(common.tolist())
+            updated = sorted(set(updated) | {
+                task_id for task_id in set(self.unresolved) | set(older.unresolved)
+                if task_id in kept and self.unresolved.get(task_id) != older.unresolved.get(task_id)
+            })
+        return added.tolist(), removed.tolist(), updated
+
+    def memory_usage(self):
+        """
+        Approximate memory used by the table in bytes.
+        """
+        return int(self.frame.memory_usage(deep=True).sum() + self.dep_offsets.nbytes + self.dep_ids.nbytes)
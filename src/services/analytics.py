@@ -0,0 +1,300 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+# Below this many tasks the analyses run in-process; starting workers costs more
+PARALLEL_MIN_TASKS = 50000
+
+# Level partitions per worker, so uneven components still balance out
+CHUNKS_PER_WORKER = 4
+
+# Arrays attached by a worker process, by name
+_ARRAYS = {}
+_BLOCKS = []
+
+class SharedGraph:
+    """
+    The arrays the analyses need, copied once into named shared memory
+    blocks that worker processes map instead of receiving pickled copies.
+
+      dep_offsets, dep_positions  dependencies in CSR form, by row position
+      weights                     remaining days of each task (0 once completed)
+      completed                   1 for completed tasks
+      component_order             row positions grouped by connected component
+      category_order              row positions grouped by category
+      levels                      output: dependency level of each row
+    """
+    def __init__(self, arrays):
+        self.blocks = []
+        self.spec = {}
+        self.arrays = {}
+        try:
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                self.blocks.append(block)
+                view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                view[...] = array
+                self.arrays[name] = view
+                self.spec[name] = (block.name, array.dtype.str, array.shape)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+def _attach(spec):
+    # Process pool initializer: map the parent's blocks
+    for name, (block_name, dtype, shape) in spec.items():
+        # Pool workers share the parent's resource tracker, which unlinks
+        # the blocks if the parent dies without closing them
+        block = shared_memory.SharedMemory(name=block_name)
+        _BLOCKS.append(block)
+        _ARRAYS[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+def _level_partition(start, end):
+    return assign_levels(_ARRAYS, start, end)
+
+def _category_partition(ranges):
+    return [category_summary(_ARRAYS, start, end) for start, end in ranges]
+
+# --- Partitioning ------------------------------------------------------------
+
+def weakly_connected_components(count, sources, targets):
+    """
+    Component label of each of count nodes given the edge endpoints.
+
+    Min-label hooking with pointer jumping, vectorized over all edges; it
+    takes a number of rounds logarithmic in the component diameter.
+
+    :return: (labels in 0..components-1, number of components)
+    """
+    labels = np.arange(count, dtype=np.int64)
+    while len(sources):
+        low = np.minimum(labels[sources], labels[targets])
+        np.minimum.at(labels, sources, low)
+        np.minimum.at(labels, targets, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels[sources], labels[targets]):
+            break
+    roots, labels = np.unique(labels, return_inverse=True)
+    return labels, len(roots)
+
+def _runs(sorted_labels):
+    """
+    One (start, end) range per run of equal labels in a label-sorted array.
+    """
+    if not len(sorted_labels):
+        return []
+    bounds = np.r_[0, np.flatnonzero(np.diff(sorted_labels)) + 1, len(sorted_labels)]
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+def _ranges(sorted_labels, chunks):
+    """
+    Split positions 0..len-1 of a label-sorted array into about `chunks`
+    (start, end) ranges of similar size without splitting a label.
+    """
+    total = len(sorted_labels)
+    if not total:
+        return []
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    targets = np.linspace(0, total, max(1, chunks) + 1)[1:-1]
+    bounds = np.r_[starts, total]
+    cuts = np.unique(np.r_[0, bounds[np.searchsorted(starts, targets)], total])
+    return [(int(start), int(end)) for start, end in zip(cuts[:-1], cuts[1:]) if end > start]
+
+# --- Analyses ----------------------------------------------------------------
+
+def _longest_paths(arrays, nodes):
+    """
+    Dependency level and longest remaining-days path ending at each of
+    nodes, over the subgraph they induce, in one topological pass.
+
+    :return: (levels, path days, best predecessor, processed count), all
+             indexed like nodes; nodes on a cycle are left unprocessed
+    """
+    offsets = arrays['dep_offsets']
+    count = len(nodes)
+    local = np.full(len(offsets) - 1, -1, dtype=np.int64)
+    local[nodes] = np.arange(count)
+
+    # Edges dependency -> task within nodes, as local indexes
+    first = offsets[nodes]
+    lengths = offsets[nodes + 1] - first
+    bounds = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=bounds[1:])
+    flat = np.arange(bounds[-1]) - np.repeat(bounds[:-1] - first, lengths)
+    sources = local[arrays['dep_positions'][flat]]
+    targets = np.repeat(np.arange(count), lengths)
+    inside = sources >= 0
+    sources, targets = sources[inside], targets[inside]
+
+    order = np.argsort(sources, kind='stable')
+    successors = targets[order].tolist()
+    starts = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=count), out=starts[1:])
+    starts = starts.tolist()
+    pending = np.bincount(targets, minlength=count).tolist()
+
+    weights = arrays['weights'][nodes].tolist()
+    days = list(weights)
+    levels = [0] * count
+    previous = [-1] * count
+    ready = [node for node in range(count) if not pending[node]]
+    processed = 0
+    while ready:
+        node = ready.pop()
+        processed += 1
+        level, reach = levels[node] + 1, days[node]
+        for successor in successors[starts[node]:starts[node + 1]]:
+            if level > levels[successor]:
+                levels[successor] = level
+            if reach + weights[successor] > days[successor]:
+                days[successor] = reach + weights[successor]
+                previous[successor] = node
+            pending[successor] -= 1
+            if not pending[successor]:
+                ready.append(successor)
+
+    levels = np.array(levels, dtype=np.int32)
+    if processed < count:
+        levels[np.array(pending) > 0] = -1
+    return levels, days, previous, processed
+
+def assign_levels(arrays, start, end):
+    """
+    Write the dependency level (longest dependency chain below a task) of
+    the tasks in component_order[start:end] into the levels array. The
+    range must hold whole components.
+
+    :return: Number of tasks left at level -1 because they are on or
+             depend on a cycle
+    """
+    nodes = arrays['component_order'][start:end].astype(np.int64)
+    levels, _, _, processed = _longest_paths(arrays, nodes)
+    arrays['levels'][nodes] = levels
+    return len(nodes) - processed
+
+def category_summary(arrays, start, end):
+    """
+    Workload and critical path of the category in category_order[start:end].
+
+    The critical path is the chain of same-category dependencies with the
+    most remaining days, counting each task's deadline as its duration.
+
+    :return: Dict with tasks, open, remaining_days, critical_days and
+             critical_path (row positions, first task first)
+    """
+    nodes = arrays['category_order'][start:end].astype(np.int64)
+    _, days, previous, _ = _longest_paths(arrays, nodes)
+    open_tasks = arrays['completed'][nodes] == 0
+    summary = {
+        'tasks': len(nodes),
+        'open': int(open_tasks.sum()),
+        'remaining_days': int(arrays['weights'][nodes].sum()),
+        'critical_days': 0,
+        'critical_path': []
+    }
+    if len(nodes):
+        node = int(np.argmax(days))
+        summary['critical_days'] = int(days[node])
+        path = []
+        while node >= 0:
+            path.append(int(nodes[node]))
+            node = previous[node]
+        summary['critical_path'] = path[::-1]
+    return summary
+
+def analyze(table, workers=None):
+    """
+    Dependency levels of all tasks plus the workload and critical path of
+    each category.
+
+    Levels are computed per weakly connected component and category
+    summaries per category, so the partitions are independent. With more
+    than one worker and at least PARALLEL_MIN_TASKS tasks they run in a
+    process pool that reads the graph from shared memory; a single large
+    component still runs on one worker.
+
+    :param table: TaskTable to analyze
+    :param workers: Worker processes; defaults to the number of CPUs
+    :return: Dict with 'levels' (DataFrame of id, task_name, category,
+             status and level; -1 for tasks on or behind a cycle), 'categories'
+             (DataFrame of category, tasks, open, remaining_days,
+             critical_days, critical_path as task names), 'components' and
+             'cyclic' (number of tasks left at level -1)
+    """
+    frame = table.frame
+    count = len(frame)
+    workers = max(1, workers or os.cpu_count() or 1)
+    offsets = table.dep_offsets.astype(np.int64)
+    dep_positions = table.positions(table.dep_ids).astype(np.int64)
+    tasks = np.repeat(np.arange(count), np.diff(offsets))
+    labels, components = weakly_connected_components(count, dep_positions, tasks)
+
+    completed = (frame['status'] == 'Completed').to_numpy()
+    codes = frame['category'].cat.codes.to_numpy()
+    category_order = np.argsort(codes, kind='stable')
+    component_order = np.argsort(labels, kind='stable')
+    arrays = {
+        'dep_offsets': offsets,
+        'dep_positions': dep_positions,
+        'weights': np.where(completed, 0, frame['deadline'].to_numpy()).astype(np.int64),
+        'completed': completed.astype(np.uint8),
+        'component_order': component_order.astype(np.int32),
+        'category_order': category_order.astype(np.int32),
+        'levels': np.zeros(count, dtype=np.int32)
+    }
+    level_ranges = _ranges(labels[component_order], workers * CHUNKS_PER_WORKER)
+    # Exactly one range per category, since each is summarized on its own
+    category_ranges = _runs(codes[category_order])
+
+    if workers == 1 or count < PARALLEL_MIN_TASKS:
+        cyclic = sum(assign_levels(arrays, start, end) for start, end in level_ranges)
+        summaries = [category_summary(arrays, start, end) for start, end in category_ranges]
+        levels = arrays['levels']
+    else:
+        shared = SharedGraph(arrays)
+        try:
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shared.spec,)) as pool:
+                level_jobs = [pool.submit(_level_partition, start, end) for start, end in level_ranges]
+                # Balance the pool by handing each job several whole categories
+                category_jobs = [
+                    pool.submit(_category_partition,
+                                [(start, end) for start, end in category_ranges if job_start <= start < job_end])
+                    for job_start, job_end in _ranges(codes[category_order], workers * CHUNKS_PER_WORKER)
+                ]
+                cyclic = sum(job.result() for job in level_jobs)
+                summaries = [summary for job in category_jobs for summary in job.result()]
+            levels = shared.arrays['levels'].copy()
+        finally:
+            shared.close()
+
+    names = frame['task_name'].to_numpy()
+    categories = pd.DataFrame(summaries, columns=['tasks', 'open', 'remaining_days',
+                                                  'critical_days', 'critical_path'])
+    categories.insert(0, 'category', [str(frame['category'].iat[category_order[start]])
+                                      for start, _ in category_ranges])
+    categories['critical_path'] = [names[path].tolist() for path in categories['critical_path']]
+    return {
+        'levels': pd.DataFrame({
+            'id': frame['id'].to_numpy(),
+            'task_name': names,
+            'category': frame['category'].to_numpy(),
+            'status': frame['status'].to_numpy(),
+            'level': levels
+        }),
+        'categories': categories.sort_values('critical_days', ascending=False, ignore_index=True),
+        'components': components,
+        'cyclic': cyclic
+    }
@@ -0,0 +1,95 @@
+import bisect
+import numpy as np
+import pandas as pd
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+class DeadlineIndex:
+    """
+    Open (not completed) tasks ordered by due time, where a task is due
+    `deadline` days after it was created.
+
+    The index is built once with vectorized arithmetic and then kept up to
+    date one task at a time. Queries are binary searches against the current
+    time, so nothing is rescanned as time advances.
+    """
+    def __init__(self):
+        self._keys = []
+        self._due_by_id = {}
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Build the index for every open task in a TaskTable.
+        """
+        index = cls()
+        frame = table.frame
+        due = cls.due_times(frame['created_at'], frame['deadline'])
+        open_mask = (frame['status'] != "Completed").to_numpy() & (due != np.iinfo(np.int64).min)
+        ids = frame['id'].to_numpy()[open_mask].astype(np.int64)
+        due = due[open_mask]
+        order = np.lexsort((ids, due))
+        index._keys = list(zip(due[order].tolist(), ids[order].tolist()))
+        index._due_by_id = dict(zip(ids.tolist(), due.tolist()))
+        return index
+
+    @staticmethod
+    def due_times(created_at, deadline):
+        """
+        Due times in nanoseconds since the epoch; missing dates map to the
+        minimum int64 value.
+        """
+        created = pd.to_datetime(created_at).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        due = created + np.asarray(deadline, dtype=np.int64) * DAY_NS
+        return np.where(created == np.iinfo(np.int64).min, np.iinfo(np.int64).min, due)
+
+    @staticmethod
+    def to_ns(moment):
+        return pd.Timestamp(moment).value
+
+    def add(self, task_id, due):
+        """
+        Track an open task due at the given time (datetime or ns).
+        """
+        task_id = int(task_id)
+        self.remove(task_id)
+        due_ns = due if isinstance(due, int) else self.to_ns(due)
+        bisect.insort(self._keys, (due_ns, task_id))
+        self._due_by_id[task_id] = due_ns
+
+    def remove(self, task_id):
+        """
+        Stop tracking a task, e.g. when it is completed or deleted.
+        """
+        task_id = int(task_id)
+        due_ns = self._due_by_id.pop(task_id, None)
+        if due_ns is not None:
+            index = bisect.bisect_left(self._keys, (due_ns, task_id))
+            del self._keys[index]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, task_id):
+        return int(task_id) in self._due_by_id
+
+    def _bound(self, moment):
+        return bisect.bisect_left(self._keys, (self.to_ns(moment),))
+
+    def due_before(self, moment):
+        """
+        Ids of tasks due before moment, earliest first.
+        """
+        return [task_id for _, task_id in self._keys[:self._bound(moment)]]
+
+    def due_between(self, start, end):
+        """
+        Ids of tasks due in [start, end), earliest first.
+        """
+        return [task_id for _, task_id in self._keys[self._bound(start):self._bound(end)]]
+
+    def count_before(self, moment):
+        return self._bound(moment)
+
+    def count_between(self, start, end):
+        return max(0, self._bound(end) - self._bound(start))
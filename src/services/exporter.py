@@ -0,0 +1,163 @@
+import os
+import csv
+import json
+import numpy as np
+from ..models.task import TASK_COLUMNS
+from ..models.task_table import TaskTable
+
+# Rows converted and written at a time; also the Parquet row group size
+CHUNK_ROWS = 10000
+
+# Bytes copied between progress reports on the file-copy path
+COPY_CHUNK_BYTES = 1024 * 1024
+
+FORMATS_BY_EXTENSION = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow'
+}
+EXPORT_FORMATS = ['csv', 'ndjson', 'parquet', 'arrow']
+
+def format_for(path, default='csv'):
+    """
+    Export format implied by a file name's extension.
+    """
+    return FORMATS_BY_EXTENSION.get(os.path.splitext(str(path))[1].lower(), default)
+
+def copy_file(source, target, progress=None):
+    """
+    Copy a file (or into an open binary stream) in chunks, reporting
+    progress as (bytes_done, bytes_total).
+    """
+    total = os.path.getsize(source)
+    done = 0
+    with open(source, 'rb') as src:
+        dst = open(target, 'wb') if isinstance(target, (str, os.PathLike)) else target
+        try:
+            while True:
+                chunk = src.read(COPY_CHUNK_BYTES)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        finally:
+            if dst is not target:
+                dst.close()
+    if progress and total == 0:
+        progress(0, 0)
+    return total
+
+def export_table(table, positions, target, export_format, progress=None, chunk_rows=CHUNK_ROWS):
+    """
+    Write the rows of a TaskTable at the given positions, in order.
+
+    Rows are converted CHUNK_ROWS at a time so memory stays bounded by one
+    chunk. Dependencies are written as comma-separated names in CSV and as
+    lists of names (the task's incoming dependency edges) in the other
+    formats.
+
+    :param target: File path, or an open text stream for csv and ndjson
+    :param progress: Optional callable(rows_done, rows_total)
+    :return: Number of rows written
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'. Must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    positions = np.asarray(positions, dtype=np.int64)
+    chunks = (positions[start:start + chunk_rows] for start in range(0, len(positions), chunk_rows))
+    if export_format in ('parquet', 'arrow'):
+        writer = _ArrowWriter(target, export_format)
+    else:
+        writer = _TextWriter(target, export_format)
+
+    done = 0
+    try:
+        for chunk in chunks:
+            writer.write(table, chunk)
+            done += len(chunk)
+            if progress:
+                progress(done, len(positions))
+    finally:
+        writer.close()
+    if progress and not len(positions):
+        progress(0, 0)
+    return done
+
+class _TextWriter:
+    def __init__(self, target, export_format):
+        self.format = export_format
+        self._owned = isinstance(target, (str, os.PathLike))
+        self.stream = open(target, 'w', newline='') if self._owned else target
+        if export_format == 'csv':
+            self._csv = csv.writer(self.stream)
+            self._csv.writerow(TASK_COLUMNS)
+
+    def write(self, table, positions):
+        records = table.records(positions)
+        if self.format == 'csv':
+            self._csv.writerows([record[column] for column in TASK_COLUMNS] for record in records)
+        else:
+            for record in records:
+                record['dependencies'] = TaskTable.split_dependencies(record['dependencies'])
+            self.stream.write(''.join(json.dumps(record) + '\n' for record in records))
+
+    def close(self):
+        if self._owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+class _ArrowWriter:
+    """
+    Writes chunks as Parquet row groups or Arrow IPC record batches.
+    Requires the optional pyarrow package.
+    """
+    def __init__(self, target, export_format):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ValueError(f"Exporting to {export_format} requires the pyarrow package")
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ('id', pa.int32()),
+            ('task_name', pa.string()),
+            ('category', pa.string()),
+            ('priority', pa.int32()),
+            ('deadline', pa.int32()),
+            ('dependencies', pa.list_(pa.string())),
+            ('status', pa.string()),
+            ('created_at', pa.timestamp('s'))
+        ])
+        if export_format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(target, self.schema)
+        else:
+            import pyarrow.ipc as ipc
+            self._writer = ipc.new_file(target, self.schema)
+
+    def write(self, table, positions):
+        pa = self.pa
+        frame = table.frame
+        dependencies = table.dependency_lists(positions)
+        columns = {
+            'id': frame['id'].to_numpy()[positions],
+            'task_name': frame['task_name'].to_numpy()[positions],
+            'category': frame['category'].to_numpy()[positions].astype(str),
+            'priority': frame['priority'].to_numpy()[positions],
+            'deadline': frame['deadline'].to_numpy()[positions],
+            'dependencies': dependencies,
+            'status': frame['status'].to_numpy()[positions].astype(str),
+            'created_at': frame['created_at'].to_numpy()[positions].astype('datetime64[s]')
+        }
+        batch = pa.record_batch([pa.array(columns[field.name], type=field.type) for field in self.schema],
+                                schema=self.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
@@ -0,0 +1,124 @@
+class FilterEngine:
+    """
+    Incremental in-memory filtering of task rows.
+
+    Holds every task keyed by id together with a precomputed lowercase
+    category column. Full-text search results are passed in as a set of
+    matching task ids. When new filters are at least as restrictive as the
+    previous ones, only the previous result is rescanned and only the
+    predicates that changed are re-evaluated.
+    """
+    def __init__(self):
+        self.rows = {}
+        self._category_lower = {}
+        self._last_filters = None
+        self._last_result = None
+
+    def load(self, tasks):
+        """
+        Replace all rows with the given task dicts.
+        """
+        self.rows = {}
+        self._category_lower = {}
+        for task in tasks:
+            self._store(task)
+        self._last_filters = None
+        self._last_result = None
+
+    def upsert(self, task):
+        """
+        Insert or replace a single row, keeping the cached result consistent.
+        """
+        task_id = self._store(task)
+        if self._last_result is not None:
+            if self._matches(task_id, self._last_filters):
+                self._last_result[task_id] = None
+            else:
+                self._last_result.pop(task_id, None)
+
+    def remove(self, task_id):
+        """
+        Remove a single row if present.
+        """
+        task_id = int(task_id)
+        self.rows.pop(task_id, None)
+        self._category_lower.pop(task_id, None)
+        if self._last_result is not None:
+            self._last_result.pop(task_id, None)
+
+    def matches(self, task_id, filters):
+        """
+        Check whether the stored row for task_id passes the filters.
+        """
+        task_id = int(task_id)
+        return task_id in self.rows and self._matches(task_id, self.normalize(filters))
+
+    def apply(self, filters):
+        """
+        Return the ids of all rows passing the filters.
+
+        :param filters: Dictionary with 'category', 'min_priority' and 'status'
+                        keys as accepted by TaskManager.get_tasks, and an
+                        optional 'search' set of ids from TaskManager.search_task_ids
+        :return: List of matching task ids
+        """
+        filters = self.normalize(filters)
+        previous = self._last_filters
+
+        if self._last_result is not None and self._is_narrower(filters, previous):
+            candidates = self._last_result
+            changed = {name: value for name, value in filters.items() if previous[name] != value}
+        else:
+            candidates = self.rows
+            changed = filters
+
+        if changed:
+            result = dict.fromkeys(task_id for task_id in candidates if self._matches(task_id, changed))
+        else:
+            result = dict(candidates) if candidates is self._last_result else dict.fromkeys(candidates)
+
+        self._last_filters = filters
+        self._last_result = result
+        return list(result)
+
+    @staticmethod
+    def normalize(filters):
+        filters = filters or {}
+        return {
+            'category': (filters.get('category') or '').strip().lower(),
+            'min_priority': int(filters.get('min_priority') or 0),
+            'status': filters.get('status') or "All",
+            'search': None if filters.get('search') is None else frozenset(filters['search'])
+        }
+
+    @staticmethod
+    def _is_narrower(new, old):
+        """
+        True if every row passing new also passes old.
+        """
+        return (old['category'] in new['category']
+                and new['min_priority'] >= old['min_priority']
+                and (old['status'] == "All" or new['status'] == old['status'])
+                and (old['search'] is None or (new['search'] is not None and new['search'] <= old['search'])))
+
+    def _store(self, task):
+        task_id = int(task['id'])
+        self.rows[task_id] = task
+        self._category_lower[task_id] = str(task['category']).lower()
+        return task_id
+
+    def _matches(self, task_id, filters):
+        task = self.rows[task_id]
+        category = filters.get('category')
+        if category and category not in self._category_lower[task_id]:
+            return False
+        min_priority = filters.get('min_priority')
+        if min_priority and task['priority'] < min_priority:
+            return False
+        status = filters.get('status')
+        if status and status != "All" and task['status'] != status:
+            return False
+        search = filters.get('search')
+        if search is not None and task_id not in search:
+            return False
+        return True
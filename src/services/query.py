@@ -0,0 +1,238 @@
+import operator
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from ..models.task import TASK_COLUMNS
+from ..utils.metrics import METRICS
+
+Predicate = namedtuple('Predicate', ['column', 'op', 'value'])
+OrderKey = namedtuple('OrderKey', ['column', 'descending'])
+
+COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+OPERATORS = set(COMPARISONS) | {'in', 'prefix', 'contains'}
+
+# Columns that predicates and ordering may refer to
+QUERYABLE_COLUMNS = [column for column in TASK_COLUMNS if column != 'dependencies']
+
+class Query:
+    """
+    Composable description of a task query.
+
+    Every builder method returns a new Query, so a base query can be shared
+    and refined:
+
+        base = Query().where('status', '==', 'Not Started')
+        page = base.where('priority', '>=', 50).order_by('priority', descending=True).limit(20)
+
+    Supported operators are ==, !=, <, <=, >, >= (range), 'in' (membership),
+    'prefix' (string prefix) and 'contains' (case-insensitive substring).
+    """
+    def __init__(self, predicates=(), ordering=(), limit=None, offset=0, columns=None):
+        self.predicates = tuple(predicates)
+        self.ordering = tuple(ordering)
+        self.row_limit = limit
+        self.row_offset = offset
+        self.columns = tuple(columns) if columns else None
+
+    def _replace(self, **changes):
+        fields = {
+            'predicates': self.predicates,
+            'ordering': self.ordering,
+            'limit': self.row_limit,
+            'offset': self.row_offset,
+            'columns': self.columns
+        }
+        fields.update(changes)
+        return Query(**fields)
+
+    def where(self, column, op, value):
+        """
+        Add a predicate; all predicates must hold for a task to match.
+        """
+        self._check_column(column)
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator '{op}'. Must be one of: {', '.join(sorted(OPERATORS))}")
+        if op == 'in':
+            value = tuple(value)
+        return self._replace(predicates=self.predicates + (Predicate(column, op, value),))
+
+    def order_by(self, column, descending=False):
+        """
+        Add an ordering key; earlier keys take precedence. Ties keep id order.
+        """
+        self._check_column(column)
+        return self._replace(ordering=self.ordering + (OrderKey(column, descending),))
+
+    def limit(self, count):
+        return self._replace(limit=count)
+
+    def offset(self, count):
+        return self._replace(offset=count)
+
+    def select(self, *columns):
+        """
+        Restrict the returned columns.
+        """
+        for column in columns:
+            if column not in TASK_COLUMNS:
+                raise ValueError(f"Unknown column '{column}'")
+        return self._replace(columns=columns)
+
+    @staticmethod
+    def _check_column(column):
+        if column not in QUERYABLE_COLUMNS:
+            raise ValueError(f"Unknown column '{column}'. Must be one of: {', '.join(QUERYABLE_COLUMNS)}")
+
+    def __repr__(self):
+        return (f"Query(predicates={list(self.predicates)}, ordering={list(self.ordering)}, "
+                f"limit={self.row_limit}, offset={self.row_offset}, columns={self.columns})")
+
+def execute(query, table):
+    """
+    Run a query against a TaskTable.
+
+    :return: DataFrame of matching tasks
+    """
+    return table.to_frame(positions(query, table), columns=query.columns)
+
+def records(query, table):
+    """
+    Run a query against a TaskTable.
+
+    :return: List of matching tasks as dicts in the CSV text representation
+    """
+    return table.records(positions(query, table), columns=query.columns)
+
+def positions(query, table):
+    """
+    Row positions of the query's result page, in result order.
+    """
+    return _order(query, table, matching_positions(query, table))
+
+def count(query, table):
+    """
+    Number of tasks matching the query's predicates, ignoring paging.
+    """
+    return len(matching_positions(query, table))
+
+def matching_positions(query, table):
+    """
+    Row positions matching all predicates, in id order.
+
+    Predicates on id are answered by binary search over the id-sorted rows and
+    predicates on task_name by the name lookup, so only the rows they select
+    are passed on to the remaining predicates.
+    """
+    positions, remaining = _access_path(query.predicates, table)
+    if METRICS.enabled and remaining:
+        METRICS.add('rows_scanned', len(positions), source='query')
+    for predicate in remaining:
+        if not len(positions):
+            break
+        positions = positions[_evaluate(predicate, table, positions)]
+    return positions
+
+def _access_path(predicates, table):
+    ids = table.frame['id'].to_numpy()
+    low, high = 0, len(ids)
+    selected = None
+    remaining = []
+
+    for predicate in predicates:
+        column, op, value = predicate
+        if column == 'id' and op in ('<', '<=', '>', '>='):
+            side = 'left' if op in ('<', '>=') else 'right'
+            bound = int(np.searchsorted(ids, value, side=side))
+            if op in ('<', '<='):
+                high = min(high, bound)
+            else:
+                low = max(low, bound)
+        elif column in ('id', 'task_name') and op in ('==', 'in'):
+            values = (value,) if op == '==' else value
+            if column == 'task_name':
+                values = [table.id_for(name) for name in values]
+            lookup = np.asarray([v for v in values if v is not None], dtype=np.int64)
+            found = np.searchsorted(ids, lookup)
+            hits = found[(found < len(ids)) & (ids[np.minimum(found, len(ids) - 1)] == lookup)] if len(ids) else found[:0]
+            hits = np.unique(hits)
+            selected = hits if selected is None else np.intersect1d(selected, hits)
+        else:
+            remaining.append(predicate)
+
+    if selected is None:
+        positions = np.arange(low, high)
+    else:
+        positions = selected[(selected >= low) & (selected < high)]
+    return positions, remaining
+
+def _evaluate(predicate, table, positions):
+    """
+    Boolean mask over positions for a single predicate.
+    """
+    column, op, value = predicate
+    series = table.frame[column]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Evaluate against the (few) distinct values, then select by code
+        categories = series.cat.categories
+        matching = np.flatnonzero(_apply(op, np.asarray(categories, dtype=object), value))
+        codes = series.cat.codes.to_numpy()[positions]
+        return np.isin(codes, matching)
+
+    values = series.to_numpy()[positions]
+    if column == 'created_at':
+        value = (tuple(np.datetime64(pd.Timestamp(v)) for v in value) if op == 'in'
+                 else np.datetime64(pd.Timestamp(value)))
+    return _apply(op, values, value)
+
+def _apply(op, values, value):
+    if op in COMPARISONS:
+        return np.asarray(COMPARISONS[op](values, value), dtype=bool)
+    if op == 'in':
+        return np.isin(values, list(value))
+    if op == 'prefix':
+        return np.fromiter((str(v).startswith(value) for v in values), dtype=bool, count=len(values))
+    needle = str(value).lower()
+    return np.fromiter((needle in str(v).lower() for v in values), dtype=bool, count=len(values))
+
+def _sort_key(table, column, positions, descending):
+    series = table.frame[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = np.asarray(series.cat.categories, dtype=object).astype(str)
+        rank = np.empty(len(categories), dtype=np.int64)
+        rank[np.argsort(categories, kind='stable')] = np.arange(len(categories))
+        key = rank[series.cat.codes.to_numpy()[positions]]
+    elif series.dtype == object:
+        _, key = np.unique(series.to_numpy()[positions].astype(str), return_inverse=True)
+    else:
+        key = series.to_numpy()[positions]
+        if np.issubdtype(key.dtype, np.datetime64):
+            key = key.view(np.int64)
+    key = key.astype(np.int64)
+    return -key if descending else key
+
+def _order(query, table, positions):
+    if query.ordering and len(positions):
+        keys = [_sort_key(table, column, positions, descending) for column, descending in query.ordering]
+        wanted = None if query.row_limit is None else query.row_offset + query.row_limit
+
+        if len(keys) == 1 and wanted is not None and wanted < len(positions):
+            # Only the first offset + limit rows are needed: select everything up
+            # to the cut-off value in linear time, then sort just those
+            cutoff = np.partition(keys[0], wanted - 1)[wanted - 1]
+            candidates = np.flatnonzero(keys[0] <= cutoff)
+            order = candidates[np.lexsort((positions[candidates], keys[0][candidates]))][:wanted]
+        else:
+            order = np.lexsort([positions] + keys[::-1])
+        positions = positions[order]
+
+    start = query.row_offset
+    end = None if query.row_limit is None else start + query.row_limit
+    return positions[start:end]
@@ -0,0 +1,157 @@
+from collections import OrderedDict
+import numpy as np
+
+# Cached reachability sets per direction; each costs max_task_id / 8 bytes
+MAX_CACHED_SETS = 1024
+
+class ReachabilityIndex:
+    """
+    Memoized transitive dependency (ancestor) and dependent (descendant)
+    queries over the task DAG, by task id.
+
+    Adjacency is kept in both directions. A query walks the graph once and
+    stores the reachable set as a packed bitset indexed by task id in an
+    LRU cache; repeated queries are a cache hit. A walk that reaches a node
+    with a cached set merges that set instead of expanding the node again.
+
+    Edge changes invalidate only the cached sets they can affect: adding or
+    removing dep -> task changes the ancestors of task and of everything
+    that reaches task, and the descendants of dep and of everything dep is
+    reachable from. Both are checked with one bit test per cached set.
+    """
+    def __init__(self, max_entries=MAX_CACHED_SETS):
+        self.max_entries = max_entries
+        self._dependencies = {}
+        self._dependents = {}
+        self._size = 0
+        self._ancestors = OrderedDict()
+        self._descendants = OrderedDict()
+
+    @classmethod
+    def build(cls, table, max_entries=MAX_CACHED_SETS):
+        """
+        Build the adjacency from a TaskTable's dependency arrays.
+        """
+        index = cls(max_entries)
+        ids = table.frame['id'].to_numpy()
+        if not len(ids):
+            return index
+        index._size = int(ids[-1]) + 1
+
+        counts = np.diff(table.dep_offsets)
+        tasks = np.repeat(ids, counts).tolist()
+        deps = table.dep_ids.tolist()
+        offsets = table.dep_offsets.tolist()
+        for position, task_id in enumerate(ids.tolist()):
+            start, end = offsets[position], offsets[position + 1]
+            if end > start:
+                index._dependencies[task_id] = deps[start:end]
+        for dep, task_id in zip(deps, tasks):
+            index._dependents.setdefault(dep, []).append(task_id)
+        return index
+
+    # --- Queries -----------------------------------------------------------
+
+    def ancestors(self, task_id):
+        """
+        Packed bitset (uint8, little bit order) of the tasks task_id
+        transitively depends on.
+        """
+        return self._reachable(int(task_id), self._dependencies, self._ancestors)
+
+    def descendants(self, task_id):
+        """
+        Packed bitset of the tasks that transitively depend on task_id.
+        """
+        return self._reachable(int(task_id), self._dependents, self._descendants)
+
+    def depends_on(self, task_id, other_id):
+        """
+        Whether task_id transitively depends on other_id.
+        """
+        return self.contains(self.ancestors(task_id), other_id)
+
+    @staticmethod
+    def contains(bits, task_id):
+        byte = task_id >> 3
+        return byte < len(bits) and bool(bits[byte] >> (task_id & 7) & 1)
+
+    @staticmethod
+    def ids(bits):
+        """
+        Task ids in a bitset, ascending.
+        """
+        return np.flatnonzero(np.unpackbits(bits, bitorder='little'))
+
+    def _reachable(self, start, adjacency, cache):
+        bits = cache.get(start)
+        if bits is not None:
+            cache.move_to_end(start)
+            return bits
+
+        visited = bytearray(max(self._size, start + 1))
+        merged = []
+        stack = list(adjacency.get(start, ()))
+        while stack:
+            node = stack.pop()
+            if visited[node]:
+                continue
+            visited[node] = 1
+            known = cache.get(node)
+            if known is not None:
+                merged.append(known)
+            else:
+                stack.extend(adjacency.get(node, ()))
+
+        bits = np.packbits(np.frombuffer(visited, dtype=bool), bitorder='little')
+        for known in merged:
+            bits[:len(known)] |= known[:len(bits)]
+        bits.setflags(write=False)
+
+        cache[start] = bits
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return bits
+
+    # --- Updates -----------------------------------------------------------
+
+    def add_task(self, task_id, dependency_ids=()):
+        task_id = int(task_id)
+        self._size = max(self._size, task_id + 1)
+        for dep in dependency_ids:
+            self.add_edge(dep, task_id)
+
+    def remove_task(self, task_id):
+        task_id = int(task_id)
+        for dep in list(self._dependencies.get(task_id, ())):
+            self.remove_edge(dep, task_id)
+        for dependent in list(self._dependents.get(task_id, ())):
+            self.remove_edge(task_id, dependent)
+        self._ancestors.pop(task_id, None)
+        self._descendants.pop(task_id, None)
+
+    def add_edge(self, dep, task_id):
+        """
+        Record that task_id depends on dep.
+        """
+        dep, task_id = int(dep), int(task_id)
+        self._invalidate(dep, task_id)
+        self._size = max(self._size, dep + 1, task_id + 1)
+        self._dependencies.setdefault(task_id, []).append(dep)
+        self._dependents.setdefault(dep, []).append(task_id)
+
+    def remove_edge(self, dep, task_id):
+        dep, task_id = int(dep), int(task_id)
+        self._invalidate(dep, task_id)
+        for adjacency, key, value in ((self._dependencies, task_id, dep), (self._dependents, dep, task_id)):
+            values = adjacency.get(key)
+            if values and value in values:
+                values.remove(value)
+                if not values:
+                    del adjacency[key]
+
+    def _invalidate(self, dep, task_id):
+        for cache, changed in ((self._ancestors, task_id), (self._descendants, dep)):
+            stale = [node for node, bits in cache.items() if node == changed or self.contains(bits, changed)]
+            for node in stale:
+                del cache[node]
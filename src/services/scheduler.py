@@ -1,45 +1,243 @@
-
+import os
+import json
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Dict
-import pandas as pd
-from models.task import Task, TaskType
+from typing import List, Dict, Optional
+from ..models.recurrence import Recurrence
+from .query import Query
+from ..utils.file_lock import FileLock, atomic_write
+from ..utils.metrics import METRICS, instrumented, timed
+
+# Spacing between the start times offered by get_available_slots, in minutes
+SLOT_INTERVAL = 30
+
+# Days ahead a new recurring booking is checked for conflicts; series can
+# be open-ended, so they are only checked over this horizon
+RECURRENCE_HORIZON_DAYS = 366
 
+@instrumented
 class Scheduler:
-    def __init__(self, task_manager):
+    def __init__(self, task_manager, appointments_file: str = None):
+        """
+        :param task_manager: TaskManager that booked appointments are added to
+        :param appointments_file: JSON file of booked appointments; defaults to
+                                  appointments.json next to the task file
+        """
         self.task_manager = task_manager
+        self.appointments_file = appointments_file or os.path.join(
+            os.path.dirname(os.path.abspath(task_manager.file_name)), "appointments.json")
         self.working_hours = {
             'start': '09:00',
             'end': '17:00',
+            'break_start': '12:00',
             'break_duration': 60  # minutes
         }
 
+        # Booked appointments sorted by start, cached until the file changes.
+        # Recurring ones are kept as one entry with a 'recurrence' and are
+        # expanded per query window; one-offs are found by bisecting _starts
+        self._lock = FileLock(self.appointments_file + ".lock")
+        self._appointments = None
+        self._appointments_signature = None
+        self._one_offs = []
+        self._starts = []
+        self._series = []
+
+        # Changes made inside a TaskManager.batch() are kept in memory and
+        # saved once its tasks are committed; names of the tasks booked since
+        self._unsaved = None
+
+        # Appointments of removed tasks free their slot
+        task_manager.add_listener(self._on_task_event)
+
+    @timed('get_available_slots')
     def get_available_slots(self, date: datetime, duration: int = 60) -> List[datetime]:
         """Get available time slots for a specific date."""
         booked_slots = self.get_booked_slots(date)
-        all_slots = self.generate_day_slots(date)
+        all_slots = self.generate_day_slots(date, duration)
         return [slot for slot in all_slots if not self._is_slot_booked(slot, duration, booked_slots)]
 
-    def book_appointment(self, client: str, start_time: datetime, 
-                       duration: int, service_type: str) -> Task:
-        """Book a new appointment."""
-        if not self._is_slot_available(start_time, duration):
-            raise ValueError("Time slot not available")
-
-        task_data = {
-            "task_name": f"Appointment - {client}",
-            "category": service_type,
-            "priority": 1,
-            "deadline": 0,
-            "task_type": TaskType.APPOINTMENT,
-            "start_time": start_time,
-            "duration": duration,
-            "client": client,
-            "payment_status": "pending"
-        }
-        
-        return self.task_manager.add_task(task_data)
+    def get_booked_slots(self, date: datetime) -> List[Dict]:
+        """Booked appointments starting on the given date, earliest first."""
+        day = datetime(date.year, date.month, date.day)
+        return self.get_appointments(day, day + timedelta(days=1))
+
+    def get_appointments(self, start: datetime, end: datetime) -> List[Dict]:
+        """
+        Appointments starting in [start, end), earliest first.
+
+        Recurring appointments are expanded for that window only. Each
+        occurrence is a copy of its series with the occurrence's start and
+        duration, plus 'occurrence': its original start, which identifies
+        it to cancel_occurrence and reschedule_occurrence.
+        """
+        self._load_appointments()
+        found = self._one_offs[bisect_left(self._starts, start):bisect_left(self._starts, end)]
+        for series in self._series:
+            for original, moved, duration in series['recurrence'].between(series['start'], start, end):
+                found.append(dict(series, start=moved, occurrence=original,
+                                  duration=series['duration'] if duration is None else duration))
+        found.sort(key=lambda booked: booked['start'])
+        return found
+
+    def generate_day_slots(self, date: datetime, duration: int = 60) -> List[datetime]:
+        """Start times within working hours, outside the break, that leave room for duration."""
+        day_start = self._at(date, self.working_hours['start'])
+        day_end = self._at(date, self.working_hours['end'])
+        slots = []
+        slot = day_start
+        while slot + timedelta(minutes=duration) <= day_end:
+            if not self._overlaps_break(slot, duration):
+                slots.append(slot)
+            slot += timedelta(minutes=SLOT_INTERVAL)
+        return slots
+
+    @timed('book_appointment')
+    def book_appointment(self, client: str, start_time: datetime,
+                       duration: int, service_type: str,
+                       recurrence: Optional[Recurrence] = None) -> Dict:
+        """
+        Book a new appointment.
+
+        :param recurrence: Repeat the appointment from start_time by this
+                           rule (a Recurrence, RRULE text or Recurrence.to_dict()
+                           form); the series is one task and one booking, and
+                           its occurrences in the next RECURRENCE_HORIZON_DAYS
+                           must all be free
+        """
+        if recurrence is not None and not isinstance(recurrence, Recurrence):
+            recurrence = Recurrence.from_dict(recurrence)
+        # Always lock the task store before the appointments file, as task
+        # removal (which frees appointments) does
+        with self.task_manager.batch(), self._lock.exclusive():
+            if recurrence is None:
+                if not self._is_slot_available(start_time, duration):
+                    raise ValueError("Time slot not available")
+            else:
+                conflict = self._series_conflict(start_time, duration, recurrence)
+                if conflict is not None:
+                    raise ValueError(f"Time slot not available on {conflict:%Y-%m-%d %H:%M}")
+
+            task_data = {
+                "task_name": f"Appointment - {client} - {start_time:%Y-%m-%d %H:%M}",
+                "category": service_type,
+                "priority": 1,
+                "deadline": 0,
+                "dependencies": ""
+            }
+            task = self.task_manager.add_task(task_data)
+
+            appointment = {
+                "task_id": task['id'],
+                "client": client,
+                "start": start_time,
+                "duration": duration,
+                "service_type": service_type,
+                "payment_status": "pending"
+            }
+            if recurrence is not None:
+                appointment['recurrence'] = recurrence
+            appointments = self._load_appointments() + [appointment]
+            appointments.sort(key=lambda booked: booked['start'])
+            self._stage_appointments(appointments, task['task_name'])
+
+        return dict(task, appointment=self.serialize(appointment))
+
+    @timed('cancel_occurrence')
+    def cancel_occurrence(self, task_id: int, occurrence: datetime) -> Dict:
+        """
+        Cancel one occurrence of a recurring appointment, freeing its slot.
+
+        :param occurrence: Original start of the occurrence
+        :return: The updated series
+        """
+        with self._lock.exclusive():
+            appointments, index = self._find_occurrence(task_id, occurrence)
+            series = appointments[index]
+            series['recurrence'].exceptions.add(occurrence)
+            self._stage_appointments(appointments)
+        return self.serialize(series)
+
+    @timed('reschedule_occurrence')
+    def reschedule_occurrence(self, task_id: int, occurrence: datetime,
+                              start_time: datetime, duration: int = None) -> Dict:
+        """
+        Move one occurrence of a recurring appointment to another slot,
+        leaving the rest of the series as it is.
 
-    def _is_slot_booked(self, slot: datetime, duration: int, 
+        :param occurrence: Original start of the occurrence
+        :param duration: New duration; defaults to the current one
+        :return: The occurrence as rescheduled
+        """
+        with self._lock.exclusive():
+            appointments, index = self._find_occurrence(task_id, occurrence)
+            series = appointments[index]
+            recurrence = series['recurrence']
+            if duration is None:
+                duration = recurrence.overrides.get(occurrence, (None, None))[1] or series['duration']
+            if not self._is_slot_available(start_time, duration, ignore=(task_id, occurrence)):
+                raise ValueError("Time slot not available")
+            recurrence.overrides[occurrence] = (start_time, duration)
+            self._stage_appointments(appointments)
+        return self.serialize(dict(series, start=start_time, duration=duration, occurrence=occurrence))
+
+    def _find_occurrence(self, task_id: int, occurrence: datetime):
+        """
+        The appointments, with the series of task_id replaced by a copy that
+        can be changed without touching the cache, and the series' index.
+        """
+        appointments = self._load_appointments()
+        for index, appointment in enumerate(appointments):
+            if appointment['task_id'] == task_id and appointment.get('recurrence') is not None:
+                break
+        else:
+            raise ValueError(f"No recurring appointment for task {task_id}")
+        recurrence = Recurrence.from_dict(appointment['recurrence'].to_dict())
+        if occurrence in recurrence.exceptions:
+            raise ValueError(f"Occurrence {occurrence:%Y-%m-%d %H:%M} is already cancelled")
+        if not recurrence.is_occurrence(appointment['start'], occurrence):
+            raise ValueError(f"No occurrence starts at {occurrence:%Y-%m-%d %H:%M}")
+        appointments[index] = dict(appointment, recurrence=recurrence)
+        return appointments, index
+
+    def _series_conflict(self, start_time: datetime, duration: int,
+                         recurrence: Recurrence) -> Optional[datetime]:
+        """
+        Start of the first occurrence of a new series within the horizon
+        that falls outside working hours or on a booked slot, if any.
+        """
+        horizon = start_time + timedelta(days=RECURRENCE_HORIZON_DAYS)
+        booked_by_day = {}
+        for booked in self.get_appointments(self._at(start_time, '00:00'), horizon):
+            booked_by_day.setdefault(booked['start'].date(), []).append(booked)
+        for _, occurrence, _ in recurrence.between(start_time, start_time, horizon):
+            if not self._is_slot_available(occurrence, duration, booked_by_day.get(occurrence.date(), [])):
+                return occurrence
+        return None
+
+    def _is_slot_available(self, start_time: datetime, duration: int,
+                           booked_slots: List[Dict] = None, ignore=None) -> bool:
+        """
+        Check a slot lies within working hours, outside the break and is not booked.
+
+        :param booked_slots: Bookings on that day, if already known
+        :param ignore: (task_id, occurrence) of a recurring occurrence being
+                       moved, which doesn't conflict with itself
+        """
+        if start_time < self._at(start_time, self.working_hours['start']):
+            return False
+        if start_time + timedelta(minutes=duration) > self._at(start_time, self.working_hours['end']):
+            return False
+        if self._overlaps_break(start_time, duration):
+            return False
+        if booked_slots is None:
+            booked_slots = self.get_booked_slots(start_time)
+        if ignore is not None:
+            booked_slots = [booked for booked in booked_slots
+                            if (booked['task_id'], booked.get('occurrence')) != ignore]
+        return not self._is_slot_booked(start_time, duration, booked_slots)
+
+    def _is_slot_booked(self, slot: datetime, duration: int,
                        booked_slots: List[Dict]) -> bool:
         """Check if a time slot is already booked."""
         slot_end = slot + timedelta(minutes=duration)
@@ -47,4 +245,116 @@ class Scheduler:
             booked_end = booked['start'] + timedelta(minutes=booked['duration'])
             if (slot < booked_end and slot_end > booked['start']):
                 return True
-        return False
\ No newline at end of file
+        return False
+
+    def _overlaps_break(self, slot: datetime, duration: int) -> bool:
+        break_start = self._at(slot, self.working_hours['break_start'])
+        break_end = break_start + timedelta(minutes=self.working_hours['break_duration'])
+        return slot < break_end and slot + timedelta(minutes=duration) > break_start
+
+    @staticmethod
+    def _at(date: datetime, clock: str) -> datetime:
+        """The given date at an 'HH:MM' time of day."""
+        hours, minutes = map(int, clock.split(':'))
+        return datetime(date.year, date.month, date.day, hours, minutes)
+
+    def _load_appointments(self) -> List[Dict]:
+        try:
+            stat = os.stat(self.appointments_file)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        if self._appointments is None or signature != self._appointments_signature:
+            appointments = []
+            if signature is not None:
+                with self._lock.shared():
+                    with open(self.appointments_file) as f:
+                        appointments = json.load(f).get('appointments', [])
+                if METRICS.enabled:
+                    METRICS.add('bytes_read', signature[2], file=os.path.basename(self.appointments_file))
+            for appointment in appointments:
+                appointment['start'] = datetime.fromisoformat(appointment['start'])
+                if appointment.get('recurrence') is not None:
+                    appointment['recurrence'] = Recurrence.from_dict(appointment['recurrence'])
+            self._set_appointments(sorted(appointments, key=lambda booked: booked['start']))
+            self._appointments_signature = signature
+        return list(self._appointments)
+
+    def _set_appointments(self, appointments: List[Dict]):
+        self._appointments = appointments
+        self._one_offs = [a for a in appointments if a.get('recurrence') is None]
+        self._starts = [a['start'] for a in self._one_offs]
+        self._series = [a for a in appointments if a.get('recurrence') is not None]
+
+    def _save_appointments(self, appointments: List[Dict]):
+        with self._lock.exclusive():
+            with atomic_write(self.appointments_file) as f:
+                json.dump({'appointments': [self.serialize(a) for a in appointments]}, f)
+                if METRICS.enabled:
+                    METRICS.add('bytes_written', f.tell(), file=os.path.basename(self.appointments_file))
+            stat = os.stat(self.appointments_file)
+            self._set_appointments(appointments)
+            self._appointments_signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def serialize(appointment: Dict) -> Dict:
+        """
+        JSON-friendly copy of an appointment or occurrence: datetimes as ISO
+        text and the recurrence in its Recurrence.to_dict() form.
+        """
+        serialized = dict(appointment, start=appointment['start'].isoformat())
+        if appointment.get('recurrence') is not None:
+            serialized['recurrence'] = appointment['recurrence'].to_dict()
+        if appointment.get('occurrence') is not None:
+            serialized['occurrence'] = appointment['occurrence'].isoformat()
+        return serialized
+
+    def _stage_appointments(self, appointments: List[Dict], booked_task: str = None):
+        """
+        Make appointments current and save them once the task store has
+        committed, so appointments.json never refers to tasks that a failed
+        batch didn't write. Until then they are only in the cache.
+
+        :param booked_task: Name of a task added for a new booking; it is
+                            removed again if the appointments can't be saved
+        """
+        self._set_appointments(appointments)
+        if self._unsaved is None:
+            self._unsaved = []
+            self.task_manager.after_commit(self._save_staged, self._drop_staged)
+        if booked_task is not None:
+            self._unsaved.append(booked_task)
+
+    def _save_staged(self):
+        booked_tasks, self._unsaved = self._unsaved, None
+        try:
+            self._save_appointments(self._appointments)
+        except Exception:
+            self._appointments = None
+            for name in booked_tasks:
+                self.task_manager.remove_task(name)
+            raise
+
+    def _drop_staged(self):
+        # The batch wasn't written; reload the appointments from the file
+        self._unsaved = None
+        self._appointments = None
+
+    def _on_task_event(self, event, task):
+        if event == 'removed':
+            appointments = self._load_appointments()
+            remaining = [a for a in appointments if a['task_id'] != task['id']]
+        elif event == 'reloaded':
+            # Many external changes at once; keep only appointments whose
+            # task is still in the store
+            appointments = self._load_appointments()
+            if not appointments:
+                return
+            query = Query().where('id', 'in', {a['task_id'] for a in appointments}).select('id')
+            existing = {record['id'] for record in self.task_manager.query_records(query)}
+            remaining = [a for a in appointments if a['task_id'] in existing]
+        else:
+            return
+        if len(remaining) != len(appointments):
+            self._stage_appointments(remaining)
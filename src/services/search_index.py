@@ -0,0 +1,186 @@
+import bisect
+import re
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Score contributions per field for prefix token matches
+FIELD_WEIGHTS = {'task_name': 2.0, 'category': 1.0}
+EXACT_BONUS = 1.0
+
+# Fuzzy matching: query tokens shorter than this are not expanded, and
+# vocabulary tokens need at least this trigram similarity to match
+MIN_FUZZY_LENGTH = 4
+MIN_SIMILARITY = 0.4
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """
+    In-process inverted index over task names and categories.
+
+    Keeps token postings per field with a sorted vocabulary for prefix
+    lookups. A trigram index over the vocabulary (not the documents) lets a
+    misspelled query token be expanded to similar tokens cheaply. Documents
+    are added and removed one at a time, so the index can be maintained
+    alongside add_task and remove_task.
+    """
+    def __init__(self):
+        self._postings = {field: defaultdict(set) for field in FIELD_WEIGHTS}
+        self._vocabulary = []
+        self._token_refs = defaultdict(int)
+        self._token_trigrams = defaultdict(set)
+        self._documents = {}
+        self._bulk = False
+
+    @classmethod
+    def build(cls, documents):
+        """
+        Build an index from (task_id, task_name, category) tuples.
+        """
+        index = cls()
+        index._bulk = True
+        for task_id, name, category in documents:
+            index.add(task_id, name, category)
+        index._bulk = False
+        index._vocabulary = sorted(index._token_refs)
+        return index
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, task_id, name, category):
+        task_id = int(task_id)
+        if task_id in self._documents:
+            self.remove(task_id)
+
+        fields = {'task_name': str(name), 'category': str(category)}
+        self._documents[task_id] = fields
+        for field, text in fields.items():
+            postings = self._postings[field]
+            for token in set(tokenize(text)):
+                ids = postings[token]
+                if not ids:
+                    self._add_token(token)
+                ids.add(task_id)
+
+    def remove(self, task_id):
+        task_id = int(task_id)
+        fields = self._documents.pop(task_id, None)
+        if fields is None:
+            return
+
+        for field, text in fields.items():
+            postings = self._postings[field]
+            for token in set(tokenize(text)):
+                ids = postings.get(token)
+                if ids is None:
+                    continue
+                ids.discard(task_id)
+                if not ids:
+                    del postings[token]
+                    self._remove_token(token)
+
+    def _add_token(self, token):
+        """
+        Count a token appearing in one more field's postings.
+        """
+        self._token_refs[token] += 1
+        if self._token_refs[token] == 1:
+            if not self._bulk:
+                bisect.insort(self._vocabulary, token)
+            for gram in trigrams(token):
+                self._token_trigrams[gram].add(token)
+
+    def _remove_token(self, token):
+        self._token_refs[token] -= 1
+        if self._token_refs[token] == 0:
+            del self._token_refs[token]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            for gram in trigrams(token):
+                tokens = self._token_trigrams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._token_trigrams[gram]
+
+    def _prefix_tokens(self, prefix):
+        """
+        Vocabulary tokens starting with prefix, with a score factor.
+        """
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token, 1.0 + (EXACT_BONUS if token == prefix else 0.0)
+
+    def _similar_tokens(self, token):
+        """
+        Vocabulary tokens with similar trigrams, with their similarity.
+        """
+        query = trigrams(token)
+        candidates = set()
+        for gram in query:
+            candidates |= self._token_trigrams.get(gram, set())
+
+        for candidate in candidates:
+            grams = trigrams(candidate)
+            overlap = len(query & grams)
+            similarity = overlap / (len(query) + len(grams) - overlap)
+            if similarity >= MIN_SIMILARITY:
+                yield candidate, similarity
+
+    def _token_scores(self, matches):
+        scores = {}
+        for token, factor in matches:
+            for field, weight in FIELD_WEIGHTS.items():
+                ids = self._postings[field].get(token)
+                if not ids:
+                    continue
+                score = weight * factor
+                for task_id in ids:
+                    if scores.get(task_id, 0.0) < score:
+                        scores[task_id] = score
+        return scores
+
+    def search(self, text, limit=20, fuzzy=True):
+        """
+        Ranked search over task names and categories.
+
+        Every query token must match the start of a token in the name or
+        category. With fuzzy set, a query token of at least MIN_FUZZY_LENGTH
+        characters that prefixes nothing is matched against similarly
+        spelled tokens instead, scoring lower. Shorter tokens are never
+        expanded, so a misspelled word of 2 or 3 letters matches nothing: it
+        has too few trigrams to tell a typo from an unrelated word.
+        Matches in the name rank above matches in the category, and exact
+        token matches above prefix matches.
+
+        :param limit: Maximum number of results, or None for all
+        :return: List of (task_id, score) pairs, best first
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+
+        scores = None
+        for token in tokens:
+            token_scores = self._token_scores(self._prefix_tokens(token))
+            if not token_scores and fuzzy and len(token) >= MIN_FUZZY_LENGTH:
+                token_scores = self._token_scores(self._similar_tokens(token))
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {task_id: scores[task_id] + score
+                          for task_id, score in token_scores.items() if task_id in scores}
+            if not scores:
+                return []
+
+        results = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return results if limit is None else results[:limit]
@@ -0,0 +1,65 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from ..utils.graph_utils import draw_graph
+
+class DependencyView(tk.Toplevel):
+    """
+    Non-blocking window showing the dependency neighborhood of one task.
+
+    The subgraph and its layout are computed on the background worker and
+    drawn into an embedded matplotlib canvas.
+    """
+    def __init__(self, parent, task_manager, worker, task_name, hops=2):
+        super().__init__(parent)
+        self.title(f"Dependencies - {task_name}")
+        self.geometry("800x600")
+
+        self.task_manager = task_manager
+        self.worker = worker
+        self.task_name = task_name
+
+        self._create_widgets(hops)
+        self._load()
+
+    def _create_widgets(self, hops):
+        controls = ttk.Frame(self, padding="10")
+        controls.pack(fill=tk.X)
+
+        ttk.Label(controls, text="Levels:").pack(side=tk.LEFT, padx=5)
+        self.hops_var = tk.StringVar(value=str(hops))
+        ttk.Spinbox(
+            controls, from_=1, to=10, width=5,
+            textvariable=self.hops_var,
+            command=self._load
+        ).pack(side=tk.LEFT)
+
+        self.figure = Figure(figsize=(8, 6))
+        self.axes = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def _load(self):
+        try:
+            hops = int(self.hops_var.get())
+        except ValueError:
+            return
+
+        self.worker.submit(
+            self.task_manager.get_dependency_neighborhood, self.task_name, hops,
+            on_success=self._render,
+            on_error=lambda e: messagebox.showerror("Error", f"Error loading dependencies: {e}", parent=self),
+            key=f"dependencies:{id(self)}",
+            action="visualize"
+        )
+
+    def _render(self, neighborhood):
+        if not self.winfo_exists():
+            return
+
+        graph, pos = neighborhood
+        self.axes.clear()
+        draw_graph(graph, pos, self.axes, highlight=self.task_name)
+        self.axes.set_title(f"Dependencies of {self.task_name}")
+        self.canvas.draw_idle()
@@ -1,9 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 from .task_dialog import TaskDialog
 from .status_dialog import StatusDialog
 from .style import apply_style, ThemeManager, THEMES
+from .worker import BackgroundWorker
+from .task_list_model import TaskListModel
+from ..services.filter_engine import FilterEngine
+
+# Delay between the last filter keystroke and re-filtering the list
+FILTER_DEBOUNCE_MS = 250
+
+# Tasks shown from the lightweight reader before the full load finishes
+FIRST_PAGE_SIZE = 100
+
+# How often the overdue / due-soon counts follow the clock
+DEADLINE_REFRESH_MS = 60 * 1000
+
+# How often to check for changes made by other processes, e.g. the CLI
+STORE_POLL_MS = 2000
 
 class MainWindow(tk.Tk):
     def __init__(self, task_manager):
@@ -15,13 +29,33 @@ class MainWindow(tk.Tk):
         # Initialize theme manager
         self.theme_manager = ThemeManager(self)
         self.style, self.colors = self.theme_manager.apply_theme()
+
+        # All loaded tasks, and the filtered rows currently shown in the list
+        self.filter_engine = FilterEngine()
+        self.task_model = TaskListModel()
+        self._filter_job = None
+        self._deadline_job = None
+        # Ids matching the search box, or None when it is empty
+        self._search_text = ""
+        self._search_ids = None
+
+        # Run task store I/O off the UI thread
+        self.worker = BackgroundWorker(self)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self._create_widgets()
         
         # Set initial theme
         self._change_theme()
 
+        # Apply task changes incrementally instead of rebuilding the list
+        self.task_manager.add_listener(self._on_task_event)
+        self.after(STORE_POLL_MS, self._poll_store)
+
     def _create_widgets(self):
+        # Status bar with progress indicator for background work
+        self._create_status_bar(self)
+
         # Create main container with padding
         self.main_container = ttk.Frame(self, padding="10")
         self.main_container.pack(fill=tk.BOTH, expand=True)
@@ -41,9 +75,66 @@ class MainWindow(tk.Tk):
         # Create widgets in right pane
         self._create_task_details(self.right_pane)
 
-        # Initial refresh
+        # Show the first page straight from the CSV, then load everything
+        # in the background
+        self._show_first_page()
         self._refresh_task_list()
 
+    def _create_status_bar(self, parent):
+        status_bar = ttk.Frame(parent, padding=(10, 0, 10, 5))
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.status_text = tk.StringVar(value="Ready")
+        ttk.Label(status_bar, textvariable=self.status_text).pack(side=tk.LEFT)
+
+        self.progress = ttk.Progressbar(status_bar, mode="indeterminate", length=150)
+        self.progress.pack(side=tk.RIGHT)
+
+        self.deadline_text = tk.StringVar()
+        ttk.Label(status_bar, textvariable=self.deadline_text).pack(side=tk.RIGHT, padx=10)
+
+        self.worker.add_busy_listener(self._on_busy_changed)
+
+    def _on_busy_changed(self, pending):
+        if pending > 0:
+            self.status_text.set("Working...")
+            self.progress.start(10)
+        else:
+            self.status_text.set("Ready")
+            self.progress.stop()
+
+    def _refresh_deadline_summary(self):
+        """
+        Update the overdue / due-soon counts; cheap, so it also runs on a timer
+        to follow the clock
+        """
+        if self._deadline_job is not None:
+            self.after_cancel(self._deadline_job)
+        self._deadline_job = self.after(DEADLINE_REFRESH_MS, self._refresh_deadline_summary)
+
+        self.worker.submit(
+            self.task_manager.get_deadline_summary,
+            on_success=lambda summary: self.deadline_text.set(
+                f"Overdue: {summary['overdue']}   Due today: {summary['due_today']}   "
+                f"Due this week: {summary['due_within']}"),
+            on_error=lambda e: self.deadline_text.set(""),
+            key="deadlines"
+        )
+
+    def _poll_store(self):
+        """
+        Pick up edits other processes made to the task files; the changed
+        tasks arrive as regular task events
+        """
+        if self.task_manager.files_changed():
+            self.worker.submit(self.task_manager.refresh, key="refresh")
+        self.after(STORE_POLL_MS, self._poll_store)
+
+    def _on_close(self):
+        self.task_manager.remove_listener(self._on_task_event)
+        self.worker.shutdown()
+        self.destroy()
+
     def _create_toolbar(self, parent):
         toolbar = ttk.Frame(parent)
         toolbar.pack(fill=tk.X, pady=(0, 10))
@@ -97,10 +188,6 @@ class MainWindow(tk.Tk):
         for widget in self.winfo_children():
             if isinstance(widget, ttk.Frame):
                 widget.configure(style='TFrame')
-        
-        # Refresh the task list to apply new styles
-        if hasattr(self, 'tree'):
-            self._refresh_task_list()
 
     def _create_filter_frame(self, parent):
         filter_frame = ttk.LabelFrame(parent, text="Filters", padding="10")
@@ -142,6 +229,64 @@ class MainWindow(tk.Tk):
             command=self._apply_filters
         ).grid(row=0, column=6, padx=5)
 
+        # Full-text search over names and categories
+        ttk.Label(filters_grid, text="Search:").grid(row=1, column=0, padx=5, pady=(5, 0))
+        self.search_var = tk.StringVar()
+        ttk.Entry(filters_grid, textvariable=self.search_var).grid(
+            row=1, column=1, columnspan=5, sticky="ew", padx=5, pady=(5, 0))
+
+        # Filter as the user types, once typing pauses
+        for var in (self.category_var, self.priority_var, self.status_var, self.search_var):
+            var.trace_add('write', self._schedule_filter)
+
+    def _schedule_filter(self, *args):
+        """
+        Debounce live filtering so it runs once after the last keystroke
+        """
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DEBOUNCE_MS, self._apply_live_filters)
+
+    def _apply_live_filters(self):
+        self._filter_job = None
+        try:
+            priority = int(self.priority_var.get() or 0)
+        except ValueError:
+            return
+        if not 0 <= priority <= 100:
+            return
+
+        text = self.search_var.get().strip()
+        if text != self._search_text:
+            self._run_search(text)
+        else:
+            self._show_filtered()
+
+    def _run_search(self, text):
+        """
+        Look up the tasks matching the search text in the background, then
+        show the filtered list
+        """
+        if not text:
+            self._search_text = ""
+            self._search_ids = None
+            self._show_filtered()
+            return
+
+        def show_results(task_ids):
+            self._search_text = text
+            self._search_ids = frozenset(task_ids)
+            self._show_filtered()
+
+        self.worker.submit(
+            self.task_manager.search_task_ids,
+            text,
+            on_success=show_results,
+            on_error=lambda e: messagebox.showerror("Search Error", f"Error searching tasks: {e}"),
+            key="search",
+            action="search"
+        )
+
     def _create_task_list(self, parent):
         # Task list container
         list_frame = ttk.LabelFrame(parent, text="Tasks", padding="10")
@@ -210,39 +355,151 @@ class MainWindow(tk.Tk):
                 self.priority_var.set("0")
                 return
 
-            # Refresh the task list with current filters
-            self._refresh_task_list()
+            # Show the tasks matching the current filters and search text
+            self._run_search(self.search_var.get().strip())
             
         except Exception as e:
             messagebox.showerror("Filter Error", f"Error applying filters: {e}")
 
+    def _current_filters(self):
+        return {
+            'category': self.category_var.get(),
+            'min_priority': int(self.priority_var.get() or 0),
+            'status': self.status_var.get(),
+            'search': self._search_ids
+        }
+
+    @staticmethod
+    def _task_values(task):
+        return (
+            task['id'],
+            task['task_name'],
+            task['category'],
+            task['priority'],
+            f"{task['deadline']} days",
+            task['status']
+        )
+
     def _refresh_task_list(self):
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Load all tasks in the background; a newer refresh supersedes this one.
+        # Filtering then happens in memory.
+        self.worker.submit(
+            self.task_manager.get_tasks,
+            on_success=self._populate_task_list,
+            on_error=lambda e: messagebox.showerror("Error", f"Error loading tasks: {e}"),
+            key="load",
+            action="refresh"
+        )
 
+    def _show_first_page(self):
         try:
-            # Get filtered tasks
-            filters = {
-                'category': self.category_var.get(),
-                'min_priority': int(self.priority_var.get() or 0),
-                'status': self.status_var.get()
-            }
-            df = self.task_manager.get_tasks(filters)
-
-            # Insert tasks into tree
-            for _, task in df.iterrows():
-                self.tree.insert("", tk.END, values=(
-                    task['id'],
-                    task['task_name'],
-                    task['category'],
-                    task['priority'],
-                    f"{task['deadline']} days",
-                    task['status']
-                ))
+            self._populate_rows(self.task_manager.peek_tasks(FIRST_PAGE_SIZE))
+        except (OSError, ValueError, KeyError):
+            # The full load reports any problem with the task file
+            pass
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Error loading tasks: {e}")
+    def _populate_task_list(self, df):
+        self._populate_rows(df.to_dict('records'))
+        self._refresh_deadline_summary()
+
+    def _populate_rows(self, tasks):
+        self.filter_engine.load(tasks)
+        self._show_filtered(rebuild=True)
+
+    def _show_filtered(self, rebuild=False):
+        """
+        Show the loaded tasks matching the current filters.
+
+        When the new result is a subset of what is shown, only the rows that
+        no longer match are removed from the tree.
+        """
+        try:
+            filters = self._current_filters()
+        except ValueError:
+            return
+        visible = self.filter_engine.apply(filters)
+
+        if not rebuild and len(visible) <= len(self.task_model) and all(i in self.task_model for i in visible):
+            keep = set(visible)
+            hidden = [task_id for task_id in self.task_model.order if task_id not in keep]
+            for task_id in hidden:
+                self.task_model.remove(task_id)
+            if hidden:
+                self.tree.delete(*[str(task_id) for task_id in hidden])
+            return
+
+        # Clear existing items
+        self.tree.delete(*self.tree.get_children())
+
+        # Insert tasks into tree in the current sort order, keyed by task id
+        rows = self.filter_engine.rows
+        order = self.task_model.load([rows[task_id] for task_id in visible])
+        for task_id in order:
+            self.tree.insert("", tk.END, iid=str(task_id), values=self._task_values(rows[task_id]))
+
+    def _sort_tasks(self, column):
+        """
+        Sort the task list by a column, toggling direction on repeated clicks
+        """
+        reverse = (not self.task_model.sort_reverse
+                   if column == self.task_model.sort_column else False)
+        order = self.task_model.sort(column, reverse)
+
+        # Reorder all rows with a single Tk call
+        self.tree.set_children("", *[str(task_id) for task_id in order])
+        self._update_sort_headings()
+
+    def _update_sort_headings(self):
+        for col in self.tree['columns']:
+            text = col
+            if col == self.task_model.sort_column:
+                text += " \u25bc" if self.task_model.sort_reverse else " \u25b2"
+            self.tree.heading(col, text=text)
+
+    def _on_task_event(self, event, task):
+        # Events fire on the worker thread; handle them on the UI thread
+        self.worker.call_soon(self._on_task_changed, event, task)
+
+    def _on_task_changed(self, event, task):
+        """
+        Apply a single task change event to the tree without rebuilding it
+        """
+        if event == 'reloaded':
+            self._refresh_task_list()
+            return
+
+        iid = str(task['id'])
+        self._refresh_deadline_summary()
+
+        if event == 'added' and self._search_text:
+            # The new task may match the search; re-run it to find out
+            self.filter_engine.upsert(task)
+            self._run_search(self._search_text)
+            return
+
+        if event == 'removed':
+            self.filter_engine.remove(task['id'])
+            visible = False
+        else:
+            self.filter_engine.upsert(task)
+            try:
+                visible = self.filter_engine.matches(task['id'], self._current_filters())
+            except ValueError:
+                visible = True
+
+        if not visible:
+            if self.task_model.remove(task['id']):
+                self.tree.delete(iid)
+            return
+
+        index = self.task_model.upsert(task)
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self._task_values(task))
+            self.tree.move(iid, "", index)
+            if iid in self.tree.selection():
+                self._show_task_details(task)
+        else:
+            self.tree.insert("", index, iid=iid, values=self._task_values(task))
 
     def _on_task_select(self, event):
         selected_items = self.tree.selection()
@@ -251,33 +508,38 @@ class MainWindow(tk.Tk):
 
         # Get selected task details
         task_name = self.tree.item(selected_items[0])['values'][1]
-        task = self.task_manager.get_task_by_name(task_name)
+        self.worker.submit(
+            self.task_manager.get_task_by_name, str(task_name),
+            on_success=lambda task: self._show_task_details(task) if task is not None else None,
+            on_error=lambda e: messagebox.showerror("Error", f"Error loading task: {e}"),
+            key="details"
+        )
+
+    def _show_task_details(self, task):
+        # Update details view
+        self.details_text.config(state=tk.NORMAL)
+        self.details_text.delete(1.0, tk.END)
         
-        if task is not None:
-            # Update details view
-            self.details_text.config(state=tk.NORMAL)
-            self.details_text.delete(1.0, tk.END)
-            
-            details = f"""Task Name: {task['task_name']}
+        details = f"""Task Name: {task['task_name']}
 Category: {task['category']}
 Priority: {task['priority']}
 Deadline: {task['deadline']} days
 Status: {task['status']}
 Dependencies: {task['dependencies']}
 Created: {task['created_at']}"""
-            
-            self.details_text.insert(tk.END, details)
-            self.details_text.config(state=tk.DISABLED)
+        
+        self.details_text.insert(tk.END, details)
+        self.details_text.config(state=tk.DISABLED)
 
     def _add_task(self):
         dialog = TaskDialog(self)
         if dialog.result:
-            try:
-                self.task_manager.add_task(dialog.result)
-                self._refresh_task_list()
-                messagebox.showinfo("Success", "Task added successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error adding task: {e}")
+            self.worker.submit(
+                self.task_manager.add_task, dialog.result,
+                on_success=lambda _: messagebox.showinfo("Success", "Task added successfully!"),
+                on_error=lambda e: messagebox.showerror("Error", f"Error adding task: {e}"),
+                action="add"
+            )
 
     def _remove_task(self):
         selected_item = self.tree.selection()
@@ -287,12 +549,12 @@ Created: {task['created_at']}"""
 
         task_name = self.tree.item(selected_item)['values'][1]  # Get task name from selected row
         if messagebox.askyesno("Confirm", f"Are you sure you want to remove task '{task_name}'?"):
-            try:
-                self.task_manager.remove_task(task_name)
-                self._refresh_task_list()
-                messagebox.showinfo("Success", "Task removed successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error removing task: {e}")
+            self.worker.submit(
+                self.task_manager.remove_task, str(task_name),
+                on_success=lambda _: messagebox.showinfo("Success", "Task removed successfully!"),
+                on_error=lambda e: messagebox.showerror("Error", f"Error removing task: {e}"),
+                action="remove"
+            )
 
     def _update_task_status(self):
         selected_item = self.tree.selection()
@@ -303,30 +565,60 @@ Created: {task['created_at']}"""
         task_name = self.tree.item(selected_item)['values'][1]
         status_dialog = StatusDialog(self, task_name)
         if status_dialog.result:
-            try:
-                self.task_manager.update_task_status(task_name, status_dialog.result)
-                self._refresh_task_list()
-                messagebox.showinfo("Success", "Task status updated successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error updating task status: {e}")
+            self.worker.submit(
+                self.task_manager.update_task_status, str(task_name), status_dialog.result,
+                on_success=lambda _: messagebox.showinfo("Success", "Task status updated successfully!"),
+                on_error=lambda e: messagebox.showerror("Error", f"Error updating task status: {e}"),
+                action="status"
+            )
 
     def _view_dependencies(self):
-        self.task_manager.visualize_dependencies()
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Warning", "Please select a task to view its dependencies.")
+            return
+
+        from .dependency_view import DependencyView
+
+        task_name = self.tree.item(selected_item)['values'][1]
+        DependencyView(self, self.task_manager, self.worker, str(task_name))
 
     def _export_tasks(self):
         """
-        Export tasks to a CSV file using file dialog
+        Export tasks to a CSV, NDJSON, Parquet or Arrow file using file dialog
         """
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                filetypes=[
+                    ("CSV files", "*.csv"),
+                    ("NDJSON files", "*.ndjson"),
+                    ("Parquet files", "*.parquet"),
+                    ("Arrow files", "*.arrow"),
+                    ("All files", "*.*")
+                ],
                 title="Export Tasks"
             )
             if filename:
-                # Get all tasks without filters
-                df = pd.read_csv(self.task_manager.file_name)
-                df.to_csv(filename, index=False)
-                messagebox.showinfo("Success", f"Tasks exported successfully to {filename}")
+                self.worker.submit(
+                    self._write_export, filename,
+                    on_success=lambda _: messagebox.showinfo("Success", f"Tasks exported successfully to {filename}"),
+                    on_error=lambda e: messagebox.showerror("Error", f"Error exporting tasks: {e}"),
+                    action="export"
+                )
         except Exception as e:
             messagebox.showerror("Error", f"Error exporting tasks: {e}")
+
+    def _write_export(self, filename):
+        # Runs on the worker thread; progress is posted back to the main loop
+        # once per percent so large exports don't flood it
+        reported = [-1]
+
+        def progress(done, total):
+            percent = done * 100 // total if total else 100
+            if percent != reported[0]:
+                reported[0] = percent
+                self.worker.call_soon(self.status_text.set, f"Exporting... {percent}%")
+
+        # Get all tasks without filters
+        self.task_manager.export(filename, progress=progress)
@@ -0,0 +1,125 @@
+import bisect
+
+STATUS_ORDER = {"Not Started": 0, "In Progress": 1, "Completed": 2}
+
+# Typed sort key for each Treeview column
+SORT_KEYS = {
+    "ID": lambda task: int(task['id']),
+    "Task Name": lambda task: str(task['task_name']).casefold(),
+    "Category": lambda task: str(task['category']).casefold(),
+    "Priority": lambda task: int(task['priority']),
+    "Deadline": lambda task: int(task['deadline']),
+    "Status": lambda task: STATUS_ORDER.get(task['status'], len(STATUS_ORDER))
+}
+
+class TaskListModel:
+    """
+    In-memory rows behind the task Treeview, keyed by task id.
+
+    Sort keys are computed once per row and column and kept until the row
+    changes, and full sort permutations are cached per (column, direction)
+    until any row changes, so re-sorting never reads values back from Tk.
+    """
+    def __init__(self):
+        self.rows = {}
+        self.order = []
+        self.sort_column = "ID"
+        self.sort_reverse = False
+        self._keys = {column: {} for column in SORT_KEYS}
+        self._sort_cache = {}
+
+    def load(self, tasks):
+        """
+        Replace all rows and return the ids in display order.
+        """
+        self.rows = {int(task['id']): task for task in tasks}
+        self._keys = {column: {} for column in SORT_KEYS}
+        self._sort_cache = {}
+        self.order = self._sorted_ids(self.sort_column, self.sort_reverse)
+        return self.order
+
+    def sort(self, column, reverse):
+        """
+        Set the sort order and return the ids in the new display order.
+        """
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self.order = self._sorted_ids(column, reverse)
+        return self.order
+
+    def upsert(self, task):
+        """
+        Insert or replace a row.
+
+        :return: Position of the row in the display order
+        """
+        task_id = int(task['id'])
+        if task_id in self.rows:
+            self.order.remove(task_id)
+        self._invalidate(task_id)
+        self.rows[task_id] = task
+
+        key = self._key(self.sort_column)
+        if self.sort_reverse:
+            index = bisect.bisect_left(self.order, 0, key=lambda i: self._rank(i, key, task_id))
+        else:
+            index = bisect.bisect_left(self.order, key(task_id), key=key)
+        self.order.insert(index, task_id)
+        return index
+
+    def remove(self, task_id):
+        """
+        Remove a row if present.
+
+        :return: True if the row was present
+        """
+        task_id = int(task_id)
+        if task_id not in self.rows:
+            return False
+        del self.rows[task_id]
+        self.order.remove(task_id)
+        self._invalidate(task_id)
+        return True
+
+    def __contains__(self, task_id):
+        return int(task_id) in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _invalidate(self, task_id):
+        for keys in self._keys.values():
+            keys.pop(task_id, None)
+        self._sort_cache = {}
+
+    def _key(self, column):
+        """
+        Cached (value, id) sort key lookup for a column.
+        """
+        keys = self._keys[column]
+        extract = SORT_KEYS[column]
+        rows = self.rows
+
+        def key(task_id):
+            value = keys.get(task_id)
+            if value is None:
+                value = keys[task_id] = (extract(rows[task_id]), task_id)
+            return value
+        return key
+
+    @staticmethod
+    def _rank(task_id, key, new_id):
+        # Position test for bisecting a descending list: rows ordered before
+        # the new row compare as -1, the rest as 0
+        return -1 if key(task_id) > key(new_id) else 0
+
+    def _sorted_ids(self, column, reverse):
+        cached = self._sort_cache.get((column, reverse))
+        if cached is None:
+            opposite = self._sort_cache.get((column, not reverse))
+            if opposite is not None:
+                cached = opposite[::-1]
+            else:
+                cached = sorted(self.rows, key=self._key(column), reverse=reverse)
+            self._sort_cache[(column, reverse)] = cached
+        return list(cached)
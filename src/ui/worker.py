@@ -0,0 +1,115 @@
+import queue
+from ..utils import profiling
+from concurrent.futures import ThreadPoolExecutor
+
+class BackgroundWorker:
+    """
+    Run TaskManager calls off the Tk main loop and deliver their results back on it.
+
+    Store operations execute one at a time on a single background thread, so the
+    TaskManager never sees concurrent calls. Completed results are queued and
+    dispatched from the Tk event loop with after(), which keeps every widget
+    access on the main thread.
+    """
+    def __init__(self, root, poll_interval=50):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store")
+        self._results = queue.Queue()
+        self._generations = {}
+        self._futures = {}
+        self._pending = 0
+        self._busy_listeners = []
+        self._closed = False
+        self.root.after(self.poll_interval, self._poll)
+
+    def submit(self, func, *args, on_success=None, on_error=None, key=None, action=None):
+        """
+        Schedule func(*args) on the background thread.
+
+        :param on_success: Called on the main thread with the return value
+        :param on_error: Called on the main thread with the raised exception
+        :param key: Optional name for a stream of requests; submitting again with
+                    the same key cancels the previous request if it has not
+                    started yet and discards its result if it has
+        :param action: Optional name the work and its callbacks are reported
+                       under when profiling ("<action>" and "<action>:ui")
+        """
+        if self._closed:
+            return None
+
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None and previous.cancel():
+                self._set_pending(self._pending - 1)
+
+        self._set_pending(self._pending + 1)
+        future = self._executor.submit(self._run, func, args, key, generation, on_success, on_error, action)
+        if key is not None:
+            self._futures[key] = future
+        return future
+
+    def call_soon(self, callback, *args):
+        """
+        Run callback(*args) on the main thread. Safe to call from any thread.
+        """
+        self._results.put((callback, args, None, None, False, None))
+
+    def add_busy_listener(self, callback):
+        """
+        Register callback(pending) invoked whenever the number of queued or
+        running requests changes.
+        """
+        self._busy_listeners.append(callback)
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def shutdown(self):
+        """
+        Stop accepting work and drop anything that has not started yet.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, func, args, key, generation, on_success, on_error, action):
+        try:
+            with profiling.action(action):
+                result = func(*args)
+        except Exception as e:
+            self._results.put((on_error, (e,), key, generation, True, action))
+        else:
+            self._results.put((on_success, (result,), key, generation, True, action))
+
+    def _set_pending(self, pending):
+        self._pending = pending
+        for callback in self._busy_listeners:
+            callback(pending)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    callback, args, key, generation, submitted, action = self._results.get_nowait()
+                except queue.Empty:
+                    break
+
+                if submitted:
+                    self._set_pending(self._pending - 1)
+                    if key is not None and self._generations.get(key) != generation:
+                        # A newer request with the same key superseded this one
+                        continue
+
+                if callback is not None:
+                    try:
+                        with profiling.action(action and f"{action}:ui"):
+                            callback(*args)
+                    except Exception as e:
+                        print(f"Error in background callback: {e}")
+        finally:
+            if not self._closed:
+                self.root.after(self.poll_interval, self._poll)
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; locking then only covers this process
+    fcntl = None
+
+class FileLock:
+    """
+    Reader/writer lock shared between processes through a lock file.
+
+    Uses fcntl.flock on a separate lock file, so the data files themselves
+    can be replaced with an atomic rename while the lock is held. Several
+    readers may hold the shared lock at once; a writer holding the exclusive
+    lock excludes everyone else.
+
+    The lock is re-entrant within a process: acquiring it again while it is
+    held (in either mode) just nests, except that a shared lock cannot be
+    upgraded to an exclusive one. Threads of the same process take turns.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._mode = None
+        self._depth = 0
+
+    @contextmanager
+    def shared(self):
+        with self._hold('shared'):
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        with self._hold('exclusive'):
+            yield
+
+    @contextmanager
+    def _hold(self, mode):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._acquire(mode)
+            elif mode == 'exclusive' and self._mode == 'shared':
+                raise RuntimeError("Cannot upgrade a shared lock to an exclusive lock")
+
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._release()
+
+    def _acquire(self, mode):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_SH if mode == 'shared' else fcntl.LOCK_EX)
+            except OSError:
+                os.close(self._fd)
+                self._fd = None
+                raise
+        self._mode = mode
+
+    def _release(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        self._mode = None
+
+@contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """
+    Open a temporary file next to path for writing and move it over path
+    when the block completes, so readers see either the old or the new
+    contents and never a partial file. On error the original is untouched.
+
+    :param mode: 'w' or 'wb'; other keyword arguments are passed to open()
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only; keep the original permissions
+        os.chmod(temp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,121 @@
+import glob
+import json
+import os
+import uuid
+from .file_lock import atomic_write
+
+class FileTransaction:
+    """
+    All-or-nothing replacement of a group of files, e.g. tasks.csv together
+    with dependencies.json.
+
+    New contents are written and fsynced to temporary files next to their
+    targets. A small manifest listing the (temporary, target) pairs is then
+    written atomically; that is the commit point. Finally each temporary
+    file is renamed over its target. If the process dies before the
+    manifest is written the old files are untouched; if it dies after,
+    recover() finishes the renames. Recovery only reads the manifest and
+    looks for leftover temporary files, so it is cheap to run at startup.
+
+    Callers are expected to hold an exclusive lock around commit() and
+    recover() when several processes share the files.
+    """
+    def __init__(self, manifest_path, paths):
+        self.manifest_path = manifest_path
+        self.paths = [os.path.abspath(path) for path in paths]
+
+    def commit(self, writers):
+        """
+        Replace several files at once.
+
+        :param writers: Dict mapping a target path to a callable that writes
+                        the new contents to the text file object it is given
+        """
+        staged = []
+        try:
+            for path, write in writers.items():
+                path = os.path.abspath(path)
+                temp = self._temp_path(path)
+                staged.append((temp, path))
+                with open(temp, 'x', newline='') as f:
+                    write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(temp, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+
+            if len(staged) > 1:
+                # A single rename is atomic by itself; several need the manifest
+                self._write_manifest(staged)
+                self._sync_directories(staged)
+        except BaseException:
+            for temp, _ in staged:
+                self._discard(temp)
+            raise
+
+        for temp, path in staged:
+            os.replace(temp, path)
+        self._sync_directories(staged)
+
+    def recover(self):
+        """
+        Complete a commit that was interrupted after its commit point and
+        delete temporary files left by commits that were not.
+
+        :return: List of target paths that were rolled forward
+        """
+        pending = self._read_manifest()
+        repaired = []
+        for temp, path in pending:
+            if os.path.exists(temp):
+                os.replace(temp, path)
+                repaired.append(path)
+
+        for path in self.paths:
+            directory, name = os.path.split(path)
+            for temp in glob.glob(os.path.join(glob.escape(directory), f".{glob.escape(name)}.*.tmp")):
+                self._discard(temp)
+
+        if pending:
+            self._write_manifest([])
+        return repaired
+
+    @staticmethod
+    def _temp_path(path):
+        directory, name = os.path.split(path)
+        return os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return [tuple(entry) for entry in json.load(f).get('pending', [])]
+        except FileNotFoundError:
+            return []
+
+    def _write_manifest(self, pending):
+        with atomic_write(self.manifest_path) as f:
+            json.dump({'pending': [list(entry) for entry in pending]}, f)
+
+    @staticmethod
+    def _sync_directories(staged):
+        """
+        Make renames in the target directories durable. Not supported on
+        every platform, where it is skipped.
+        """
+        for directory in {os.path.dirname(path) for _, path in staged}:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _discard(temp):
+        try:
+            os.unlink(temp)
+        except FileNotFoundError:
+            pass
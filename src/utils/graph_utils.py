@@ -1,5 +1,9 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+from collections import OrderedDict, deque
+from .lazy_import import lazy_import
+
+# Loaded on first use so importing this module stays cheap
+nx = lazy_import('networkx')
+plt = lazy_import('matplotlib.pyplot')
 
 def create_dependency_graph(tasks_df):
     graph = nx.DiGraph()
@@ -10,18 +14,109 @@ def create_dependency_graph(tasks_df):
                 graph.add_edge(dep, row['task_name'])
     return graph
 
+def neighborhood_subgraph(graph, node, hops=2):
+    """
+    Subgraph of the ancestors and descendants of node up to the given number of hops.
+
+    Only the nodes within reach are visited, so the cost depends on the size of
+    the neighborhood rather than the whole graph.
+    """
+    if node not in graph:
+        subgraph = nx.DiGraph()
+        subgraph.add_node(node)
+        return subgraph
+
+    nodes = {node}
+    for neighbors in (graph.predecessors, graph.successors):
+        frontier = deque([(node, 0)])
+        seen = {node}
+        while frontier:
+            current, depth = frontier.popleft()
+            if depth == hops:
+                continue
+            for neighbor in neighbors(current):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append((neighbor, depth + 1))
+        nodes |= seen
+    return graph.subgraph(nodes).copy()
+
+def layered_layout(graph):
+    """
+    Layered DAG layout computed in O(V + E).
+
+    Each node is placed one layer below its deepest dependency (longest-path
+    layering over a topological order) and nodes are spread evenly within
+    their layer.
+    """
+    try:
+        order = list(nx.topological_sort(graph))
+    except nx.NetworkXUnfeasible:
+        # Not a DAG; fall back to the insertion order
+        order = list(graph.nodes())
+
+    layer = {}
+    for node in order:
+        layer[node] = max((layer[dep] + 1 for dep in graph.predecessors(node) if dep in layer), default=0)
+
+    layers = {}
+    for node in order:
+        layers.setdefault(layer[node], []).append(node)
+
+    pos = {}
+    for depth, members in layers.items():
+        offset = (len(members) - 1) / 2
+        for index, node in enumerate(members):
+            pos[node] = (index - offset, -depth)
+    return pos
+
+class LayoutCache:
+    """
+    LRU cache of neighborhood subgraphs and their layouts.
+
+    Entries are keyed by (node, hops, graph version) so any change to the
+    graph makes stale layouts unreachable without explicit invalidation.
+    """
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, graph, node, hops, version):
+        """
+        Return (subgraph, positions) for the neighborhood of node.
+        """
+        key = (node, hops, version)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        subgraph = neighborhood_subgraph(graph, node, hops)
+        entry = (subgraph, layered_layout(subgraph))
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+def draw_graph(graph, pos, ax, highlight=None):
+    """
+    Draw a dependency graph onto matplotlib axes, highlighting one node.
+    """
+    colors = ['orange' if node == highlight else 'lightblue' for node in graph.nodes()]
+    nx.draw_networkx(graph, pos, ax=ax,
+                     node_color=colors,
+                     node_size=1500,
+                     font_size=9,
+                     font_weight='bold',
+                     arrows=True)
+    ax.set_axis_off()
+
 def visualize_graph(graph):
     if not graph.nodes():
         print("No dependencies to visualize.")
         return
-        
+
     plt.figure(figsize=(10, 8))
-    pos = nx.spring_layout(graph)
-    nx.draw(graph, pos, with_labels=True, 
-            node_color='lightblue', 
-            node_size=3000, 
-            font_size=10, 
-            font_weight='bold', 
-            arrows=True)
+    draw_graph(graph, layered_layout(graph), plt.gca())
     plt.title("Task Dependencies")
     plt.show()
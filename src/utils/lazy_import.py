@@ -0,0 +1,27 @@
+import importlib
+
+class LazyModule:
+    """
+    Module proxy that performs the real import on first attribute access.
+
+    Lets heavy dependencies (pandas, networkx, matplotlib) be referenced at
+    module level without paying their import cost until they are used.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+def lazy_import(name):
+    """
+    Return a LazyModule for the named module.
+    """
+    return LazyModule(name)
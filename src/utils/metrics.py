@@ -0,0 +1,203 @@
+import os
+import time
+import atexit
+import bisect
+import functools
+import threading
+from .file_lock import atomic_write
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metrics:
+    """
+    Opt-in operation metrics: call counts, errors and latency histograms per
+    instrumented method, plus labelled counters such as rows scanned and
+    bytes read from or written to each file.
+
+    Methods marked with @timed in classes decorated with @instrumented are
+    only wrapped while metrics are enabled, so when disabled they run
+    exactly as written. Counter updates in hot paths are guarded with
+    `if METRICS.enabled:`, which is the only remaining cost.
+
+    Metrics are enabled from the start when the TASK_METRICS environment
+    variable is set: to 1 to just collect them, or to a file path to also
+    write them there in Prometheus text format when the process exits.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._classes = []
+        self._originals = {}
+        self._dump_path = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+            self._counters = {}
+
+    # --- Switching ---------------------------------------------------------
+
+    def enable(self, dump_path=None):
+        """
+        Start collecting.
+
+        :param dump_path: Optional file to write the Prometheus text dump to
+                          when the process exits
+        """
+        if dump_path and self._dump_path is None:
+            atexit.register(self._dump_at_exit)
+        self._dump_path = dump_path or self._dump_path
+        if not self.enabled:
+            self.enabled = True
+            for cls in self._classes:
+                self._wrap(cls)
+
+    def disable(self):
+        """
+        Stop collecting and restore the original methods; collected values are kept.
+        """
+        if self.enabled:
+            self.enabled = False
+            for (cls, attr), method in self._originals.items():
+                setattr(cls, attr, method)
+            self._originals.clear()
+
+    def register(self, cls):
+        self._classes.append(cls)
+        if self.enabled:
+            self._wrap(cls)
+
+    def _wrap(self, cls):
+        for attr, method in list(vars(cls).items()):
+            name = getattr(method, '__metric__', None)
+            if name is not None and (cls, attr) not in self._originals:
+                self._originals[(cls, attr)] = method
+                setattr(cls, attr, self._timer(name, method))
+
+    def _timer(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.observe(name, time.perf_counter() - start, failed)
+        return wrapper
+
+    # --- Recording ---------------------------------------------------------
+
+    def observe(self, name, seconds, failed=False):
+        """
+        Record one call of an operation.
+        """
+        with self._lock:
+            operation = self._operations.get(name)
+            if operation is None:
+                operation = self._operations[name] = {
+                    'count': 0, 'errors': 0, 'sum': 0.0, 'buckets': [0] * (len(LATENCY_BUCKETS) + 1)
+                }
+            operation['count'] += 1
+            operation['errors'] += failed
+            operation['sum'] += seconds
+            operation['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def add(self, counter, amount, **labels):
+        """
+        Increase a counter, e.g. add('bytes_read', 512, file='tasks.csv').
+        """
+        key = (counter, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    # --- Reporting ---------------------------------------------------------
+
+    def snapshot(self):
+        """
+        Current values as plain data.
+
+        :return: {'operations': {name: {'count', 'errors', 'sum_s',
+                  'buckets': {upper_bound: cumulative_count}}},
+                  'counters': {name: [{'labels': {...}, 'value': n}]}}
+        """
+        with self._lock:
+            operations = {}
+            for name, operation in self._operations.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), operation['buckets']):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                operations[name] = {
+                    'count': operation['count'],
+                    'errors': operation['errors'],
+                    'sum_s': operation['sum'],
+                    'buckets': buckets
+                }
+            counters = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        return {'operations': operations, 'counters': counters}
+
+    def prometheus_text(self):
+        """
+        The snapshot in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP task_operation_seconds Latency of task store operations.",
+            "# TYPE task_operation_seconds histogram"
+        ]
+        for name, operation in sorted(snapshot['operations'].items()):
+            for bound, count in operation['buckets'].items():
+                lines.append(f'task_operation_seconds_bucket{{operation="{name}",le="{bound}"}} {count}')
+            lines.append(f'task_operation_seconds_sum{{operation="{name}"}} {operation["sum_s"]}')
+            lines.append(f'task_operation_seconds_count{{operation="{name}"}} {operation["count"]}')
+        lines += [
+            "# HELP task_operation_errors_total Operations that raised an exception.",
+            "# TYPE task_operation_errors_total counter"
+        ]
+        for name, operation in sorted(snapshot['operations'].items()):
+            lines.append(f'task_operation_errors_total{{operation="{name}"}} {operation["errors"]}')
+        for name, series in snapshot['counters'].items():
+            lines.append(f"# TYPE task_{name}_total counter")
+            for entry in series:
+                labels = ','.join(f'{key}="{value}"' for key, value in entry['labels'].items())
+                lines.append(f"task_{name}_total{{{labels}}} {entry['value']}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Atomically write the Prometheus text dump to a file.
+        """
+        with atomic_write(path) as f:
+            f.write(self.prometheus_text())
+
+    def _dump_at_exit(self):
+        if self._dump_path:
+            self.write_prometheus(self._dump_path)
+
+METRICS = Metrics()
+
+def timed(name):
+    """
+    Mark a method for timing under the given operation name.
+    """
+    def mark(method):
+        method.__metric__ = name
+        return method
+    return mark
+
+def instrumented(cls):
+    """
+    Class decorator: time the class's @timed methods while metrics are enabled.
+    """
+    METRICS.register(cls)
+    return cls
+
+_setting = os.environ.get('TASK_METRICS')
+if _setting:
+    METRICS.enable(None if _setting == '1' else _setting)
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Seconds between stack samples in sampling mode
+SAMPLE_INTERVAL = 0.005
+
+# The running Profiler, if profiling was requested on the command line
+PROFILER = None
+
+class Profiler:
+    """
+    Session profiler for the GUI and CLI entry points.
+
+    Two modes:
+      sampling  samples the stacks of all threads every `interval` seconds
+                and writes them as collapsed stacks (profile.folded), the
+                input format of flamegraph.pl, speedscope and inferno.
+      cprofile  runs cProfile on the main thread and on threads started
+                after start() (the GUI's store worker) and writes
+                profile.prof, which snakeviz or flameprof can render.
+
+    Code marks interactions with action(name). Every action's wall time is
+    recorded and summarized in actions.json. When `actions` is given, stacks
+    are captured only while one of those actions is running (matching on
+    the part of the name before ':'), otherwise for the whole session.
+    """
+    def __init__(self, output_dir, mode='sampling', actions=None, interval=SAMPLE_INTERVAL):
+        if mode not in ('sampling', 'cprofile'):
+            raise ValueError(f"Unknown profiler mode '{mode}'")
+        self.output_dir = output_dir
+        self.mode = mode
+        self.actions = set(actions) if actions else None
+        self.interval = interval
+        self._timings = defaultdict(list)
+        self._running = {}              # thread id -> stack of captured action names
+        self._samples = Counter()
+        self._profiles = []
+        self._profile_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._sampler = None
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.mode == 'sampling':
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+            self._sampler.start()
+        elif self.actions is None:
+            self._enable_profile()
+            threading.setprofile(self._profile_new_thread)
+
+    def stop(self):
+        """
+        Stop profiling and write the results; returns the output directory.
+        """
+        session = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._stopping.set()
+            self._sampler.join()
+        threading.setprofile(None)
+        for profile in self._profiles:
+            profile.disable()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == 'sampling':
+            with open(os.path.join(self.output_dir, 'profile.folded'), 'w') as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write(f"{stack} {count}\n")
+        elif self._profiles:
+            import pstats
+            pstats.Stats(*self._profiles).dump_stats(os.path.join(self.output_dir, 'profile.prof'))
+
+        summary = self.summary()
+        with open(os.path.join(self.output_dir, 'actions.json'), 'w') as f:
+            json.dump({'mode': self.mode, 'session_s': session, 'actions': summary}, f, indent=2)
+        self._print_summary(summary, session)
+        return self.output_dir
+
+    @contextmanager
+    def action(self, name):
+        """
+        Time a user-visible action, capturing stacks for it when selected.
+        """
+        capture = self.actions is not None and name.split(':')[0] in self.actions
+        thread_id = threading.get_ident()
+        profile = None
+        if capture:
+            self._running.setdefault(thread_id, []).append(name)
+            if self.mode == 'cprofile' and len(self._running[thread_id]) == 1:
+                profile = self._enable_profile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[name].append(time.perf_counter() - start)
+            if profile is not None:
+                profile.disable()
+            if capture:
+                self._running[thread_id].pop()
+
+    def summary(self):
+        summary = {}
+        for name, durations in sorted(self._timings.items()):
+            ordered = sorted(durations)
+            summary[name] = {
+                'count': len(ordered),
+                'total_ms': sum(ordered) * 1000,
+                'mean_ms': sum(ordered) / len(ordered) * 1000,
+                'p50_ms': ordered[len(ordered) // 2] * 1000,
+                'p95_ms': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000,
+                'max_ms': ordered[-1] * 1000
+            }
+        return summary
+
+    def _print_summary(self, summary, session):
+        print(f"\nProfile written to {self.output_dir} ({self.mode}, {session:.1f}s session)", file=sys.stderr)
+        if not summary:
+            return
+        print(f"{'action':<24}{'count':>7}{'total ms':>11}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}",
+              file=sys.stderr)
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+            print(f"{name:<24}{stats['count']:>7}{stats['total_ms']:>11.1f}{stats['mean_ms']:>10.1f}"
+                  f"{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}", file=sys.stderr)
+
+    # --- cProfile ----------------------------------------------------------
+
+    def _enable_profile(self):
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from one active profiler
+            return None
+        with self._profile_lock:
+            self._profiles.append(profile)
+        return profile
+
+    def _profile_new_thread(self, frame, event, arg):
+        # Installed by threading.setprofile: runs once at the start of each new
+        # thread and replaces itself with that thread's own cProfile
+        sys.setprofile(None)
+        self._enable_profile()
+
+    # --- Sampling ----------------------------------------------------------
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stopping.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                running = self._running.get(thread_id)
+                if self.actions is not None and not running:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                prefix = [names.get(thread_id, str(thread_id))]
+                if running:
+                    prefix.append(f"[{running[-1]}]")
+                self._samples[';'.join(prefix + stack[::-1])] += 1
+
+def action(name):
+    """
+    Context manager marking an action for the active profiler; does nothing
+    when not profiling or when name is None.
+    """
+    profiler = PROFILER
+    return profiler.action(name) if profiler is not None and name else nullcontext()
+
+def add_arguments(parser):
+    """
+    Add the --profile options to an argparse parser.
+    """
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", metavar="DIR",
+                       help="profile the session and write the results to DIR")
+    group.add_argument("--profiler", choices=["sampling", "cprofile"], default="sampling",
+                       help="sampled stacks for flamegraphs, or cProfile")
+    group.add_argument("--profile-actions", metavar="NAMES",
+                       help="only capture stacks during these comma-separated actions, "
+                            "e.g. refresh,add,visualize")
+    return parser
+
+def split_arguments(argv):
+    """
+    Separate the --profile options from the rest of a command line.
+
+    :return: (profile options namespace, remaining arguments)
+    """
+    parser = add_arguments(argparse.ArgumentParser(add_help=False))
+    return parser.parse_known_args(argv)
+
+@contextmanager
+def profiled(options):
+    """
+    Profile the enclosed block if options.profile is set.
+    """
+    global PROFILER
+    if not getattr(options, 'profile', None):
+        yield None
+        return
+
+    actions = [name.strip() for name in options.profile_actions.split(',')] if options.profile_actions else None
+    PROFILER = Profiler(options.profile, options.profiler, actions)
+    PROFILER.start()
+    try:
+        yield PROFILER
+    finally:
+        profiler, PROFILER = PROFILER, None
+        profiler.stop()
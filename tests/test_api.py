@@ -0,0 +1,28 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.server import ApiServer, HttpError
+
+def _read(request):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(request)
+        reader.feed_eof()
+        return await ApiServer._read_request(reader)
+    return asyncio.run(read())
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_invalid_content_length_is_a_bad_request(length):
+    with pytest.raises(HttpError) as error:
+        _read(b"POST /tasks HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert error.value.status == 400
+
+def test_body_is_read_by_content_length():
+    method, target, body, keep_alive = _read(b"POST /tasks HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}")
+    assert (method, target, body, keep_alive) == ("POST", "/tasks", b"{}", True)
@@ -0,0 +1,74 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main_logic import TaskManager
+
+def _store(tmp_path):
+    task_manager = TaskManager(str(tmp_path / "tasks.csv"), str(tmp_path / "dependencies.json"))
+    for name in ("a", "b", "c"):
+        task_manager.add_task({'task_name': name, 'category': "Work", 'priority': 1,
+                               'deadline': 5, 'dependencies': ""})
+    return task_manager
+
+def _reopen(task_manager):
+    return TaskManager(task_manager.file_name, task_manager.graph_file)
+
+def test_entries_after_a_torn_tail_survive(tmp_path):
+    task_manager = _store(tmp_path)
+    task_manager.add_dependency("c", "a")
+    # A crash in the middle of an append leaves an incomplete last line
+    with open(task_manager.journal_file, 'a') as f:
+        f.write('["add", 3')
+
+    reopened = _reopen(task_manager)
+    reopened.add_dependency("b", "a")
+    reopened.update_task_status("a", "Completed")
+
+    store = _reopen(task_manager)
+    assert store.find_task("b")['dependencies'] == "a"
+    assert store.find_task("c")['dependencies'] == "a"
+    assert store.find_task("a")['status'] == "Completed"
+    assert store.graph.has_edge("a", "b")
+
+def test_journal_keeps_appending_after_a_torn_tail_is_folded(tmp_path):
+    task_manager = _store(tmp_path)
+    with open(task_manager.journal_file, 'w') as f:
+        f.write('["status", 1, "Compl')
+
+    reopened = _reopen(task_manager)
+    reopened.update_task_status("a", "In Progress")
+    reopened.update_task_status("b", "In Progress")
+    with open(task_manager.journal_file) as f:
+        assert f.read().endswith('\n')
+
+    store = _reopen(task_manager)
+    assert store.find_task("a")['status'] == "In Progress"
+    assert store.find_task("b")['status'] == "In Progress"
+
+def test_peek_shows_journalled_statuses(tmp_path):
+    task_manager = _store(tmp_path)
+    task_manager.update_task_status("b", "In Progress")
+
+    rows = _reopen(task_manager).peek_tasks()
+    assert [row['status'] for row in rows] == ["Not Started", "In Progress", "Not Started"]
+
+def test_folding_status_entries_leaves_the_graph_file_alone(tmp_path):
+    task_manager = _store(tmp_path)
+    task_manager.add_dependency("c", "a")
+    task_manager.migrate_store()
+    graph_file = os.stat(task_manager.graph_file)
+
+    reopened = _reopen(task_manager)
+    reopened.update_task_status("a", "Completed")
+    with reopened.batch():
+        reopened.update_task_status("b", "Completed")
+
+    assert os.path.getsize(task_manager.journal_file) == 0
+    assert os.stat(task_manager.graph_file).st_mtime_ns == graph_file.st_mtime_ns
+    assert reopened._graph is None
+    store = _reopen(task_manager)
+    assert [store.find_task(name)['status'] for name in ("a", "b")] == ["Completed", "Completed"]
+    assert store.graph.has_edge("a", "c")
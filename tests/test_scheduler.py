@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+from datetime import datetime
+
+import pytest
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main_logic import TaskManager
+from src.services.scheduler import Scheduler
+
+def _scheduler(tmp_path):
+    task_manager = TaskManager(str(tmp_path / "tasks.csv"), str(tmp_path / "dependencies.json"))
+    return Scheduler(task_manager)
+
+def _clients_on_disk(scheduler):
+    with open(scheduler.appointments_file) as f:
+        return sorted(appointment['client'] for appointment in json.load(f)['appointments'])
+
+def test_cancel_in_a_batch_waits_for_the_commit(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    series = scheduler.book_appointment("Ann", datetime(2026, 11, 2, 10), 60, "Consult", "FREQ=WEEKLY")
+
+    with scheduler.task_manager.batch():
+        scheduler.book_appointment("Bob", datetime(2026, 11, 3, 10), 60, "Consult")
+        scheduler.cancel_occurrence(series['id'], datetime(2026, 11, 9, 10))
+        # Bob's task isn't committed yet, so neither change is on disk
+        assert _clients_on_disk(scheduler) == ["Ann"]
+        assert not scheduler.get_booked_slots(datetime(2026, 11, 9))
+
+    assert _clients_on_disk(scheduler) == ["Ann", "Bob"]
+    reopened = Scheduler(scheduler.task_manager)
+    assert not reopened.get_booked_slots(datetime(2026, 11, 9))
+    assert reopened.get_booked_slots(datetime(2026, 11, 16))
+
+def test_failed_batch_drops_cancelled_occurrences(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    task_manager = scheduler.task_manager
+    series = scheduler.book_appointment("Ann", datetime(2026, 11, 2, 10), 60, "Consult", "FREQ=WEEKLY")
+
+    def fail(writers):
+        raise OSError("disk full")
+
+    commit, task_manager._transaction.commit = task_manager._transaction.commit, fail
+    with pytest.raises(OSError):
+        with task_manager.batch():
+            scheduler.book_appointment("Bob", datetime(2026, 11, 3, 10), 60, "Consult")
+            scheduler.cancel_occurrence(series['id'], datetime(2026, 11, 9, 10))
+    task_manager._transaction.commit = commit
+
+    assert _clients_on_disk(scheduler) == ["Ann"]
+    assert scheduler.get_booked_slots(datetime(2026, 11, 9))
+    assert not scheduler.get_booked_slots(datetime(2026, 11, 3))
+
+def test_reload_prunes_appointments_of_removed_tasks(tmp_path, monkeypatch):
+    import src.main_logic
+
+    scheduler = _scheduler(tmp_path)
+    kept = scheduler.book_appointment("Ann", datetime(2026, 11, 2, 10), 60, "Consult", "FREQ=WEEKLY")
+    dropped = scheduler.book_appointment("Bob", datetime(2026, 11, 3, 14), 60, "Consult", "FREQ=DAILY")
+
+    # Another process removes a task; report its changes as one 'reloaded' event
+    events = []
+    scheduler.task_manager.add_listener(lambda event, task: events.append(event))
+    monkeypatch.setattr(src.main_logic, 'MAX_CHANGE_EVENTS', 0)
+    other = TaskManager(scheduler.task_manager.file_name, scheduler.task_manager.graph_file)
+    other.remove_task(dropped['task_name'])
+    scheduler.task_manager.refresh()
+
+    assert events == ['reloaded']
+    assert _clients_on_disk(scheduler) == ["Ann"]
+    assert [booked['task_id'] for booked in scheduler.get_booked_slots(datetime(2026, 11, 9))] == [kept['id']]
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.search_index import MIN_FUZZY_LENGTH, SearchIndex
+
+def _index():
+    return SearchIndex.build([
+        (1, "Send mail to supplier", "Admin"),
+        (2, "Review MA thesis", "Study"),
+        (3, "Report draft", "Writing")
+    ])
+
+def test_misspelled_token_at_the_length_cutoff_matches():
+    assert len("maip") == MIN_FUZZY_LENGTH
+    assert [task_id for task_id, _ in _index().search("maip")] == [1]
+    assert _index().search("maip", fuzzy=False) == []
+
+def test_misspelled_token_below_the_length_cutoff_matches_nothing():
+    index = _index()
+    # Similar enough to 'ma' to match, but too short to be expanded
+    assert len("mal") < MIN_FUZZY_LENGTH
+    assert [token for token, _ in index._similar_tokens("mal")] == ["ma"]
+    assert index.search("mal") == []
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main_logic import TaskManager
+from src.models.snapshot import MAGIC, read_snapshot
+
+def _store(tmp_path):
+    task_manager = TaskManager(str(tmp_path / "tasks.csv"), str(tmp_path / "dependencies.json"))
+    for number in range(20):
+        task_manager.add_task({
+            'task_name': f"Task {number}",
+            'category': f"Category {number % 3}",
+            'priority': number + 1,
+            'deadline': number + 2,
+            'dependencies': f"Task {number - 1}" if number else ""
+        })
+    task_manager.update_task_status("Task 0", "Completed")
+    return task_manager
+
+def _records(table):
+    return table.records(range(len(table)))
+
+def _assert_falls_back_to_csv(task_manager, expected):
+    assert read_snapshot(task_manager.snapshot_file, task_manager._file_signature()[0]) is None
+    reopened = TaskManager(task_manager.file_name, task_manager.graph_file)
+    assert _records(reopened._load_table()) == expected
+
+def test_truncated_snapshot_falls_back_to_csv(tmp_path):
+    task_manager = _store(tmp_path)
+    expected = _records(task_manager._load_table())
+    with open(task_manager.snapshot_file, 'rb') as f:
+        data = f.read()
+
+    # Cut inside the header, inside the sections and just before the end
+    for length in (len(MAGIC) + 4, len(data) // 2, len(data) - 1):
+        with open(task_manager.snapshot_file, 'wb') as f:
+            f.write(data[:length])
+        _assert_falls_back_to_csv(task_manager, expected)
+
+def test_corrupt_category_codes_fall_back_to_csv(tmp_path):
+    task_manager = _store(tmp_path)
+    expected = _records(task_manager._load_table())
+    with open(task_manager.snapshot_file, 'rb') as f:
+        data = bytearray(f.read())
+
+    # Point the first category code past the end of the categories
+    length = int.from_bytes(data[len(MAGIC):len(MAGIC) + 8], 'little')
+    header = json.loads(data[len(MAGIC) + 8:len(MAGIC) + 8 + length])
+    offset = header['sections']['category'][0]
+    data[offset] = 0x7f
+    with open(task_manager.snapshot_file, 'wb') as f:
+        f.write(data)
+    _assert_falls_back_to_csv(task_manager, expected)